@@ -28,38 +28,17 @@ export default function JobResultsPage() {
   const router = useRouter();
   const params = useParams();
   // Use jobData from the context
-  const { fetchJobById, jobData, loading, error, clearJob } = useJob();
-  const timeoutRef = useRef<NodeJS.Timeout | null>(null);
+  const { subscribeToJob, pollJob, jobData, loading, error, clearJob } =
+    useJob();
+  const stopPollingRef = useRef<(() => void) | null>(null);
   const isUnmountedRef = useRef(false);
 
   const jobId = params.jobId as string;
 
-  const scheduleFetch = () => {
-    if (timeoutRef.current) {
-      clearTimeout(timeoutRef.current);
-      timeoutRef.current = null;
-    }
-    // Check status from jobData.job.status
-    if (
-      !isUnmountedRef.current &&
-      jobId &&
-      (!jobData?.job?.status ||
-        (jobData.job.status !== "completed" &&
-          jobData.job.status !== "failed" &&
-          jobData.job.status !== "error"))
-    ) {
-      timeoutRef.current = setTimeout(() => {
-        if (!isUnmountedRef.current && jobId) {
-          fetchJobById(jobId)
-            .then(() => {
-              scheduleFetch(); // Reschedule after successful fetch
-            })
-            .catch((err) => {
-              console.error("Polling fetch error:", err);
-              scheduleFetch(); // Still attempt to reschedule on error
-            });
-        }
-      }, 5000);
+  // Long-poll /updates from the last update seen; replaces the event stream when it fails
+  const startPolling = () => {
+    if (!isUnmountedRef.current && !stopPollingRef.current) {
+      stopPollingRef.current = pollJob(jobId);
     }
   };
 
@@ -75,24 +54,27 @@ export default function JobResultsPage() {
       if (jobData && jobData.job.job_id !== jobId) {
         clearJob();
       }
-      fetchJobById(jobId)
-        .then(() => {
-          scheduleFetch();
-        })
-        .catch((err) => {
-          console.error("Initial fetch error for job:", jobId, err);
-          scheduleFetch(); // Attempt to reschedule even if initial fetch fails
-        });
+
+      // Prefer pushed progress; fall back to long-polling if the stream is unavailable
+      const unsubscribe =
+        typeof EventSource !== "undefined"
+          ? subscribeToJob(jobId, startPolling)
+          : null;
+      if (!unsubscribe) {
+        startPolling();
+      }
+      return () => {
+        isUnmountedRef.current = true;
+        unsubscribe?.();
+        stopPollingRef.current?.();
+        stopPollingRef.current = null;
+      };
     }
     return () => {
       isUnmountedRef.current = true;
-      if (timeoutRef.current) {
-        clearTimeout(timeoutRef.current);
-        timeoutRef.current = null;
-      }
     };
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [jobId]); // Dependencies: only jobId. fetchJobById and clearJob are stable from context.
+  }, [jobId]); // Dependencies: only jobId. subscribeToJob, pollJob and clearJob are stable from context.
 
   // Determine if the job is actively processing based on jobData
   const isProcessing =
@@ -15,6 +15,7 @@ export interface JobUpdate {
   id: number;
   job_id: string;
   status: string;
+  stage?: string | null;
   message: string;
   created_at: string;
 }
@@ -152,3 +153,120 @@ export async function getJobWithUpdates(
     throw error;
   }
 }
+
+export type JobEventHandlers = {
+  // Full job plus any updates not yet seen; sent when the stream (re)connects
+  onSnapshot: (data: FetchedJobData) => void;
+  // One new update, with the job as it is after that update
+  onUpdate: (job: JobDetails, update: JobUpdate) => void;
+  // The stream closed or kept failing to reconnect; callers should fall back to pollJobUpdates
+  onError?: () => void;
+};
+
+const FINISHED_STATUSES = ["completed", "failed", "error"];
+
+// Consecutive stream errors without a message in between before giving up on SSE
+const MAX_EVENT_STREAM_ERRORS = 3;
+
+/**
+ * Subscribes to a job's progress over server-sent events.
+ * Returns a function that closes the stream.
+ */
+export function subscribeToJobEvents(
+  jobId: string,
+  handlers: JobEventHandlers
+): () => void {
+  const source = new EventSource(`${API_BASE_URL}/jobs/${jobId}/events`);
+  let consecutiveErrors = 0;
+
+  const closeIfFinished = (job: JobDetails) => {
+    // The server ends the stream once the job is finished; stop EventSource from reconnecting
+    if (FINISHED_STATUSES.includes(job.status)) {
+      source.close();
+    }
+  };
+
+  source.addEventListener("snapshot", (event) => {
+    consecutiveErrors = 0;
+    const data = JSON.parse((event as MessageEvent).data) as FetchedJobData;
+    handlers.onSnapshot(data);
+    closeIfFinished(data.job);
+  });
+
+  source.addEventListener("update", (event) => {
+    consecutiveErrors = 0;
+    const data = JSON.parse((event as MessageEvent).data) as {
+      job: JobDetails;
+      update: JobUpdate;
+    };
+    handlers.onUpdate(data.job, data.update);
+    closeIfFinished(data.job);
+  });
+
+  source.onerror = () => {
+    // EventSource retries on its own unless the connection is closed for good, but
+    // a proxy that keeps dropping the stream would make it retry forever
+    consecutiveErrors += 1;
+    if (
+      source.readyState === EventSource.CLOSED ||
+      consecutiveErrors >= MAX_EVENT_STREAM_ERRORS
+    ) {
+      console.error("Job event stream failed for job:", jobId);
+      source.close();
+      handlers.onError?.();
+    }
+  };
+
+  return () => source.close();
+}
+
+// Delay before retrying a long-poll request that failed outright
+const LONG_POLL_RETRY_DELAY_MS = 3000;
+
+/**
+ * Long-polls a job's progress for clients that cannot use the event stream.
+ * Each request waits on the server until there are updates after the last one
+ * seen (the `after` cursor), then hands them to onSnapshot and polls again.
+ * Stops once the job has finished. Returns a function that stops polling.
+ */
+export function pollJobUpdates(
+  jobId: string,
+  after: number,
+  handlers: Pick<JobEventHandlers, "onSnapshot">
+): () => void {
+  const controller = new AbortController();
+  let cursor = after;
+
+  const poll = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const response = await fetch(
+          `${API_BASE_URL}/jobs/${jobId}/updates?after=${cursor}`,
+          { signal: controller.signal }
+        );
+        if (!response.ok) {
+          throw new Error(`Failed to poll job updates: ${response.status}`);
+        }
+        const data = (await response.json()) as FetchedJobData;
+        if (data.updates.length > 0) {
+          cursor = data.updates[data.updates.length - 1].id;
+        }
+        handlers.onSnapshot(data);
+        if (FINISHED_STATUSES.includes(data.job.status)) {
+          return;
+        }
+      } catch (error) {
+        if (controller.signal.aborted) {
+          return;
+        }
+        console.error("Error long-polling job updates:", error);
+        await new Promise((resolve) =>
+          setTimeout(resolve, LONG_POLL_RETRY_DELAY_MS)
+        );
+      }
+    }
+  };
+
+  poll();
+  return () => controller.abort();
+}
@@ -14,6 +14,8 @@ import {
   FetchedJobData,
   createJob,
   getJobStatus,
+  pollJobUpdates,
+  subscribeToJobEvents,
 } from "./api";
 
 // Define the context state type
@@ -27,6 +29,10 @@ interface JobContextState {
   ) => Promise<JobCreationResponse>;
   clearJob: () => void;
   fetchJobById: (jobId: string) => Promise<FetchedJobData>;
+  // Streams progress into jobData; returns an unsubscribe function
+  subscribeToJob: (jobId: string, onError?: () => void) => () => void;
+  // Long-polls progress into jobData from the last update seen; returns a stop function
+  pollJob: (jobId: string) => () => void;
 }
 
 // Create context with default values
@@ -41,6 +47,8 @@ const JobContext = createContext<JobContextState>({
   fetchJobById: async () => {
     throw new Error("JobContext not initialized");
   },
+  subscribeToJob: () => () => {},
+  pollJob: () => () => {},
 });
 
 // Hook for using the job context
@@ -57,6 +65,31 @@ export const JobProvider = ({ children }: JobProviderProps) => {
 
   const lastFetchTime = useRef<{ [jobId: string]: number }>({});
   const isFetching = useRef<{ [jobId: string]: boolean }>({});
+  // Id of the newest update received per job; the long-poll fallback resumes from it
+  const lastUpdateId = useRef<{ [jobId: string]: number }>({});
+
+  const mergeSnapshot = useCallback((jobId: string, data: FetchedJobData) => {
+    if (data.updates.length > 0) {
+      lastUpdateId.current[jobId] = Math.max(
+        lastUpdateId.current[jobId] || 0,
+        data.updates[data.updates.length - 1].id
+      );
+    }
+    setJobData((current) => {
+      // On reconnect the snapshot only carries updates after the last one seen
+      const previousUpdates =
+        current && current.job.job_id === jobId ? current.updates : [];
+      const seen = new Set(previousUpdates.map((update) => update.id));
+      return {
+        job: data.job,
+        updates: [
+          ...previousUpdates,
+          ...data.updates.filter((update) => !seen.has(update.id)),
+        ],
+      };
+    });
+    setError(null);
+  }, []);
 
   const createNewJob = useCallback(
     async (query: string, personaId: string): Promise<JobCreationResponse> => {
@@ -124,7 +157,41 @@ export const JobProvider = ({ children }: JobProviderProps) => {
     [jobData]
   );
 
+  const subscribeToJob = useCallback(
+    (jobId: string, onError?: () => void): (() => void) => {
+      return subscribeToJobEvents(jobId, {
+        onSnapshot: (data) => mergeSnapshot(jobId, data),
+        onUpdate: (job, update) => {
+          lastUpdateId.current[jobId] = Math.max(
+            lastUpdateId.current[jobId] || 0,
+            update.id
+          );
+          setJobData((current) => {
+            const previousUpdates =
+              current && current.job.job_id === jobId ? current.updates : [];
+            if (previousUpdates.some((existing) => existing.id === update.id)) {
+              return { job, updates: previousUpdates };
+            }
+            return { job, updates: [...previousUpdates, update] };
+          });
+        },
+        onError,
+      });
+    },
+    [mergeSnapshot]
+  );
+
+  const pollJob = useCallback(
+    (jobId: string): (() => void) => {
+      return pollJobUpdates(jobId, lastUpdateId.current[jobId] || 0, {
+        onSnapshot: (data) => mergeSnapshot(jobId, data),
+      });
+    },
+    [mergeSnapshot]
+  );
+
   const clearJob = useCallback(() => {
+    lastUpdateId.current = {};
     setJobData(null);
     setError(null);
   }, []);
@@ -136,6 +203,8 @@ export const JobProvider = ({ children }: JobProviderProps) => {
     createNewJob,
     clearJob,
     fetchJobById,
+    subscribeToJob,
+    pollJob,
   };
 
   return <JobContext.Provider value={value}>{children}</JobContext.Provider>;
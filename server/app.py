@@ -2,7 +2,7 @@ import os
 from dotenv import load_dotenv
 from flask import Flask, jsonify
 from flask_cors import CORS
-from routes import personas_bp
+from routes import personas_bp, jobs_bp
 
 app = Flask(__name__, static_folder='static', static_url_path='/static')
 CORS(app)  # Enable CORS for all routes
@@ -12,6 +12,7 @@ load_dotenv()
 
 # Register blueprints
 app.register_blueprint(personas_bp)
+app.register_blueprint(jobs_bp)
 
 @app.route('/')
 def home():
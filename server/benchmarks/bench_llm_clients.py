@@ -0,0 +1,75 @@
+"""
+Compare per-call latency of a fresh LLM client per call against the pooled clients in utils.llm.
+
+Each call is a cheap authenticated request (listing models), so the measurement is
+dominated by connection setup and round trips rather than generation time. "fresh"
+builds a new SDK client for every call, as utils.llm used to; "pooled" reuses the
+shared client from utils.llm.get_client. Calls are spread over --threads worker
+threads to mirror the visuals generator's parallel segment workers.
+
+Requires OPENAI_API_KEY (for --provider gpt) or ANTHROPIC_API_KEY (for --provider claude).
+
+Usage:
+    python benchmarks/bench_llm_clients.py [--provider gpt] [--calls 20] [--threads 4]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+sys.path.append(str(SERVER_DIR / "sieve_functions"))
+
+def _fresh_client(provider: str):
+    from openai import OpenAI
+    from anthropic import Anthropic
+
+    if provider == "gpt":
+        return OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+    return Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+
+def _timed_call(provider: str, mode: str) -> float:
+    """One models.list request; returns its latency in milliseconds."""
+    from utils.llm import get_client
+
+    start = time.perf_counter()
+    client = _fresh_client(provider) if mode == "fresh" else get_client(provider)
+    client.models.list()
+    elapsed = (time.perf_counter() - start) * 1000
+    if mode == "fresh":
+        client.close()
+    return elapsed
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=["gpt", "claude"], default="gpt")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per mode")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent callers")
+    args = parser.parse_args()
+
+    from utils.llm import close_clients
+
+    print(f"Provider: {args.provider}, {args.calls} calls per mode, {args.threads} threads")
+    print(f"  {'mode':<8} {'mean (ms)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'first (ms)':>11} {'wall (s)':>9}")
+    for mode in ("fresh", "pooled"):
+        close_clients()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, args.threads)) as executor:
+            latencies = list(executor.map(lambda _: _timed_call(args.provider, mode), range(args.calls)))
+        wall = time.perf_counter() - start
+        print(
+            f"  {mode:<8} {statistics.mean(latencies):10.1f} {_percentile(latencies, 0.5):9.1f} "
+            f"{_percentile(latencies, 0.95):9.1f} {latencies[0]:11.1f} {wall:9.2f}"
+        )
+    close_clients()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare the ffmpeg and MoviePy backends of the video assembler.
+
+Each run assembles one bundled base video (data/base_videos) with a synthetic
+1080x1080 visuals track, in a fresh child process, and reports wall time and
+peak RSS (the larger of the Python process and the ffmpeg processes it spawned).
+
+Usage:
+    python benchmarks/bench_video_assembler.py [--videos steve_jobs.mp4 ...] [--repeat 1]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+BASE_VIDEOS_DIR = SERVER_DIR / "data" / "base_videos"
+BACKENDS = ["ffmpeg", "moviepy"]
+
+sys.path.append(str(SERVER_DIR / "sieve_functions"))
+
+def _peak_rss_mb() -> float:
+    """Peak RSS of this process and its waited-for children, in MB (ru_maxrss is KB on Linux)."""
+    peak_kb = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024  # macOS reports bytes
+    return peak_kb / divisor
+
+def run_single(backend: str, celebrity_path: str, visuals_path: str, output_path: str):
+    """Child process entry point: assemble once and print the measurements as JSON."""
+    from video_assembler import assemble_with_ffmpeg, assemble_with_moviepy
+
+    assemble = assemble_with_ffmpeg if backend == "ffmpeg" else assemble_with_moviepy
+    start = time.perf_counter()
+    assemble(celebrity_path, visuals_path, output_path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"wall_seconds": elapsed, "peak_rss_mb": _peak_rss_mb()}))
+
+def make_visuals_track(duration: float, output_path: str):
+    """Render a synthetic 1080x1080 30 fps visuals track of the given duration."""
+    from utils.ffmpeg import run_ffmpeg
+    run_ffmpeg([
+        "-f", "lavfi", "-i", f"testsrc2=size=1080x1080:rate=30:duration={duration:.3f}",
+        "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", output_path,
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", nargs="*", help="Base video filenames (default: all bundled base videos)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per backend and video")
+    parser.add_argument("--single", nargs=4, metavar=("BACKEND", "CELEBRITY", "VISUALS", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(*args.single)
+        return
+
+    from utils.ffmpeg import probe_video
+
+    videos = args.videos or sorted(p.name for p in BASE_VIDEOS_DIR.glob("*.mp4"))
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for video_name in videos:
+            celebrity_path = str(BASE_VIDEOS_DIR / video_name)
+            duration = probe_video(celebrity_path)["duration"]
+            visuals_path = os.path.join(temp_dir, f"visuals_{video_name}")
+            make_visuals_track(duration, visuals_path)
+
+            for backend in BACKENDS:
+                for run in range(args.repeat):
+                    output_path = os.path.join(temp_dir, f"{backend}_{run}_{video_name}")
+                    completed = subprocess.run(
+                        [sys.executable, __file__, "--single", backend, celebrity_path, visuals_path, output_path],
+                        capture_output=True, text=True
+                    )
+                    if completed.returncode != 0:
+                        print(f"❌ {backend} failed on {video_name}:\n{completed.stderr[-2000:]}")
+                        continue
+                    measurement = json.loads(completed.stdout.strip().splitlines()[-1])
+                    results.append({"video": video_name, "duration": duration, "backend": backend, **measurement})
+                    print(f"  {video_name:<20} {backend:<8} {measurement['wall_seconds']:8.2f}s {measurement['peak_rss_mb']:9.1f} MB")
+
+    print("\nSummary (mean over runs):")
+    print(f"  {'backend':<8} {'wall (s)':>10} {'peak RSS (MB)':>14} {'x realtime':>11}")
+    for backend in BACKENDS:
+        runs = [r for r in results if r["backend"] == backend]
+        if not runs:
+            continue
+        wall = sum(r["wall_seconds"] for r in runs) / len(runs)
+        rss = sum(r["peak_rss_mb"] for r in runs) / len(runs)
+        realtime = sum(r["duration"] / r["wall_seconds"] for r in runs) / len(runs)
+        print(f"  {backend:<8} {wall:10.2f} {rss:14.1f} {realtime:11.2f}")
+
+if __name__ == "__main__":
+    main()
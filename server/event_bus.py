@@ -0,0 +1,107 @@
+import queue
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Set
+
+# Marker delivered in place of events a full subscriber queue could not hold
+RESYNC = "resync"
+
+class Subscription:
+    """A subscriber's view of one topic; events are buffered in a bounded queue."""
+
+    def __init__(self, bus: "EventBus", topic: str, max_queue_size: int):
+        self.bus = bus
+        self.topic = topic
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+        self._put_lock = threading.Lock()
+
+    def get(self, timeout: float) -> Any:
+        """
+        Wait for the next event, or RESYNC if events were dropped and the
+        subscriber should re-read the durable store.
+
+        Raises:
+            queue.Empty: If nothing arrived within timeout seconds
+        """
+        return self.queue.get(timeout=timeout)
+
+    def deliver(self, event: Any) -> bool:
+        """
+        Queue an event without blocking.
+
+        If the queue is full, its backlog is discarded and replaced by a single
+        RESYNC marker, so the subscriber learns it missed events.
+
+        Returns:
+            bool: False if the event was dropped
+        """
+        with self._put_lock:
+            try:
+                self.queue.put_nowait(event)
+                return True
+            except queue.Full:
+                pass
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.dropped += 1
+            self.dropped += 1
+            self.queue.put_nowait(RESYNC)
+            return False
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class EventBus:
+    """
+    In-process publish/subscribe hub.
+
+    Each subscriber gets its own queue, so one publish fans out to every open
+    SSE stream or long-poll request for a topic without any of them polling.
+    A slow subscriber whose queue is full drops events rather than blocking the
+    publisher; it then receives RESYNC and recovers by re-reading the durable store.
+    """
+
+    def __init__(self, max_queue_size: int = 1000):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(self, topic, self.max_queue_size)
+        with self._lock:
+            self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+    def publish(self, topic: str, event: Any) -> int:
+        """
+        Deliver an event to every current subscriber of topic.
+
+        Returns:
+            int: Number of subscribers the event was delivered to
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+
+        return sum(subscription.deliver(event) for subscription in subscribers)
+
+    def subscriber_count(self, topic: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(topic, ()))
@@ -0,0 +1,111 @@
+import os
+import shutil
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from job_store import JobStore
+from persona_assets import base_video_path, get_registry
+
+SERVER_DIR = Path(__file__).parent
+
+# The orchestrator imports its helpers as top-level "utils", like on Sieve
+SIEVE_FUNCTIONS_DIR = str(SERVER_DIR / "sieve_functions")
+if SIEVE_FUNCTIONS_DIR not in sys.path:
+    sys.path.append(SIEVE_FUNCTIONS_DIR)
+
+# How jobs are executed:
+#   "local"  - drive SpewOrchestrator from this process (each stage still runs on Sieve),
+#              which reports every stage transition as a job update
+#   "remote" - push the whole pipeline as spew_complete_video_generator and wait on it
+JOBS_EXECUTION_MODE = os.environ.get("JOBS_EXECUTION_MODE", "local").lower()
+JOBS_MAX_CONCURRENCY = int(os.environ.get("JOBS_MAX_CONCURRENCY", 4))
+
+def _sieve_job_id(future) -> Optional[str]:
+    """Best-effort id of the Sieve job behind a future returned by push()."""
+    job = getattr(future, "job", None)
+    if isinstance(job, dict):
+        return job.get("id")
+    return getattr(job, "id", None) or getattr(future, "job_id", None)
+
+class JobRunner:
+    """
+    Runs video generation jobs in the background and records their progress.
+
+    Requests only create the job and hand it to the runner, so the API never
+    blocks on pipeline work; all state goes through the JobStore.
+    """
+
+    def __init__(self, store: JobStore, output_dir: str, max_workers: int = JOBS_MAX_CONCURRENCY,
+                 execution_mode: str = JOBS_EXECUTION_MODE):
+        """
+        Initialize the runner.
+
+        Args:
+            store: Job store to record progress in
+            output_dir: Directory where finished videos are kept
+            max_workers: Maximum number of jobs running at once
+            execution_mode: "local" or "remote" (see JOBS_EXECUTION_MODE)
+        """
+        self.store = store
+        self.output_dir = output_dir
+        self.execution_mode = execution_mode
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job-runner")
+
+    def submit(self, job_id: str, persona: dict, query: str):
+        """Queue a job for execution."""
+        self._executor.submit(self._run, job_id, persona, query)
+
+    def _run(self, job_id: str, persona: dict, query: str):
+        try:
+            self.store.update_job(job_id, "processing", f"Starting video generation ({self.execution_mode})")
+            base_video_file = get_registry().get_file(base_video_path(persona))
+
+            if self.execution_mode == "remote":
+                video_file = self._run_remote(job_id, persona, base_video_file, query)
+            else:
+                video_file = self._run_local(job_id, persona, base_video_file, query)
+
+            video_path = self._store_video(job_id, video_file)
+            self.store.update_job(job_id, "completed", "Video generation completed", video_path=video_path)
+            print(f"✅ Job {job_id} completed: {video_path}")
+
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {e}")
+            traceback.print_exc()
+            try:
+                self.store.update_job(job_id, "failed", "Video generation failed", error=str(e))
+            except Exception as store_error:
+                print(f"❌ Could not record failure of job {job_id}: {store_error}")
+
+    def _run_local(self, job_id: str, persona: dict, base_video_file, query: str):
+        from orchestrator import SpewOrchestrator
+
+        def on_progress(stage: str, status: str, message: str, data: dict):
+            fields = {"result": data["script"]} if data.get("script") else {}
+            self.store.update_job(job_id, "processing", message, stage=stage, **fields)
+
+        orchestrator = SpewOrchestrator(persona, base_video_file, progress_callback=on_progress)
+        return orchestrator.generate_video(query)
+
+    def _run_remote(self, job_id: str, persona: dict, base_video_file, query: str):
+        import sieve
+
+        create_video_function = sieve.function.get("sieve-internal/spew_complete_video_generator")
+        future = create_video_function.push(persona_data=persona, base_video_file=base_video_file, query=query)
+        sieve_job_id = _sieve_job_id(future)
+        self.store.update_job(job_id, "processing", "Submitted to Sieve", stage="submitted",
+                              **({"sieve_job_id": sieve_job_id} if sieve_job_id else {}))
+        return future.result()
+
+    def _store_video(self, job_id: str, video_file) -> str:
+        """Copy the finished video (downloaded by sieve.File.path) into the output directory."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        video_path = os.path.join(self.output_dir, f"{job_id}.mp4")
+        shutil.copyfile(video_file.path, video_path)
+        return video_path
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
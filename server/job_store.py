@@ -0,0 +1,192 @@
+import os
+import uuid
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+# Job lifecycle, matching JobDetails.status in the web client
+JOB_STATUSES = ("pending", "processing", "completed", "failed", "error")
+FINISHED_STATUSES = ("completed", "failed", "error")
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class JobStore:
+    """
+    Durable store for video generation jobs and their progress updates.
+
+    Backed by SQLite in WAL mode so status reads never wait on the runner
+    threads writing progress, and job state survives server restarts. Jobs are
+    looked up by their primary key; updates are indexed by job id.
+    """
+
+    def __init__(self, db_path: str, on_update: Optional[Callable[[dict], None]] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path of the SQLite database file (created if missing)
+            on_update: Called with each recorded update after it is committed
+        """
+        self.db_path = db_path
+        self.on_update = on_update
+        self._write_lock = threading.Lock()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        with self._init_lock:
+            if not self._initialized:
+                self._initialize()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    persona_id TEXT NOT NULL,
+                    stage TEXT,
+                    error TEXT,
+                    result TEXT,
+                    video_path TEXT,
+                    sieve_job_id TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    completed_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS job_updates (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL REFERENCES jobs (job_id),
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    message TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_job_updates_job_id ON job_updates (job_id, id);
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def create_job(self, query: str, persona_id: str) -> dict:
+        """Create a pending job and return it."""
+        job_id = str(uuid.uuid4())
+        now = _now()
+        with self._write_lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, status, query, persona_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, "pending", query, persona_id, now, now)
+                )
+                self._insert_update(conn, job_id, "pending", None, "Job created", now)
+                conn.commit()
+            finally:
+                conn.close()
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """Look up a job by id. Returns None if it does not exist."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def get_updates(self, job_id: str, after_id: int = 0) -> List[dict]:
+        """Return a job's progress updates with id greater than after_id, oldest first."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, job_id, status, stage, message, created_at FROM job_updates WHERE job_id = ? AND id > ? ORDER BY id",
+                (job_id, after_id)
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def update_job(self, job_id: str, status: str, message: str, stage: Optional[str] = None, **fields) -> dict:
+        """
+        Change a job's status, record a progress update, and set optional fields.
+
+        Args:
+            job_id: Job to update
+            status: New job status (one of JOB_STATUSES)
+            message: Human-readable progress message
+            stage: Pipeline stage the update belongs to, if any
+            **fields: Any of error, result, video_path, sieve_job_id
+
+        Returns:
+            dict: The recorded update
+        """
+        if status not in JOB_STATUSES:
+            raise ValueError(f"Unknown job status: {status}")
+        allowed = {"error", "result", "video_path", "sieve_job_id"}
+        unknown = set(fields) - allowed
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+
+        now = _now()
+        assignments = {"status": status, "updated_at": now, **fields}
+        if stage:
+            assignments["stage"] = stage
+        if status in FINISHED_STATUSES:
+            assignments["completed_at"] = now
+
+        with self._write_lock:
+            conn = self._connect()
+            try:
+                columns = ", ".join(f"{column} = ?" for column in assignments)
+                conn.execute(f"UPDATE jobs SET {columns} WHERE job_id = ?", (*assignments.values(), job_id))
+                update = self._insert_update(conn, job_id, status, stage, message, now)
+                conn.commit()
+            finally:
+                conn.close()
+
+        if self.on_update:
+            try:
+                self.on_update(update)
+            except Exception as e:
+                print(f"⚠️ Job update listener failed for {job_id}: {e}")
+        return update
+
+    def _insert_update(self, conn: sqlite3.Connection, job_id: str, status: str, stage: Optional[str],
+                       message: str, created_at: str) -> dict:
+        cursor = conn.execute(
+            "INSERT INTO job_updates (job_id, status, stage, message, created_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, status, stage, message, created_at)
+        )
+        return {"id": cursor.lastrowid, "job_id": job_id, "status": status, "stage": stage,
+                "message": message, "created_at": created_at}
+
+    def mark_interrupted_jobs(self) -> int:
+        """
+        Fail jobs that were still running when the server stopped.
+
+        Returns:
+            int: Number of jobs marked as failed
+        """
+        conn = self._connect()
+        try:
+            job_ids = [row["job_id"] for row in conn.execute(
+                "SELECT job_id FROM jobs WHERE status IN ('pending', 'processing')"
+            )]
+        finally:
+            conn.close()
+
+        for job_id in job_ids:
+            self.update_job(job_id, "failed", "Server restarted before the job finished",
+                            error="Job was interrupted by a server restart")
+        return len(job_ids)
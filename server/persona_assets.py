@@ -0,0 +1,206 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import sieve
+
+logger = logging.getLogger(__name__)
+
+SERVER_DIR = Path(__file__).parent
+
+# Remote references are re-uploaded after this long in case the storage URL expires
+PERSONA_ASSET_TTL_SECONDS = float(os.environ.get("PERSONA_ASSET_TTL_HOURS", 24)) * 3600
+PERSONA_ASSET_CACHE_PATH = os.environ.get(
+    "PERSONA_ASSET_CACHE_PATH", os.path.expanduser("~/.cache/spew/persona_assets.json")
+)
+
+def file_sha256(path: str) -> str:
+    """Hex sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def base_video_path(persona: dict) -> str:
+    """
+    Base video to lip-sync for a persona.
+
+    Prefers the face-cropped, final-resolution variant written by
+    tools/preprocess_base_videos.py, falling back to the original video.
+    """
+    lipsync_path = persona.get("lipsync_video_path")
+    if lipsync_path and os.path.exists(lipsync_path if os.path.isabs(lipsync_path) else SERVER_DIR / lipsync_path):
+        return lipsync_path
+    return persona["video_path"]
+
+def _upload(path: str) -> str:
+    """
+    Upload a local file to Sieve storage and return its URL.
+
+    Raises:
+        RuntimeError: If the installed SDK cannot upload files or returns no URL
+    """
+    local_file = sieve.File(path=path)
+    upload = getattr(local_file, "upload", None)
+    if not callable(upload):
+        raise RuntimeError("this sieve SDK version has no File.upload()")
+    upload()
+    url = getattr(local_file, "url", None)
+    if not (isinstance(url, str) and url.startswith("http")):
+        raise RuntimeError("upload did not return a storage URL")
+    return url
+
+class PersonaAssetRegistry:
+    """
+    Uploads persona base videos once and hands out remote references to them.
+
+    References are keyed by the file's sha256, so a base video is uploaded again
+    only when its contents change (or the reference is older than the TTL). The
+    hash -> URL map is persisted as JSON so restarts reuse earlier uploads.
+    Videos that could not be uploaded are sent as local files and reported by
+    stats(), since every job then transfers the whole base video again.
+    """
+
+    def __init__(self, cache_path: str = PERSONA_ASSET_CACHE_PATH, ttl_seconds: float = PERSONA_ASSET_TTL_SECONDS):
+        """
+        Initialize the registry.
+
+        Args:
+            cache_path: JSON file holding the hash -> remote reference map
+            ttl_seconds: Age after which a reference is refreshed by re-uploading
+        """
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._upload_locks: Dict[str, threading.Lock] = {}
+        self._hashes: Dict[str, tuple] = {}  # path -> (mtime, size, sha256)
+        self._local_fallbacks: Dict[str, str] = {}  # path -> why it is sent as a local file
+        self._references = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self._references, f, indent=2)
+        os.replace(temp_path, self.cache_path)
+
+    def _content_hash(self, path: str) -> str:
+        """sha256 of a file, recomputed only when its size or mtime changes."""
+        stat = os.stat(path)
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+            return cached[2]
+        digest = file_sha256(path)
+        with self._lock:
+            self._hashes[path] = (stat.st_mtime, stat.st_size, digest)
+        return digest
+
+    def get_file(self, video_path: str) -> sieve.File:
+        """
+        Return a sieve.File for a base video, uploading it only if needed.
+
+        Args:
+            video_path: Local path of the base video (relative paths are resolved
+                        against the server directory, like personas.json entries)
+
+        Returns:
+            sieve.File: A URL reference to the uploaded video, or a local file
+                        reference if the upload could not provide a URL
+        """
+        path = str(video_path if os.path.isabs(video_path) else SERVER_DIR / video_path)
+        digest = self._content_hash(path)
+
+        with self._lock:
+            upload_lock = self._upload_locks.setdefault(digest, threading.Lock())
+
+        # One upload per content hash, even if many requests arrive at once
+        with upload_lock:
+            with self._lock:
+                reference = self._references.get(digest)
+            if reference and time.time() - reference.get("uploaded_at", 0) < self.ttl_seconds:
+                return sieve.File(url=reference["url"])
+
+            start = time.time()
+            try:
+                url = _upload(path)
+            except Exception as e:
+                logger.warning(f"Upload of base video {path} failed, using local file: {e}")
+                with self._lock:
+                    self._local_fallbacks[path] = str(e)
+                return sieve.File(path=path)
+
+            logger.info(f"Uploaded base video {os.path.basename(path)} ({digest[:12]}) in {time.time() - start:.1f}s")
+            with self._lock:
+                self._references[digest] = {"url": url, "path": path, "uploaded_at": time.time()}
+                self._local_fallbacks.pop(path, None)
+                try:
+                    self._save()
+                except OSError as e:
+                    logger.warning(f"Could not persist persona asset cache: {e}")
+            return sieve.File(url=url)
+
+    def stats(self) -> dict:
+        """Remote references held and base videos currently sent as local files (with the reason), for monitoring."""
+        with self._lock:
+            return {
+                "remote_references": len(self._references),
+                "local_fallbacks": {os.path.basename(path): reason for path, reason in self._local_fallbacks.items()},
+            }
+
+    def preload(self, personas: Dict[str, dict], max_workers: int = 4) -> int:
+        """
+        Upload every persona's base video in the background of startup.
+
+        Args:
+            personas: Persona dicts (by id) with a "video_path" entry
+            max_workers: Concurrent uploads
+
+        Returns:
+            int: Number of base videos that now have a reference
+        """
+        paths = {base_video_path(persona) for persona in personas.values() if persona.get("video_path")}
+        paths = [path for path in paths if os.path.exists(path if os.path.isabs(path) else SERVER_DIR / path)]
+
+        def load(path: str) -> bool:
+            try:
+                return bool(getattr(self.get_file(path), "url", None))
+            except Exception as e:
+                logger.warning(f"Could not preload base video {path}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="persona-assets") as executor:
+            loaded = sum(executor.map(load, paths))
+        logger.info(f"Persona assets ready: {loaded}/{len(paths)} base videos referenced remotely")
+        return loaded
+
+_default_registry: Optional[PersonaAssetRegistry] = None
+_default_registry_lock = threading.Lock()
+
+def get_registry() -> PersonaAssetRegistry:
+    """Return the process-wide registry, creating it on first use."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = PersonaAssetRegistry()
+        return _default_registry
+
+def preload_in_background(personas: Dict[str, dict]) -> threading.Thread:
+    """Start uploading persona base videos without delaying startup."""
+    thread = threading.Thread(target=get_registry().preload, args=(personas,), name="persona-assets-preload", daemon=True)
+    thread.start()
+    return thread
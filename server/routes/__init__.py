@@ -1 +1,2 @@
-from .personas import personas_bp 
\ No newline at end of file
+from .personas import personas_bp
+from .jobs import jobs_bp
@@ -0,0 +1,196 @@
+from flask import Blueprint, Response, jsonify, request, send_file, stream_with_context
+import json
+import os
+import queue
+import time
+from typing import Optional
+from dotenv import load_dotenv
+
+from event_bus import EventBus, RESYNC
+from job_store import JobStore, FINISHED_STATUSES
+from job_runner import JobRunner
+from persona_assets import preload_in_background
+
+load_dotenv()
+
+APP_DATA_BASE_DIR = os.environ.get('APP_DATA_BASE_DIR', 'data')
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+JOBS_DB_PATH = os.environ.get('JOBS_DB_PATH', os.path.join(SERVER_DIR, APP_DATA_BASE_DIR, 'jobs.db'))
+JOBS_OUTPUT_DIR = os.environ.get('JOBS_OUTPUT_DIR', os.path.join(SERVER_DIR, APP_DATA_BASE_DIR, 'job_videos'))
+
+# Progress streaming: SSE comment heartbeats keep proxies from closing idle streams,
+# and long-poll requests are held open for at most this many seconds.
+JOBS_SSE_HEARTBEAT_SECONDS = float(os.environ.get('JOBS_SSE_HEARTBEAT_SECONDS', 15))
+JOBS_LONG_POLL_MAX_SECONDS = float(os.environ.get('JOBS_LONG_POLL_MAX_SECONDS', 30))
+
+jobs_bp = Blueprint('jobs', __name__)
+
+# Every recorded update is fanned out to the SSE and long-poll subscribers of its job
+event_bus = EventBus()
+job_store = JobStore(JOBS_DB_PATH, on_update=lambda update: event_bus.publish(update['job_id'], update))
+job_runner = JobRunner(job_store, JOBS_OUTPUT_DIR)
+
+@jobs_bp.record_once
+def _recover_jobs(state):
+    # Jobs still marked as running belong to a previous server process
+    interrupted = job_store.mark_interrupted_jobs()
+    if interrupted:
+        print(f"⚠️ Marked {interrupted} interrupted jobs as failed")
+    preload_in_background(_load_personas())
+
+def _load_personas() -> dict:
+    personas_file = os.path.join(SERVER_DIR, APP_DATA_BASE_DIR, 'personas.json')
+    with open(personas_file, 'r') as f:
+        personas_data = json.load(f)
+    return {persona['id']: persona for persona in personas_data['personas']}
+
+def _serialize_job(job: dict) -> dict:
+    """Shape a stored job like JobDetails in the web client."""
+    video_available = bool(job['video_path']) and os.path.exists(job['video_path'])
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'stage': job['stage'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at'],
+        'completed_at': job['completed_at'],
+        'error': job['error'],
+        'result': job['result'],
+        'persona_id': job['persona_id'],
+        'query': job['query'],
+        'video_available': video_available,
+        'video_url': f"/api/jobs/{job['job_id']}/video" if video_available else None,
+    }
+
+@jobs_bp.route('/api/jobs', methods=['POST'])
+def create_job():
+    data = request.get_json(silent=True) or {}
+    query = (data.get('query') or '').strip()
+    persona_id = (data.get('persona') or '').strip()
+
+    if not query:
+        return jsonify({'error': 'query is required'}), 400
+
+    personas = _load_personas()
+    if persona_id not in personas:
+        return jsonify({'error': f"Unknown persona: '{persona_id}'"}), 400
+
+    job = job_store.create_job(query, persona_id)
+    job_runner.submit(job['job_id'], personas[persona_id], query)
+
+    return jsonify({'job_id': job['job_id'], 'status': 'created'}), 201
+
+@jobs_bp.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_store.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    return jsonify({
+        'job': _serialize_job(job),
+        'updates': job_store.get_updates(job_id),
+    }), 200
+
+@jobs_bp.route('/api/jobs/<job_id>/video', methods=['GET'])
+def get_job_video(job_id):
+    job = job_store.get_job(job_id)
+    if not job or not job['video_path'] or not os.path.exists(job['video_path']):
+        return jsonify({'error': 'Video not available'}), 404
+
+    return send_file(job['video_path'], mimetype='video/mp4', conditional=True)
+
+def _sse_message(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+def _parse_after_id(value) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+@jobs_bp.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """
+    Server-sent events stream of a job's progress.
+
+    Sends a "snapshot" event with the job and any updates the client has not seen
+    (per Last-Event-ID or ?after=), then an "update" event for each new update.
+    If this stream fell behind and the bus dropped events, a fresh "snapshot" with
+    the stored job and the missed updates is sent instead. The stream ends once
+    the job has finished.
+    """
+    if not job_store.get_job(job_id):
+        return jsonify({'error': 'Job not found'}), 404
+
+    after_id = _parse_after_id(request.headers.get('Last-Event-ID') or request.args.get('after'))
+
+    def generate():
+        # Subscribe before reading the store so no update falls between the two
+        with event_bus.subscribe(job_id) as subscription:
+            job = job_store.get_job(job_id)
+            updates = job_store.get_updates(job_id, after_id=after_id)
+            last_id = updates[-1]['id'] if updates else after_id
+            yield _sse_message('snapshot', {'job': _serialize_job(job), 'updates': updates}, last_id)
+
+            while job['status'] not in FINISHED_STATUSES:
+                try:
+                    update = subscription.get(timeout=JOBS_SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+                if update == RESYNC:
+                    job = job_store.get_job(job_id)
+                    updates = job_store.get_updates(job_id, after_id=last_id)
+                    last_id = updates[-1]['id'] if updates else last_id
+                    yield _sse_message('snapshot', {'job': _serialize_job(job), 'updates': updates}, last_id)
+                    continue
+                if update['id'] <= last_id:
+                    continue  # Already sent as part of the snapshot
+                last_id = update['id']
+                job = job_store.get_job(job_id)
+                yield _sse_message('update', {'job': _serialize_job(job), 'update': update}, last_id)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@jobs_bp.route('/api/jobs/<job_id>/updates', methods=['GET'])
+def long_poll_job_updates(job_id):
+    """
+    Long-poll fallback for clients without EventSource.
+
+    Returns updates with id greater than ?after= immediately if there are any;
+    otherwise waits up to ?timeout= seconds for the next one.
+    """
+    after_id = _parse_after_id(request.args.get('after'))
+    try:
+        timeout = min(float(request.args.get('timeout', JOBS_LONG_POLL_MAX_SECONDS)), JOBS_LONG_POLL_MAX_SECONDS)
+    except ValueError:
+        timeout = JOBS_LONG_POLL_MAX_SECONDS
+
+    with event_bus.subscribe(job_id) as subscription:
+        job = job_store.get_job(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        updates = job_store.get_updates(job_id, after_id=after_id)
+        deadline = time.monotonic() + timeout
+        while not updates and job['status'] not in FINISHED_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                subscription.get(timeout=remaining)
+            except queue.Empty:
+                break
+            updates = job_store.get_updates(job_id, after_id=after_id)
+            job = job_store.get_job(job_id)
+
+    return jsonify({'job': _serialize_job(job), 'updates': updates}), 200
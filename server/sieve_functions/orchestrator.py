@@ -1,8 +1,45 @@
 import sieve
 import json
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pipeline import Pipeline, PipelineError, Stage, format_trace
+from utils.timing import estimate_transcription, build_retiming_anchors
+
+# Speculative visuals: plan and render visuals from the script with estimated word
+# timings while TTS runs, then re-time them to the real transcription at assembly.
+SPEW_SPECULATIVE_VISUALS = os.environ.get("SPEW_SPECULATIVE_VISUALS", "false").lower() == "true"
+
+# Batch mode: script and TTS calls in flight at once, and whole videos in flight at once
+SPEW_BATCH_CONCURRENCY = int(os.environ.get("SPEW_BATCH_CONCURRENCY", 4))
+SPEW_BATCH_MAX_IN_FLIGHT = int(os.environ.get("SPEW_BATCH_MAX_IN_FLIGHT", 16))
+
+class _MappedFuture:
+    """Wraps a future so result() returns fn(original result)."""
+    
+    def __init__(self, future, fn: Callable[[Any], Any]):
+        self._future = future
+        self._fn = fn
+    
+    def result(self):
+        return self._fn(self._future.result())
+
+class _LimitedFuture:
+    """Wraps a future started under a semaphore and releases it once the result is in."""
+    
+    def __init__(self, future, semaphore: threading.Semaphore):
+        self._future = future
+        self._semaphore = semaphore
+    
+    def result(self):
+        try:
+            return self._future.result()
+        finally:
+            self._semaphore.release()
 
 class SpewOrchestrator:
     """
@@ -10,16 +47,39 @@ class SpewOrchestrator:
     Coordinates all Sieve functions to create educational videos.
     """
     
-    def __init__(self, persona_data: Dict, base_video_file: sieve.File):
+    # Pipeline stages reported to the progress callback, with their start/finish messages
+    STAGES = ("script", "speech", "visuals", "lipsync", "assembly")
+    STAGE_MESSAGES = {
+        "script": ("Generating script", "Script generated"),
+        "speech": ("Generating speech and transcribing", "Speech synthesis and transcription completed"),
+        "visuals": ("Generating visuals", "Visuals generated"),
+        "lipsync": ("Lip-syncing the celebrity video", "Lip-sync completed"),
+        "assembly": ("Assembling final video", "Final video assembled"),
+    }
+    
+    def __init__(self, persona_data: Dict, base_video_file: sieve.File,
+                 progress_callback: Optional[Callable[[str, str, str, dict], None]] = None,
+                 speculative_visuals: Optional[bool] = None,
+                 stage_limits: Optional[Dict[str, threading.Semaphore]] = None):
         """
         Initialize the orchestrator with persona data and base video file.
         
         Args:
             persona_data: Dictionary containing persona information
             base_video_file: sieve.File object for the base video
+            progress_callback: Optional callable(stage, status, message, data) invoked when
+                               a stage starts ("started") or finishes ("completed")
+            speculative_visuals: Start visuals from estimated timings before TTS finishes
+                                 (defaults to SPEW_SPECULATIVE_VISUALS)
+            stage_limits: Optional semaphores, by stage name, shared by concurrent
+                          generate_video calls to cap how many of that stage run at once
         """
         self.persona_data = persona_data
         self.base_video_file = base_video_file
+        self.progress_callback = progress_callback
+        self.speculative_visuals = SPEW_SPECULATIVE_VISUALS if speculative_visuals is None else speculative_visuals
+        self.stage_limits = stage_limits or {}
+        self.last_trace: Optional[dict] = None
         
         # Get Sieve functions
         self.script_generator = sieve.function.get("sieve-internal/spew_script_generator")
@@ -38,78 +98,158 @@ class SpewOrchestrator:
         Returns:
             sieve.File: The final assembled video file
         """
-        persona = self.persona_data
-        print(f"🚀 Starting video generation for persona '{persona['name']}' with query: '{query}'")
-        
-        # Step 1: Generate script
-        print("\n📝 Step 1: Generating script...")
-        script_result = self._generate_script(
-            query=query,
-            name=persona["name"],
-            style=persona["style_prompt"]
-        )
-
-        print(f"✅ Script generated ({len(script_result)} characters)")
+        final_video, _ = self.generate_video_with_trace(query)
+        return final_video
+    
+    def generate_video_with_trace(self, query: str) -> Tuple[sieve.File, dict]:
+        """
+        Generate a video and return it with the pipeline trace.
         
-        # Step 2: Generate speech and transcribe
-        print("\n🎤 Step 2: Generating speech and transcribing...")
-        speech_result = self._synthesize_speech(
-            script_text=script_result,
-            voice_link=persona["tts_voice_link"]
-        )
-        print("✅ Speech synthesis and transcription completed")
+        Returns:
+            tuple: (final video, trace with per-stage queue/transfer/run times and the critical path)
+        """
+        persona = self.persona_data
+        mode = "speculative" if self.speculative_visuals else "sequential speech"
+        print(f"🚀 Starting video generation for persona '{persona['name']}' with query: '{query}' ({mode})")
         
-        # Step 3: Parallel processing - visuals and lipsync
-        print("\n⚡ Step 3: Starting parallel processing (visuals + lipsync)...")
+        pipeline = self.build_pipeline()
+        try:
+            result = pipeline.run({"query": query}, on_event=self._on_stage_event)
+        except PipelineError as e:
+            self.last_trace = e.trace
+            print(f"❌ Pipeline failed:\n{format_trace(e.trace)}")
+            raise
         
-        # Prepare transcription data for visuals
-        transcription_data = self._prepare_transcription_for_visuals(speech_result["transcription"])
+        self.last_trace = result.trace
+        final_video = result.outputs["final_video"]
+        print("\n🎉 Video generation pipeline completed successfully!")
+        print(f"📁 Final video: {final_video}")
+        print(f"⏱️ Pipeline trace:\n{format_trace(result.trace)}")
+        return final_video, result.trace
+    
+    def build_pipeline(self) -> Pipeline:
+        """
+        Declare the pipeline stages and the values they exchange.
         
-        # Start both processes in parallel using push()
-        print("🎨 Starting visuals generation...")
-        visuals_future = self.visuals_generator.push(transcription=transcription_data)
+        Each stage starts as soon as its inputs exist: visuals and lipsync overlap
+        after speech, and in speculative mode visuals start straight from the script.
+        """
+        persona = self.persona_data
         
-        print("🎬 Starting lipsync processing...")
-        lipsync_future = self._process_lipsync_async(
-            persona_id=persona["id"],
-            audio_file=speech_result["audio_file"]
-        )
+        stages = [
+            Stage("script", inputs=("query",), outputs=("script",),
+                  fn=lambda query: self.script_generator.push(
+                      query=query, name=persona["name"], style=persona["style_prompt"]),
+                  collect=lambda result: {"script": self._validate_script(result)}),
+            Stage("speech", inputs=("script",), outputs=("speech",),
+                  fn=lambda script: self.speech_synthesizer.push(
+                      script_text=script, voice_link=persona["tts_voice_link"]),
+                  collect=lambda result: {"speech": self._validate_speech(result)}),
+            Stage("lipsync", inputs=("speech",), outputs=("celebrity_video",),
+                  fn=lambda speech: self._process_lipsync_async(
+                      persona_id=persona["id"], audio_file=speech["audio_file"])),
+        ]
         
-        # Wait for both parallel processes to complete
-        print("⏳ Waiting for parallel processes to complete...")
-        visuals_result = visuals_future.result()
-        lipsync_result = lipsync_future.result()
-        print("✅ Parallel processing completed")
-        
-        # Step 4: Assemble final video
-        print("\n🎞️ Step 4: Assembling final video...")
-        final_video = self._assemble_final_video(
-            celebrity_video=lipsync_result,
-            visuals_video=visuals_result
-        )
-        print("✅ Final video assembly completed")
+        if self.speculative_visuals:
+            # Plan and render visuals from estimated timings while TTS runs,
+            # then re-time them to the real transcription at assembly
+            stages += [
+                Stage("visuals", inputs=("script",), outputs=("visuals_video", "estimated_transcription"),
+                      fn=self._push_speculative_visuals),
+                Stage("assembly", inputs=("celebrity_video", "visuals_video", "speech", "estimated_transcription"),
+                      outputs=("final_video",),
+                      fn=lambda celebrity_video, visuals_video, speech, estimated_transcription: self._assemble_final_video(
+                          celebrity_video=celebrity_video,
+                          visuals_video=visuals_video,
+                          visuals_timing=self._visuals_timing(estimated_transcription, speech))),
+            ]
+        else:
+            stages += [
+                Stage("visuals", inputs=("speech",), outputs=("visuals_video",),
+                      fn=lambda speech: self.visuals_generator.push(
+                          transcription=self._prepare_transcription_for_visuals(speech["transcription"]))),
+                Stage("assembly", inputs=("celebrity_video", "visuals_video"), outputs=("final_video",),
+                      fn=lambda celebrity_video, visuals_video: self._assemble_final_video(
+                          celebrity_video=celebrity_video, visuals_video=visuals_video)),
+            ]
         
-        print("\n🎉 Video generation pipeline completed successfully!")
-        print(f"📁 Final video: {final_video}")
+        for stage in stages:
+            if stage.name in self.stage_limits:
+                stage.fn = self._limited(stage.fn, self.stage_limits[stage.name])
         
-        return final_video
+        return Pipeline(stages)
     
-    def _generate_script(self, query: str, name: str, style: str) -> str:
-        """Generate script using the script generator function"""
-        result = self.script_generator.run(query=query, name=name, style=style)
-        
+    @staticmethod
+    def _limited(fn: Callable[..., Any], semaphore: threading.Semaphore) -> Callable[..., Any]:
+        """Hold semaphore from submitting a stage until its result is in (waiting counts as transfer)."""
+        def run_limited(**inputs):
+            semaphore.acquire()
+            try:
+                value = fn(**inputs)
+            except BaseException:
+                semaphore.release()
+                raise
+            if hasattr(value, "result") and callable(value.result):
+                return _LimitedFuture(value, semaphore)
+            semaphore.release()
+            return value
+        return run_limited
+    
+    def _on_stage_event(self, stage: str, status: str, outputs: dict):
+        """Log stage transitions and forward them to the progress callback."""
+        started_message, completed_message = self.STAGE_MESSAGES.get(stage, (stage, stage))
+        if status == "started":
+            print(f"\n▶️ {started_message}...")
+            self._report(stage, "started", started_message)
+        elif status == "completed":
+            print(f"✅ {completed_message}")
+            if stage == "script":
+                script = outputs["script"]
+                self._report(stage, "completed", f"{completed_message} ({len(script)} characters)", script=script)
+            else:
+                self._report(stage, "completed", completed_message)
+        else:
+            print(f"❌ Stage '{stage}' failed")
+    
+    def _push_speculative_visuals(self, script: str):
+        """Start visuals from estimated sentence timings; resolves to the video and the estimate."""
+        estimated_transcription = estimate_transcription(script)
+        segments = estimated_transcription["segments"]
+        if segments:
+            print(f"  📏 Estimated {len(segments)} sentences over {segments[-1]['end']:.1f}s")
+        future = self.visuals_generator.push(transcription=estimated_transcription)
+        return _MappedFuture(future, lambda video: {
+            "visuals_video": video,
+            "estimated_transcription": estimated_transcription,
+        })
+    
+    def _visuals_timing(self, estimated_transcription: dict, speech: dict) -> Optional[dict]:
+        """Re-timing anchors from estimated to real speech timings (None if unavailable)."""
+        actual_segments = self._prepare_transcription_for_visuals(speech["transcription"])["segments"]
+        anchors = build_retiming_anchors(estimated_transcription["segments"], actual_segments)
+        if not anchors:
+            return None
+        print(f"  🕒 Re-timing visuals with {len(anchors)} anchors (estimated {anchors[-1][0]:.1f}s → actual {anchors[-1][1]:.1f}s)")
+        return {"anchors": anchors}
+    
+    def _report(self, stage: str, status: str, message: str, **data):
+        """Forward a stage transition to the progress callback, if any."""
+        if not self.progress_callback:
+            return
+        try:
+            self.progress_callback(stage, status, message, data)
+        except Exception as e:
+            print(f"⚠️ Progress callback failed for {stage}/{status}: {e}")
+    
+    def _validate_script(self, result) -> str:
+        """Validate the script generator's result"""
         if not isinstance(result, str) or len(result) < 50:
             raise ValueError("Generated script is invalid or too short")
         
         return result
     
-    def _synthesize_speech(self, script_text: str, voice_link: str) -> dict:
-        """Generate speech and transcribe using the speech synthesizer function"""
-        result = self.speech_synthesizer.run(
-            script_text=script_text,
-            voice_link=voice_link
-        )
-        
+    def _validate_speech(self, result) -> dict:
+        """Validate the speech synthesizer's result"""
         # Validate result structure
         if not isinstance(result, dict) or "audio_file" not in result or "transcription" not in result:
             raise ValueError("Speech synthesis returned invalid result")
@@ -146,13 +286,19 @@ class SpewOrchestrator:
             base_video_file=self.base_video_file
         )
     
-    def _assemble_final_video(self, celebrity_video: sieve.File, visuals_video: sieve.File) -> sieve.File:
-        """Assemble the final video using the video assembler function"""
-        result = self.video_assembler.run(
+    def _assemble_final_video(self, celebrity_video: sieve.File, visuals_video: sieve.File,
+                              visuals_timing: Optional[dict] = None):
+        """Start final assembly using the video assembler function (returns a future)"""
+        kwargs = {"visuals_timing": visuals_timing} if visuals_timing else {}
+        future = self.video_assembler.push(
             celebrity_video=celebrity_video,
-            visuals_video=visuals_video
+            visuals_video=visuals_video,
+            **kwargs
         )
-        
+        return _MappedFuture(future, self._validate_final_video)
+    
+    def _validate_final_video(self, result) -> sieve.File:
+        """Validate the video assembler's result"""
         if not isinstance(result, sieve.File):
             raise ValueError("Video assembly did not return a valid video file")
         
@@ -175,4 +321,82 @@ def create_video(persona_data: dict, base_video_file: sieve.File, query: str) ->
         sieve.File: The final assembled video file
     """
     orchestrator = SpewOrchestrator(persona_data, base_video_file)
-    return orchestrator.generate_video(query)
\ No newline at end of file
+    return orchestrator.generate_video(query)
+
+
+def _reusable_file(file: sieve.File) -> sieve.File:
+    """Refer to an already uploaded file by URL so passing it to many jobs does not re-upload it."""
+    url = getattr(file, "url", None)
+    if url and isinstance(url, str) and url.startswith("http"):
+        return sieve.File(url=url)
+    return file
+
+@sieve.function(
+    name="spew_complete_video_batch_generator",
+)
+def create_videos_batch(persona_data: dict, base_video_file: sieve.File, queries: list):
+    """
+    Generate videos for many queries with one persona, streaming results as they finish.
+    
+    Function handles are resolved once and the base video is uploaded once for the
+    whole batch. Script and TTS calls are capped at SPEW_BATCH_CONCURRENCY in flight;
+    visuals, lipsync and assembly for finished scripts keep running meanwhile.
+    
+    Args:
+        persona_data: Dictionary containing persona information (name, style_prompt, tts_voice_link, etc.)
+        base_video_file: sieve.File object for the base video to use for lipsync
+        queries: Educational topics/questions to explain
+        
+    Yields:
+        dict: {"index", "query", "video" (sieve.File or None), "error", "seconds", "trace"}
+              in completion order; "index" is the query's position in queries. Empty or
+              non-string queries are yielded first, as errors
+    """
+    valid_queries = []
+    for index, query in enumerate(queries):
+        if isinstance(query, str) and query.strip():
+            valid_queries.append((index, query))
+        else:
+            print(f"⚠️ Skipping query {index}: {query!r} is not a non-empty string")
+            yield {"index": index, "query": query, "video": None, "error": "Query must be a non-empty string",
+                   "seconds": 0.0, "trace": None}
+    if not valid_queries:
+        print("⚠️ No queries to process")
+        return
+    
+    limit = max(1, SPEW_BATCH_CONCURRENCY)
+    stage_limits = {"script": threading.Semaphore(limit), "speech": threading.Semaphore(limit)}
+    orchestrator = SpewOrchestrator(persona_data, _reusable_file(base_video_file), stage_limits=stage_limits)
+    
+    print(f"🚀 Starting batch of {len(valid_queries)} videos for '{persona_data['name']}' "
+          f"(script/TTS concurrency {limit}, up to {SPEW_BATCH_MAX_IN_FLIGHT} videos in flight)")
+    batch_start = time.time()
+    
+    def generate(index: int, query: str) -> dict:
+        start = time.time()
+        try:
+            video, trace = orchestrator.generate_video_with_trace(query)
+            return {"index": index, "query": query, "video": video, "error": None,
+                    "seconds": round(time.time() - start, 1), "trace": trace}
+        except Exception as e:
+            return {"index": index, "query": query, "video": None, "error": str(e),
+                    "seconds": round(time.time() - start, 1), "trace": getattr(e, "trace", None)}
+    
+    succeeded = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(SPEW_BATCH_MAX_IN_FLIGHT, len(valid_queries))),
+                            thread_name_prefix="batch-video") as executor:
+        futures = [executor.submit(generate, index, query) for index, query in valid_queries]
+        for completed, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            elapsed_hours = (time.time() - batch_start) / 3600
+            if result["video"] is not None:
+                succeeded += 1
+                print(f"✅ [{completed}/{len(valid_queries)}] '{result['query']}' done in {result['seconds']}s")
+            else:
+                print(f"❌ [{completed}/{len(valid_queries)}] '{result['query']}' failed: {result['error']}")
+            print(f"   📈 Throughput so far: {succeeded / elapsed_hours:.1f} videos/hour")
+            yield result
+    
+    total_seconds = time.time() - batch_start
+    print(f"\n🎉 Batch complete: {succeeded}/{len(valid_queries)} videos in {total_seconds:.0f}s "
+          f"({succeeded / (total_seconds / 3600):.1f} videos/hour)")
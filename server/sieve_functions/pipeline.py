@@ -0,0 +1,256 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline.
+
+    fn is called with the stage's inputs as keyword arguments. It may return a
+    future (anything with a result() method, e.g. from sieve function .push()),
+    in which case the call itself is timed as transfer and waiting on the future
+    as run time. collect turns the final value into the stage's outputs; by
+    default the value becomes the stage's single output.
+    """
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    fn: Callable[..., Any]
+    collect: Optional[Callable[[Any], Dict[str, Any]]] = None
+
+    def outputs_from(self, value: Any) -> Dict[str, Any]:
+        if self.collect:
+            produced = self.collect(value)
+        elif len(self.outputs) == 1:
+            produced = {self.outputs[0]: value}
+        else:
+            produced = value
+        missing = set(self.outputs) - set(produced or {})
+        if missing:
+            raise ValueError(f"Stage '{self.name}' did not produce {sorted(missing)}")
+        return {name: produced[name] for name in self.outputs}
+
+@dataclass
+class StageTrace:
+    name: str
+    status: str = "waiting"  # waiting, queued, running, completed, failed, skipped
+    ready_at: Optional[float] = None     # all inputs available
+    started_at: Optional[float] = None   # a worker picked the stage up
+    submitted_at: Optional[float] = None # fn returned (inputs transferred / job submitted)
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self, origin: float) -> dict:
+        def offset(value):
+            return round(value - origin, 3) if value is not None else None
+
+        def span(start, end):
+            return round(end - start, 3) if start is not None and end is not None else None
+
+        return {
+            "name": self.name,
+            "status": self.status,
+            "ready_at": offset(self.ready_at),
+            "started_at": offset(self.started_at),
+            "finished_at": offset(self.finished_at),
+            "queue_seconds": span(self.ready_at, self.started_at),
+            "transfer_seconds": span(self.started_at, self.submitted_at),
+            "run_seconds": span(self.submitted_at, self.finished_at),
+            "total_seconds": span(self.ready_at, self.finished_at),
+            "error": self.error,
+        }
+
+@dataclass
+class PipelineResult:
+    outputs: Dict[str, Any]
+    trace: dict = field(default_factory=dict)
+
+class PipelineError(RuntimeError):
+    """A stage failed; the partial trace is attached."""
+
+    def __init__(self, message: str, trace: dict):
+        super().__init__(message)
+        self.trace = trace
+
+class Pipeline:
+    """
+    Dependency-graph executor for pipeline stages.
+
+    Each stage is launched as soon as all of its inputs exist, so independent
+    stages overlap without the caller spelling out the order. Every run produces
+    a trace with queue, transfer and run time per stage and the critical path.
+    """
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages = list(stages)
+        self._producers: Dict[str, Stage] = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise ValueError(f"Output '{output}' is produced by both '{self._producers[output].name}' and '{stage.name}'")
+                self._producers[output] = stage
+        if len({stage.name for stage in self.stages}) != len(self.stages):
+            raise ValueError("Stage names must be unique")
+
+    def _validate(self, available: Sequence[str]):
+        known = set(available) | set(self._producers)
+        for stage in self.stages:
+            missing = set(stage.inputs) - known
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' needs {sorted(missing)}, which nothing provides")
+
+        # Detect cycles with a depth-first walk over stage dependencies
+        visiting, done = set(), set()
+
+        def visit(stage: Stage):
+            if stage.name in done:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Pipeline has a cycle through '{stage.name}'")
+            visiting.add(stage.name)
+            for name in stage.inputs:
+                if name in self._producers and name not in available:
+                    visit(self._producers[name])
+            visiting.discard(stage.name)
+            done.add(stage.name)
+
+        for stage in self.stages:
+            visit(stage)
+
+    def run(self, inputs: Dict[str, Any], max_workers: Optional[int] = None,
+            on_event: Optional[Callable[[str, str, Dict[str, Any]], None]] = None) -> PipelineResult:
+        """
+        Execute the pipeline.
+
+        Args:
+            inputs: Initial values (e.g. {"query": ...})
+            max_workers: Maximum stages in flight at once (default: number of stages)
+            on_event: Optional callable(stage_name, status, outputs) for "started", "completed"
+                      (with the stage's outputs) and "failed"
+
+        Returns:
+            PipelineResult: All produced values and the run trace
+
+        Raises:
+            PipelineError: If a stage fails (remaining stages are skipped)
+        """
+        self._validate(list(inputs))
+        origin = time.monotonic()
+        values = dict(inputs)
+        traces = {stage.name: StageTrace(stage.name) for stage in self.stages}
+        pending = list(self.stages)
+        lock = threading.Lock()
+
+        def notify(stage_name: str, status: str, outputs: Optional[Dict[str, Any]] = None):
+            if on_event:
+                try:
+                    on_event(stage_name, status, outputs or {})
+                except Exception as e:
+                    print(f"⚠️ Pipeline event handler failed for {stage_name}/{status}: {e}")
+
+        def execute(stage: Stage, stage_inputs: Dict[str, Any]) -> Dict[str, Any]:
+            trace = traces[stage.name]
+            with lock:
+                trace.started_at = time.monotonic()
+                trace.status = "running"
+            notify(stage.name, "started")
+            value = stage.fn(**stage_inputs)
+            trace.submitted_at = time.monotonic()
+            if hasattr(value, "result") and callable(value.result):
+                value = value.result()
+            produced = stage.outputs_from(value)
+            trace.finished_at = time.monotonic()
+            return produced
+
+        failure: Optional[Tuple[str, BaseException]] = None
+        with ThreadPoolExecutor(max_workers=max_workers or max(1, len(self.stages)),
+                                thread_name_prefix="pipeline-stage") as executor:
+            running = {}
+
+            def launch_ready():
+                for stage in list(pending):
+                    if all(name in values for name in stage.inputs):
+                        pending.remove(stage)
+                        traces[stage.name].ready_at = time.monotonic()
+                        traces[stage.name].status = "queued"
+                        stage_inputs = {name: values[name] for name in stage.inputs}
+                        running[executor.submit(execute, stage, stage_inputs)] = stage
+
+            launch_ready()
+            while running and not failure:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    trace = traces[stage.name]
+                    try:
+                        produced = future.result()
+                        values.update(produced)
+                        trace.status = "completed"
+                        notify(stage.name, "completed", produced)
+                    except BaseException as e:
+                        trace.status = "failed"
+                        trace.finished_at = trace.finished_at or time.monotonic()
+                        trace.error = str(e)
+                        notify(stage.name, "failed")
+                        failure = failure or (stage.name, e)
+                if not failure:
+                    launch_ready()
+
+            # Let stages already in flight finish so their traces are complete
+            for future, stage in running.items():
+                try:
+                    values.update(future.result())
+                    traces[stage.name].status = "completed"
+                except BaseException as e:
+                    traces[stage.name].status = "failed"
+                    traces[stage.name].error = str(e)
+
+        for stage in pending:
+            traces[stage.name].status = "skipped"
+
+        trace = self._build_trace(traces, origin)
+        if failure:
+            stage_name, error = failure
+            raise PipelineError(f"Stage '{stage_name}' failed: {error}", trace) from error
+        return PipelineResult(outputs=values, trace=trace)
+
+    def _critical_path(self, traces: Dict[str, StageTrace]) -> List[str]:
+        """Walk back from the last stage to finish through the input that arrived last."""
+        finished = [t for t in traces.values() if t.finished_at is not None]
+        if not finished:
+            return []
+        current = max(finished, key=lambda t: t.finished_at)
+        path = [current.name]
+        while True:
+            stage = next(s for s in self.stages if s.name == current.name)
+            upstream = [traces[self._producers[name].name] for name in stage.inputs if name in self._producers]
+            upstream = [t for t in upstream if t.finished_at is not None]
+            if not upstream:
+                break
+            current = max(upstream, key=lambda t: t.finished_at)
+            path.append(current.name)
+        return list(reversed(path))
+
+    def _build_trace(self, traces: Dict[str, StageTrace], origin: float) -> dict:
+        finished_times = [t.finished_at for t in traces.values() if t.finished_at is not None]
+        return {
+            "total_seconds": round(max(finished_times) - origin, 3) if finished_times else 0.0,
+            "critical_path": self._critical_path(traces),
+            "stages": [traces[stage.name].to_dict(origin) for stage in self.stages],
+        }
+
+def format_trace(trace: dict) -> str:
+    """Render a pipeline trace as a small table for logs."""
+    lines = [f"  {'stage':<12} {'status':<10} {'queue':>7} {'transfer':>9} {'run':>8} {'finish':>8}"]
+    for stage in trace.get("stages", []):
+        def cell(value, width):
+            return f"{value:>{width}.2f}" if value is not None else f"{'-':>{width}}"
+        lines.append(
+            f"  {stage['name']:<12} {stage['status']:<10} {cell(stage['queue_seconds'], 7)} "
+            f"{cell(stage['transfer_seconds'], 9)} {cell(stage['run_seconds'], 8)} {cell(stage['finished_at'], 8)}"
+        )
+    lines.append(f"  critical path: {' → '.join(trace.get('critical_path', []))} ({trace.get('total_seconds', 0):.2f}s)")
+    return "\n".join(lines)
@@ -1,12 +1,56 @@
 import sieve
 import requests
 import os
+import re
+import time
 import tempfile
 import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from utils.alignment import align_script
+from utils.content_cache import ContentCache, make_key
+from utils.ffmpeg import concat_files
+from utils.timing import split_sentences
+
+PLAYHT_VOICE_ENGINE = "PlayDialog"
+TRANSCRIBE_BACKEND = "stable-ts-whisper-large-v3-turbo"
+
+# How segment timings are obtained once the audio exists:
+#   "align"      - force-align the known script to the audio locally (no remote ASR),
+#                  falling back to transcription if alignment fails
+#   "transcribe" - run sieve/transcribe on the audio
+SPEECH_TIMING_MODE = os.environ.get("SPEECH_TIMING_MODE", "align").lower()
+
+# Chunked synthesis: the script is split into sentence chunks that are synthesized as
+# separate concurrent TTS requests and aligned one by one while later chunks are still
+# in flight; the joined audio and timings are returned once every chunk is done. Each
+# chunk is spoken independently, so prosody can shift at chunk boundaries (off by default)
+SPEECH_STREAMING = os.environ.get("SPEECH_STREAMING", "false").lower() == "true"
+SPEECH_STREAM_CHUNK_CHARS = int(os.environ.get("SPEECH_STREAM_CHUNK_CHARS", 240))
+SPEECH_STREAM_CONCURRENCY = int(os.environ.get("SPEECH_STREAM_CONCURRENCY", 3))
+
+# Audio is read from the TTS response and written to disk in large blocks
+AUDIO_STREAM_CHUNK_BYTES = 64 * 1024
+AUDIO_WRITE_BUFFER_BYTES = 1024 * 1024
+
+# Persistent cache of synthesized audio and its transcription, keyed by script and voice,
+# so retried or regenerated jobs skip both TTS and transcription
+SPEECH_CACHE_ENABLED = os.environ.get("SPEECH_CACHE_ENABLED", "true").lower() == "true"
+SPEECH_CACHE_DIR = os.environ.get("SPEECH_CACHE_DIR", os.path.expanduser("~/.cache/spew/speech"))
+SPEECH_CACHE_MAX_BYTES = int(os.environ.get("SPEECH_CACHE_MAX_MB", 512)) * 1024 * 1024
+speech_cache = ContentCache(SPEECH_CACHE_DIR, SPEECH_CACHE_MAX_BYTES)
+
+# Returned audio must outlive this call: when no remote function consumes it here (forced
+# alignment), Sieve uploads it only while serializing the result. It is kept in this
+# directory and removed on a later call once older than the retention period
+SPEECH_OUTPUT_DIR = os.environ.get("SPEECH_OUTPUT_DIR", os.path.join(tempfile.gettempdir(), "spew_speech_output"))
+SPEECH_OUTPUT_RETENTION_SECONDS = float(os.environ.get("SPEECH_OUTPUT_RETENTION_MINUTES", 60)) * 60
 
 @sieve.function(
     name="spew_speech_synthesizer",
-    python_packages=["requests"],
+    python_packages=["requests", "numpy"],
+    system_packages=["ffmpeg"],
     environment_variables=[
         sieve.Env(name="PLAYHT_TTS_USER", is_secret=True),
         sieve.Env(name="PLAYHT_TTS_API_KEY", is_secret=True)
@@ -14,7 +58,8 @@ import json
 )
 def synthesize_and_transcribe(script_text: str, voice_link: str) -> dict:
     """
-    Generate speech from script using PlayHT and transcribe it using Sieve
+    Generate speech from script using PlayHT and recover its segment timings,
+    by aligning the script to the audio or transcribing it (see SPEECH_TIMING_MODE)
     
     Args:
         script_text: The text to convert to speech
@@ -23,33 +68,193 @@ def synthesize_and_transcribe(script_text: str, voice_link: str) -> dict:
     Returns:
         Dictionary with audio_file (sieve.File) and transcription (dict)
     """
+    return _synthesize_and_transcribe(script_text, voice_link)
+
+def _synthesize_and_transcribe(script_text: str, voice_link: str) -> dict:
+    """Body of synthesize_and_transcribe; the returned audio file stays on disk (see SPEECH_OUTPUT_DIR)."""
+    cache_key = _speech_cache_key(script_text, voice_link)
+    cached_speech = _load_cached_speech(cache_key)
+    if cached_speech:
+        print(f"♻️ Reusing cached speech {cache_key[:12]} (skipping TTS and transcription)")
+        return cached_speech
+
     # Get credentials from environment
     user_id = os.environ["PLAYHT_TTS_USER"]
     api_key = os.environ["PLAYHT_TTS_API_KEY"]
     
-    # Generate speech using PlayHT API
-    audio_file_path = _generate_speech_audio(script_text, voice_link, user_id, api_key)
+    chunks = _stream_chunks(script_text) if SPEECH_STREAMING else []
+    if len(chunks) > 1:
+        # Synthesize sentence chunks concurrently, aligning each as it arrives
+        audio_file_path, transcription_result = _synthesize_chunks(chunks, voice_link, user_id, api_key)
+    else:
+        # Generate speech using PlayHT API, straight into a file that outlives this call
+        audio_file_path = _generate_speech_audio(script_text, voice_link, user_id, api_key,
+                                                 output_path=_new_output_path())
+        transcription_result = None
     
     try:
         # Create Sieve file object
         sieve_audio_file = sieve.File(path=audio_file_path)
         
-        # Transcribe the audio using Sieve
-        transcription_result = _transcribe_audio(sieve_audio_file)
+        # Recover segment timings for the script we already have
+        if transcription_result is None:
+            transcription_result = _speech_timings(audio_file_path, script_text, sieve_audio_file)
+
+        _store_cached_speech(cache_key, audio_file_path, transcription_result)
         
         return {
             "audio_file": sieve_audio_file,
             "transcription": transcription_result
         }
     
-    finally:
-        # Clean up temporary file
+    except BaseException:
+        # Nobody will read the audio; successful results are pruned by _new_output_path
         if os.path.exists(audio_file_path):
             os.remove(audio_file_path)
+        raise
+
+
+def _new_output_path() -> str:
+    """Fresh .mp3 path in SPEECH_OUTPUT_DIR, removing returned audio older than the retention period."""
+    os.makedirs(SPEECH_OUTPUT_DIR, exist_ok=True)
+    cutoff = time.time() - SPEECH_OUTPUT_RETENTION_SECONDS
+    for entry in os.scandir(SPEECH_OUTPUT_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass  # Removed concurrently or still in use
+    fd, path = tempfile.mkstemp(suffix=".mp3", dir=SPEECH_OUTPUT_DIR)
+    os.close(fd)
+    return path
+
+
+def _speech_cache_key(script_text: str, voice_link: str) -> str:
+    """
+    Speech cache key: script with whitespace collapsed, voice, engine, timing backend
+    and synthesis mode (chunked synthesis sounds slightly different).
+
+    Case and punctuation are kept because they change how the script is spoken.
+    """
+    script = re.sub(r"\s+", " ", (script_text or "").strip())
+    timing_backend = "align-energy-v1" if SPEECH_TIMING_MODE == "align" else TRANSCRIBE_BACKEND
+    synthesis = f"stream-{SPEECH_STREAM_CHUNK_CHARS}" if SPEECH_STREAMING else "whole"
+    return make_key("speech", script, voice_link, PLAYHT_VOICE_ENGINE, "mp3", timing_backend, synthesis)
+
+def _load_cached_speech(cache_key: str):
+    """
+    Look up cached audio. Returns the synthesizer's result dict or None on a miss.
+
+    The audio is copied out under the cache lock into SPEECH_OUTPUT_DIR, like freshly
+    synthesized audio, so a concurrent put that evicts the entry cannot delete it.
+    """
+    if not SPEECH_CACHE_ENABLED:
+        return None
+    output_path = None
+    try:
+        output_path = _new_output_path()
+        cached = speech_cache.get(cache_key, dest_path=output_path)
+        if cached and "transcription" in cached["metadata"]:
+            return {
+                "audio_file": sieve.File(path=output_path),
+                "transcription": cached["metadata"]["transcription"]
+            }
+    except Exception as e:
+        print(f"⚠️ Speech cache lookup failed: {e}")
+    if output_path and os.path.exists(output_path):
+        os.remove(output_path)
+    return None
+
+def _store_cached_speech(cache_key: str, audio_file_path: str, transcription):
+    """Store synthesized audio and its transcription in the speech cache."""
+    if not SPEECH_CACHE_ENABLED or not transcription:
+        return
+    try:
+        if speech_cache.put(cache_key, audio_file_path, {"transcription": transcription}):
+            print(f"💾 Cached speech {cache_key[:12]} ({speech_cache.stats()['entries']} entries)")
+    except Exception as e:
+        print(f"⚠️ Failed to store speech in cache: {e}")
+
+
+def _stream_chunks(script_text: str, max_chars: int = SPEECH_STREAM_CHUNK_CHARS) -> List[str]:
+    """Group the script's sentences into chunks of at most max_chars (a long sentence is its own chunk)."""
+    chunks = []
+    for sentence in split_sentences(script_text):
+        if chunks and len(chunks[-1]) + 1 + len(sentence) <= max_chars:
+            chunks[-1] = f"{chunks[-1]} {sentence}"
+        else:
+            chunks.append(sentence)
+    return chunks
+
+
+def _synthesize_chunks(chunks: List[str], voice_link: str, user_id: str, api_key: str):
+    """
+    Synthesize script chunks concurrently and align each one while later chunks are in flight.
+
+    Returns only after every chunk is synthesized, joined and aligned; the gain is
+    overlapping TTS requests with each other and with alignment.
+
+    Args:
+        chunks: Script chunks in spoken order (see _stream_chunks)
+        voice_link: PlayHT voice link for the desired voice
+        user_id: PlayHT user id
+        api_key: PlayHT API key
+
+    Returns:
+        tuple: (path of the joined audio in SPEECH_OUTPUT_DIR, transcription dict or None if alignment is
+               disabled or failed and the joined audio must be transcribed)
+    """
+    chunk_paths = []
+    segments = []
+    offset = 0.0
+    aligned = SPEECH_TIMING_MODE == "align"
+    print(f"🌊 Chunked speech synthesis: {len(chunks)} chunks, {SPEECH_STREAM_CONCURRENCY} at a time")
 
+    with ThreadPoolExecutor(max_workers=max(1, SPEECH_STREAM_CONCURRENCY), thread_name_prefix="tts-chunk") as executor:
+        futures = [executor.submit(_generate_speech_audio, chunk, voice_link, user_id, api_key) for chunk in chunks]
+        try:
+            for index, (chunk, future) in enumerate(zip(chunks, futures)):
+                chunk_path = future.result()
+                chunk_paths.append(chunk_path)
+                if aligned:
+                    try:
+                        alignment = align_script(chunk_path, chunk, offset=offset)
+                        segments.extend(alignment["segments"])
+                        offset += alignment["duration"]
+                    except Exception as e:
+                        print(f"⚠️ Alignment of chunk {index + 1} failed, transcribing the joined audio instead: {e}")
+                        aligned = False
+                print(f"  🔊 Chunk {index + 1}/{len(chunks)} ready ({len(chunk)} chars)")
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            # Remove every chunk that was written, including ones not consumed yet
+            for future in futures:
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    chunk_path = future.result()
+                    if os.path.exists(chunk_path):
+                        os.remove(chunk_path)
+            raise
 
-def _generate_speech_audio(script_text: str, voice_link: str, user_id: str, api_key: str) -> str:
-    """Generate speech audio using PlayHT API and save to temporary file"""
+    # The joined audio is returned to the caller, so it goes where it outlives this call
+    audio_file_path = _new_output_path()
+    try:
+        concat_files(chunk_paths, audio_file_path, copy=True, audio_only=True)
+    except BaseException:
+        os.remove(audio_file_path)
+        raise
+    finally:
+        for path in chunk_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    return audio_file_path, ({"segments": segments} if aligned else None)
+
+
+def _generate_speech_audio(script_text: str, voice_link: str, user_id: str, api_key: str,
+                           output_path: Optional[str] = None) -> str:
+    """Generate speech audio using PlayHT API and save it to output_path (a new temporary file by default)"""
     
     # API configuration
     url = "https://api.play.ht/api/v2/tts/stream"
@@ -61,28 +266,43 @@ def _generate_speech_audio(script_text: str, voice_link: str, user_id: str, api_
     }
     payload = {
         "text": script_text,
-        "voice_engine": "PlayDialog",
+        "voice_engine": PLAYHT_VOICE_ENGINE,
         "voice": voice_link,
         "output_format": "mp3"
     }
     
     # Create temporary file for audio
-    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp_file:
-        audio_file_path = tmp_file.name
+    if output_path:
+        audio_file_path = output_path
+    else:
+        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp_file:
+            audio_file_path = tmp_file.name
     
     # Call PlayHT API
     response = requests.post(url, headers=headers, json=payload, stream=True)
     response.raise_for_status()
     
-    # Write audio data to file
-    with open(audio_file_path, "wb") as audio_file:
-        for chunk in response.iter_content(chunk_size=1024):
+    # Write audio data to file as it arrives, in large buffered writes
+    with open(audio_file_path, "wb", buffering=AUDIO_WRITE_BUFFER_BYTES) as audio_file:
+        for chunk in response.iter_content(chunk_size=AUDIO_STREAM_CHUNK_BYTES):
             if chunk:
                 audio_file.write(chunk)
     
     return audio_file_path
 
 
+def _speech_timings(audio_file_path: str, script_text: str, sieve_audio_file: sieve.File):
+    """Segment timings for the audio: forced alignment when enabled, otherwise (or on failure) transcription."""
+    if SPEECH_TIMING_MODE == "align":
+        try:
+            alignment = align_script(audio_file_path, script_text)
+            print(f"🎯 Aligned {len(alignment['segments'])} script segments to the audio")
+            return alignment
+        except Exception as e:
+            print(f"⚠️ Forced alignment failed, falling back to transcription: {e}")
+    return _transcribe_audio(sieve_audio_file)
+
+
 def _transcribe_audio(sieve_audio_file: sieve.File) -> dict:
     """Transcribe audio using Sieve transcription function"""
     
@@ -92,7 +312,7 @@ def _transcribe_audio(sieve_audio_file: sieve.File) -> dict:
     # Call transcription with recommended settings
     transcription_job = transcriber.push(
         file=sieve_audio_file,
-        backend="stable-ts-whisper-large-v3-turbo",
+        backend=TRANSCRIBE_BACKEND,
         word_level_timestamps=False,
         source_language="auto"
     )
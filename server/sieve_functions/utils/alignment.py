@@ -0,0 +1,181 @@
+import subprocess
+from bisect import bisect_left
+from typing import List, Optional, Sequence, Tuple
+
+from utils.ffmpeg import FFMPEG_BINARY
+from utils.timing import split_sentences
+
+# Voice activity is computed on 20 ms frames of 16 kHz mono audio
+ALIGNMENT_SAMPLE_RATE = 16000
+ALIGNMENT_FRAME_SECONDS = 0.02
+
+# Silences shorter than this are treated as part of a word, not a sentence break
+MIN_PAUSE_SECONDS = 0.12
+# How far a sentence boundary may move from its text-based estimate to land on a pause
+MAX_SNAP_SECONDS = 1.5
+# Per second of pause length, how much further away a pause may be and still win
+PAUSE_LENGTH_WEIGHT = 1.0
+
+Pause = Tuple[float, float]  # (start, end) in seconds
+
+def decode_audio(audio_path: str, sample_rate: int = ALIGNMENT_SAMPLE_RATE):
+    """
+    Decode any audio file ffmpeg understands to mono float samples in [-1, 1].
+
+    Returns:
+        numpy.ndarray: float32 samples at sample_rate
+    """
+    import numpy as np
+
+    result = subprocess.run(
+        [FFMPEG_BINARY, "-v", "error", "-i", audio_path, "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "-"],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not decode {audio_path}: {result.stderr.decode(errors='replace').strip()[-500:]}")
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+def voice_activity(samples, sample_rate: int = ALIGNMENT_SAMPLE_RATE,
+                   frame_seconds: float = ALIGNMENT_FRAME_SECONDS) -> List[bool]:
+    """
+    Energy-based voice activity per frame.
+
+    The threshold adapts to the clip: it sits between the noise floor (a low
+    percentile of frame energy) and the level of loud speech, so it works for
+    quiet and loud voices alike.
+
+    Returns:
+        list: One bool per frame, True where speech is present
+    """
+    import numpy as np
+
+    frame_length = max(1, int(sample_rate * frame_seconds))
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        return []
+    frames = np.asarray(samples[:frame_count * frame_length]).reshape(frame_count, frame_length)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+    noise_floor = np.percentile(energy_db, 10)
+    speech_level = np.percentile(energy_db, 90)
+    threshold = noise_floor + max(6.0, 0.35 * (speech_level - noise_floor))
+    return (energy_db > threshold).tolist()
+
+def find_pauses(voiced: Sequence[bool], frame_seconds: float = ALIGNMENT_FRAME_SECONDS,
+                min_pause: float = MIN_PAUSE_SECONDS) -> List[Pause]:
+    """Silent stretches of at least min_pause seconds between the first and last voiced frames."""
+    pauses = []
+    run_start = None
+    seen_speech = False
+    for index, is_voiced in enumerate(voiced):
+        if is_voiced:
+            if run_start is not None and seen_speech and (index - run_start) * frame_seconds >= min_pause:
+                pauses.append((run_start * frame_seconds, index * frame_seconds))
+            run_start = None
+            seen_speech = True
+        elif run_start is None:
+            run_start = index
+    return pauses
+
+def _voiced_time_to_clock(voiced: Sequence[bool], frame_seconds: float):
+    """Function mapping seconds of speech (pauses excluded) to clock time."""
+    voiced_frames = [index for index, is_voiced in enumerate(voiced) if is_voiced]
+
+    def clock(speech_seconds: float) -> float:
+        position = min(max(int(round(speech_seconds / frame_seconds)), 0), len(voiced_frames) - 1)
+        return voiced_frames[position] * frame_seconds
+
+    return clock, len(voiced_frames) * frame_seconds
+
+def _snap_to_pause(target: float, pauses: Sequence[Pause], after: float, used: set) -> Optional[int]:
+    """Index of the best unused pause near target that starts after `after`, or None."""
+    best, best_score = None, None
+    start = bisect_left([pause[1] for pause in pauses], target - MAX_SNAP_SECONDS)
+    for index in range(start, len(pauses)):
+        pause_start, pause_end = pauses[index]
+        middle = (pause_start + pause_end) / 2
+        if middle - target > MAX_SNAP_SECONDS:
+            break
+        if index in used or pause_start <= after or abs(middle - target) > MAX_SNAP_SECONDS:
+            continue
+        score = abs(middle - target) - PAUSE_LENGTH_WEIGHT * (pause_end - pause_start)
+        if best_score is None or score < best_score:
+            best, best_score = index, score
+    return best
+
+def align_sentences(sentences: Sequence[str], voiced: Sequence[bool],
+                    frame_seconds: float = ALIGNMENT_FRAME_SECONDS) -> List[dict]:
+    """
+    Align known sentences to a voice activity track.
+
+    Each sentence boundary is first estimated from the share of characters spoken,
+    measured in speech time so pauses do not skew it, and then moved to the nearest
+    pause, which is where a TTS voice breaks between sentences.
+
+    Args:
+        sentences: Script sentences in spoken order
+        voiced: Per-frame voice activity (see voice_activity)
+        frame_seconds: Frame length of the voice activity track
+
+    Returns:
+        list: [{"text", "start", "end"}] in seconds, one per sentence
+
+    Raises:
+        ValueError: If there are no sentences or no speech was detected
+    """
+    voiced = list(voiced)
+    if not sentences:
+        raise ValueError("Nothing to align: the script has no sentences")
+    if not any(voiced):
+        raise ValueError("No speech detected in the audio")
+
+    clock, speech_seconds = _voiced_time_to_clock(voiced, frame_seconds)
+    first_voiced = voiced.index(True) * frame_seconds
+    last_voiced = (len(voiced) - list(reversed(voiced)).index(True)) * frame_seconds
+    pauses = find_pauses(voiced, frame_seconds)
+
+    lengths = [max(len(sentence), 1) for sentence in sentences]
+    total_length = float(sum(lengths))
+
+    # Boundaries between consecutive sentences: (end of previous, start of next)
+    boundaries: List[Pause] = []
+    used = set()
+    spoken = 0
+    for length in lengths[:-1]:
+        spoken += length
+        target = clock(speech_seconds * spoken / total_length)
+        after = boundaries[-1][1] if boundaries else first_voiced
+        pause_index = _snap_to_pause(target, pauses, after, used)
+        if pause_index is not None:
+            used.add(pause_index)
+            boundaries.append(pauses[pause_index])
+        else:
+            boundary = max(target, after)
+            boundaries.append((boundary, boundary))
+
+    starts = [first_voiced] + [boundary[1] for boundary in boundaries]
+    ends = [boundary[0] for boundary in boundaries] + [last_voiced]
+    return [
+        {"text": sentence, "start": round(start, 3), "end": round(max(end, start), 3)}
+        for sentence, start, end in zip(sentences, starts, ends)
+    ]
+
+def align_script(audio_path: str, script_text: str, offset: float = 0.0) -> dict:
+    """
+    Force-align a known script to its synthesized audio, locally on the CPU.
+
+    Args:
+        audio_path: Synthesized audio of script_text
+        script_text: The text that was spoken
+        offset: Seconds added to every timing (for audio that is one chunk of a longer track)
+
+    Returns:
+        dict: {"segments": [{"text", "start", "end"}], "duration": float}, the
+              transcription shape the visuals generator expects
+    """
+    samples = decode_audio(audio_path)
+    segments = align_sentences(split_sentences(script_text), voice_activity(samples))
+    for segment in segments:
+        segment["start"] = round(segment["start"] + offset, 3)
+        segment["end"] = round(segment["end"] + offset, 3)
+    return {"segments": segments, "duration": round(len(samples) / ALIGNMENT_SAMPLE_RATE, 3)}
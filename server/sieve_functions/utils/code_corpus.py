@@ -0,0 +1,183 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Optional, Set
+
+from utils.content_cache import normalize_text
+
+# Words that carry no meaning when comparing animation descriptions
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it",
+    "its", "of", "on", "or", "show", "showing", "shows", "that", "the", "their", "then",
+    "this", "to", "with", "animation", "animate", "animated", "visualize", "visualizing",
+}
+
+# Stored code always saves to this file name; bind_output_path points it at a segment's file
+PLACEHOLDER_OUTPUT = "animation.mp4"
+_SAVE_CALL = re.compile(r"anim\.save\(\s*(['\"])[^'\"\n]*\.mp4\1")
+_PLACEHOLDER_SAVE_CALL = re.compile(r"anim\.save\(\s*['\"]" + re.escape(PLACEHOLDER_OUTPUT) + r"['\"]")
+
+def with_placeholder_output(code: str) -> str:
+    """Rewrite the mp4 path passed to anim.save back to PLACEHOLDER_OUTPUT, so stored code is reusable."""
+    return _SAVE_CALL.sub(f"anim.save('{PLACEHOLDER_OUTPUT}'", code)
+
+def bind_output_path(code: str, output_path: str) -> str:
+    """Make animation code save to output_path, appending an anim.save call if it has none."""
+    code = _PLACEHOLDER_SAVE_CALL.sub(lambda match: f"anim.save('{output_path}'", code)
+    if "anim.save(" not in code:
+        code += f"\nanim.save('{output_path}', writer='pillow', fps=30)\n"
+    return code
+
+def description_tokens(description: str) -> Set[str]:
+    """Return the set of meaningful lowercase tokens in a description."""
+    words = re.findall(r"[a-z0-9]+", normalize_text(description))
+    return {word for word in words if word not in _STOPWORDS and len(word) > 1}
+
+def jaccard_similarity(tokens_a: Set[str], tokens_b: Set[str]) -> float:
+    """Jaccard similarity of two token sets (0.0 when either is empty)."""
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+class AnimationCodeCorpus:
+    """
+    Persistent store of matplotlib animation code that has been proven to render.
+
+    Entries are indexed by normalized description and duration and stored with
+    their output path replaced by PLACEHOLDER_OUTPUT. Exact matches can be reused
+    as-is; similar descriptions can seed a single fix-up call instead of a cold
+    generation.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 2000):
+        """
+        Initialize the corpus.
+
+        Args:
+            db_path: Path of the SQLite database file (created if missing)
+            max_entries: Maximum number of entries kept; least recently used are pruned
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS animation_code (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    description_key TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    tokens TEXT NOT NULL,
+                    duration REAL NOT NULL,
+                    code TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    use_count INTEGER NOT NULL DEFAULT 0,
+                    UNIQUE (description_key, duration)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_animation_code_last_used ON animation_code (last_used_at)")
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def add(self, description: str, duration: float, code: str):
+        """Record code that rendered successfully for a description and duration."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    """
+                    INSERT INTO animation_code (description_key, description, tokens, duration, code, created_at, last_used_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (description_key, duration)
+                    DO UPDATE SET code = excluded.code, last_used_at = excluded.last_used_at
+                    """,
+                    (normalize_text(description), description, " ".join(sorted(description_tokens(description))),
+                     round(duration, 1), with_placeholder_output(code), now, now)
+                )
+                # Prune least recently used entries beyond the size limit
+                conn.execute(
+                    """
+                    DELETE FROM animation_code WHERE id NOT IN (
+                        SELECT id FROM animation_code ORDER BY last_used_at DESC LIMIT ?
+                    )
+                    """,
+                    (self.max_entries,)
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def find_exact(self, description: str, duration: float) -> Optional[dict]:
+        """
+        Find code stored for the same normalized description and duration.
+
+        Returns:
+            dict: {"id", "description", "duration", "code"} or None
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT id, description, duration, code FROM animation_code WHERE description_key = ? AND duration = ?",
+                    (normalize_text(description), round(duration, 1))
+                ).fetchone()
+                if row:
+                    self._touch(conn, row["id"])
+                return dict(row) if row else None
+            finally:
+                conn.close()
+
+    def find_similar(self, description: str, min_similarity: float) -> Optional[dict]:
+        """
+        Find the stored entry whose description is most similar to this one.
+
+        Returns:
+            dict: {"id", "description", "duration", "code", "similarity"} or None if
+                  nothing reaches min_similarity
+        """
+        tokens = description_tokens(description)
+        if not tokens:
+            return None
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                best_row, best_similarity = None, 0.0
+                for row in conn.execute("SELECT id, description, tokens, duration FROM animation_code"):
+                    similarity = jaccard_similarity(tokens, set(row["tokens"].split()))
+                    if similarity > best_similarity:
+                        best_row, best_similarity = row, similarity
+
+                if not best_row or best_similarity < min_similarity:
+                    return None
+
+                code = conn.execute("SELECT code FROM animation_code WHERE id = ?", (best_row["id"],)).fetchone()["code"]
+                self._touch(conn, best_row["id"])
+                return {
+                    "id": best_row["id"],
+                    "description": best_row["description"],
+                    "duration": best_row["duration"],
+                    "code": code,
+                    "similarity": best_similarity,
+                }
+            finally:
+                conn.close()
+
+    def _touch(self, conn: sqlite3.Connection, entry_id: int):
+        conn.execute(
+            "UPDATE animation_code SET last_used_at = ?, use_count = use_count + 1 WHERE id = ?",
+            (time.time(), entry_id)
+        )
+        conn.commit()
@@ -0,0 +1,196 @@
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DATA_FILENAME = "data"
+META_FILENAME = "meta.json"
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize free text for use in cache keys.
+    Lowercases, collapses whitespace and strips surrounding punctuation so that
+    trivially different phrasings of the same request share a key.
+    """
+    normalized = re.sub(r"\s+", " ", (text or "").strip().lower())
+    return normalized.strip(" .,!?;:")
+
+def make_key(*parts: Any) -> str:
+    """Build a content-addressed key (sha256 hex digest) from JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ContentCache:
+    """
+    Persistent on-disk cache of files keyed by content hash.
+
+    Each entry is a directory holding the cached file and a small JSON metadata
+    document. Entries are evicted least-recently-used first once the total size
+    exceeds max_bytes. Safe to share between threads of one process; entries are
+    published with an atomic rename so concurrent processes never see partial writes.
+    """
+
+    def __init__(self, root_dir: str, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            root_dir: Directory where cache entries are stored (created if missing)
+            max_bytes: Maximum total size of cached files before LRU eviction
+        """
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None  # key -> size, oldest first
+        self._total_bytes = 0
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root_dir, key[:2], key)
+
+    def _load_index(self):
+        """Scan the cache directory once and order entries by last use."""
+        if self._index is not None:
+            return
+
+        entries = []
+        if os.path.isdir(self.root_dir):
+            for shard in os.listdir(self.root_dir):
+                shard_dir = os.path.join(self.root_dir, shard)
+                if not os.path.isdir(shard_dir):
+                    continue
+                for key in os.listdir(shard_dir):
+                    if key.startswith("."):
+                        continue  # Entry still being staged by a writer
+                    meta_path = os.path.join(shard_dir, key, META_FILENAME)
+                    data_path = os.path.join(shard_dir, key, DATA_FILENAME)
+                    try:
+                        entries.append((os.path.getmtime(meta_path), key, os.path.getsize(data_path)))
+                    except OSError:
+                        continue  # Partially written or corrupted entry
+
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._index.values())
+
+    def get(self, key: str, dest_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key: Cache key (see make_key)
+            dest_path: If given, the cached file is copied here so the caller owns it
+
+        Returns:
+            dict: {"path": str, "metadata": dict} or None on a miss
+        """
+        with self._lock:
+            self._load_index()
+            entry_dir = self._entry_dir(key)
+            data_path = os.path.join(entry_dir, DATA_FILENAME)
+            meta_path = os.path.join(entry_dir, META_FILENAME)
+
+            if key not in self._index or not os.path.exists(data_path):
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+
+            try:
+                with open(meta_path, "r") as f:
+                    metadata = json.load(f)
+                if dest_path:
+                    shutil.copyfile(data_path, dest_path)
+                os.utime(meta_path)  # Last-use time drives LRU order across restarts
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️ Cache entry {key[:12]} unreadable, dropping it: {e}")
+                self._remove_entry(key)
+                self.misses += 1
+                return None
+
+            self._index.move_to_end(key)
+            self.hits += 1
+            return {"path": dest_path or data_path, "metadata": metadata}
+
+    def put(self, key: str, file_path: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Store a copy of file_path under key, evicting old entries if needed.
+
+        Args:
+            key: Cache key (see make_key)
+            file_path: File to copy into the cache
+            metadata: JSON-serializable metadata stored alongside the file
+
+        Returns:
+            bool: True if the entry was stored
+        """
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return False
+
+        if size > self.max_bytes:
+            print(f"  ⚠️ Not caching {key[:12]}: {size} bytes exceeds cache size limit")
+            return False
+
+        try:
+            # Stage the entry next to its final location, then publish it atomically
+            entry_dir = self._entry_dir(key)
+            os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+            staging_dir = tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=os.path.dirname(entry_dir))
+            shutil.copyfile(file_path, os.path.join(staging_dir, DATA_FILENAME))
+            with open(os.path.join(staging_dir, META_FILENAME), "w") as f:
+                json.dump({**(metadata or {}), "stored_at": time.time()}, f)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"  ⚠️ Failed to stage cache entry {key[:12]}: {e}")
+            return False
+
+        with self._lock:
+            self._load_index()
+            if key in self._index:
+                self._remove_entry(key)
+            try:
+                os.replace(staging_dir, entry_dir)
+            except OSError as e:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                print(f"  ⚠️ Failed to publish cache entry {key[:12]}: {e}")
+                return False
+
+            self._index[key] = size
+            self._total_bytes += size
+            self._evict()
+        return True
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        while self._total_bytes > self.max_bytes and self._index:
+            oldest_key = next(iter(self._index))
+            self._remove_entry(oldest_key)
+            self.evictions += 1
+
+    def _remove_entry(self, key: str):
+        size = self._index.pop(key, 0) if self._index is not None else 0
+        self._total_bytes -= size
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size for logging."""
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "entries": len(self._index),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
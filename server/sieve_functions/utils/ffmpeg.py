@@ -0,0 +1,174 @@
+import os
+import json
+import subprocess
+import tempfile
+from typing import List, Optional
+
+# Same variable MoviePy honours, so both paths use the same binary
+FFMPEG_BINARY = os.environ.get("FFMPEG_BINARY", "ffmpeg")
+FFPROBE_BINARY = os.environ.get("FFPROBE_BINARY", "ffprobe")
+
+def run_ffmpeg(args: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    """
+    Run ffmpeg with the given arguments (without the binary name).
+
+    Raises:
+        RuntimeError: If ffmpeg exits with a non-zero status
+    """
+    cmd = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-y", *args]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed with return code {result.returncode}: {result.stderr.strip()[-2000:]}")
+    return result
+
+class RawVideoEncoder:
+    """
+    Long-lived ffmpeg process that encodes raw frames written to its stdin.
+
+    Frames are numpy uint8 arrays of shape (height, width, 3) in the given pixel
+    format. Used to encode a whole track in one pass instead of encoding each
+    piece separately and re-encoding the concatenation.
+    """
+
+    def __init__(self, output_path: str, width: int, height: int, fps: int,
+                 pix_fmt: str = "bgr24", codec_args: Optional[List[str]] = None):
+        """
+        Start the encoder.
+
+        Args:
+            output_path: Path of the video file to write
+            width: Frame width in pixels
+            height: Frame height in pixels
+            fps: Output frame rate
+            pix_fmt: Pixel format of the frames written (bgr24 matches OpenCV)
+            codec_args: Output codec arguments (defaults to H.264 yuv420p)
+        """
+        self.output_path = output_path
+        self.width = width
+        self.height = height
+        self.frames_written = 0
+        self._stderr_file = tempfile.TemporaryFile()
+
+        codec_args = codec_args or ["-c:v", "libx264", "-preset", "medium", "-b:v", "5000k", "-pix_fmt", "yuv420p"]
+        cmd = [
+            FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            "-an", *codec_args,
+            "-movflags", "+faststart",
+            output_path,
+        ]
+        self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr_file)
+
+    def write_frame(self, frame) -> None:
+        """Write one frame; raises RuntimeError if the encoder has died."""
+        if frame.shape[0] != self.height or frame.shape[1] != self.width:
+            raise ValueError(f"Frame size {frame.shape[1]}x{frame.shape[0]} does not match encoder size {self.width}x{self.height}")
+        try:
+            self._process.stdin.write(frame.tobytes())
+        except (BrokenPipeError, OSError) as e:
+            raise RuntimeError(f"Encoder stopped accepting frames: {self._read_stderr() or e}") from e
+        self.frames_written += 1
+
+    def close(self, timeout: Optional[float] = None) -> str:
+        """
+        Finish encoding and wait for ffmpeg to exit.
+
+        Returns:
+            str: The output path
+
+        Raises:
+            RuntimeError: If ffmpeg failed
+        """
+        try:
+            if self._process.stdin and not self._process.stdin.closed:
+                self._process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        returncode = self._process.wait(timeout=timeout)
+        stderr = self._read_stderr()
+        self._stderr_file.close()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg encoder failed with return code {returncode}: {stderr[-2000:]}")
+        return self.output_path
+
+    def abort(self) -> None:
+        """Kill the encoder and discard its output."""
+        try:
+            self._process.kill()
+            self._process.wait()
+        finally:
+            self._stderr_file.close()
+            if os.path.exists(self.output_path):
+                os.remove(self.output_path)
+
+    def _read_stderr(self) -> str:
+        try:
+            self._stderr_file.seek(0)
+            return self._stderr_file.read().decode("utf-8", errors="replace").strip()
+        except (OSError, ValueError):
+            return ""
+
+# Stream parameters that must match for files to be joined with "-c copy"
+CONCAT_COPY_KEYS = ("codec_name", "profile", "width", "height", "pix_fmt", "r_frame_rate", "time_base")
+
+def probe_video(path: str) -> dict:
+    """
+    Probe the first video stream of a file.
+
+    Returns:
+        dict: codec_name, profile, width, height, pix_fmt, r_frame_rate, time_base and
+              duration (seconds, float or None)
+
+    Raises:
+        RuntimeError: If ffprobe fails or the file has no video stream
+    """
+    cmd = [
+        FFPROBE_BINARY, "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=" + ",".join(CONCAT_COPY_KEYS) + ":format=duration",
+        "-of", "json", path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed for {path}: {result.stderr.strip()}")
+
+    data = json.loads(result.stdout or "{}")
+    streams = data.get("streams") or []
+    if not streams:
+        raise RuntimeError(f"No video stream in {path}")
+
+    info = {key: streams[0].get(key) for key in CONCAT_COPY_KEYS}
+    try:
+        info["duration"] = float(data.get("format", {}).get("duration"))
+    except (TypeError, ValueError):
+        info["duration"] = None
+    return info
+
+def concat_files(paths: List[str], output_path: str, copy: bool = True,
+                 encode_args: Optional[List[str]] = None, audio_only: bool = False) -> str:
+    """
+    Join video (or, with audio_only, audio) files with the concat demuxer.
+
+    Args:
+        paths: Input files, in order
+        output_path: Path of the joined file
+        copy: Stream-copy (all inputs must share CONCAT_COPY_KEYS); otherwise re-encode
+        encode_args: Filter and codec arguments used when copy is False
+        audio_only: Keep only the audio streams instead of only the video streams
+
+    Returns:
+        str: The output path
+    """
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as list_file:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            list_file.write(f"file '{escaped}'\n")
+        list_path = list_file.name
+
+    try:
+        codec_args = ["-c", "copy"] if copy else (encode_args or [])
+        stream_args = ["-vn"] if audio_only else ["-an", "-movflags", "+faststart"]
+        run_ffmpeg(["-f", "concat", "-safe", "0", "-i", list_path, *codec_args, *stream_args, output_path])
+    finally:
+        os.unlink(list_path)
+    return output_path
@@ -1,31 +1,188 @@
 import os
 import json
-from openai import OpenAI
-from anthropic import Anthropic
+import asyncio
+import threading
+import weakref
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from anthropic import Anthropic, AsyncAnthropic
 from pydantic import BaseModel, ValidationError
-from typing import Type, Optional, Union
+from typing import Dict, Tuple, Type, Optional, Union
 
 # Default models
 DEFAULT_GPT_MODEL = "gpt-4o"
 DEFAULT_CLAUDE_MODEL = "claude-3-opus-20240229"
 
+# Shared client settings: clients are created once per provider, API key and timeout
+# and reused by every thread, so keep-alive connections and TLS sessions survive
+# between the many plan, code, fix-up and image calls of one video
+LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", 120))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("LLM_CONNECT_TIMEOUT_SECONDS", 10))
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", 32))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 2))
+
+# Maximum concurrent requests per provider from the async helpers (per event loop)
+LLM_MAX_CONCURRENCY = {
+    "gpt": int(os.environ.get("LLM_MAX_CONCURRENCY_GPT", 16)),
+    "claude": int(os.environ.get("LLM_MAX_CONCURRENCY_CLAUDE", 8)),
+}
+
+_clients: Dict[Tuple[str, str, float], Union[OpenAI, Anthropic]] = {}
+_clients_lock = threading.Lock()
+
+# Async clients and limiters belong to the event loop they were created on
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+_async_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+def _http_client(timeout: float) -> httpx.Client:
+    """Pooled HTTP client with keep-alive shared by all calls through one SDK client."""
+    return httpx.Client(
+        timeout=httpx.Timeout(timeout, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS),
+    )
+
+def _api_key(provider: str) -> Tuple[str, str]:
+    """Normalized provider name and its API key from the environment."""
+    provider = provider.lower()
+    if provider == "gpt":
+        env_name = "OPENAI_API_KEY"
+    elif provider == "claude":
+        env_name = "ANTHROPIC_API_KEY"
+    else:
+        raise ValueError(f"Unsupported LLM provider: {provider}. Supported providers are 'gpt' and 'claude'.")
+
+    api_key = os.getenv(env_name)
+    if not api_key:
+        raise ValueError(f"{env_name} environment variable not set.")
+    return provider, api_key
+
+def get_client(provider: str, timeout: Optional[float] = None) -> Union[OpenAI, Anthropic]:
+    """
+    Return the shared SDK client for a provider, creating it on first use.
+
+    Clients are keyed by provider, API key and timeout, so a rotated key gets a
+    fresh client. The SDK clients are safe to share between threads.
+
+    Args:
+        provider: "gpt" (OpenAI) or "claude" (Anthropic)
+        timeout: Request timeout in seconds (default LLM_TIMEOUT_SECONDS)
+
+    Returns:
+        OpenAI or Anthropic client
+    """
+    provider, api_key = _api_key(provider)
+    client_class = OpenAI if provider == "gpt" else Anthropic
+    timeout = timeout if timeout is not None else LLM_TIMEOUT_SECONDS
+    key = (provider, api_key, timeout)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = client_class(
+                api_key=api_key,
+                timeout=timeout,
+                max_retries=LLM_MAX_RETRIES,
+                http_client=_http_client(timeout),
+            )
+            _clients[key] = client
+        return client
+
+def close_clients():
+    """Close every shared client and its connection pool (they are recreated on next use)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"Error closing LLM client: {e}")
+
+def get_async_client(provider: str, timeout: Optional[float] = None) -> Union[AsyncOpenAI, AsyncAnthropic]:
+    """
+    Return the shared async SDK client for a provider on the running event loop.
+
+    Async connection pools cannot cross event loops, so each loop gets its own
+    clients, keyed like get_client. Must be called from a coroutine.
+    """
+    provider, api_key = _api_key(provider)
+    client_class = AsyncOpenAI if provider == "gpt" else AsyncAnthropic
+    timeout = timeout if timeout is not None else LLM_TIMEOUT_SECONDS
+    key = (provider, api_key, timeout)
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        loop_clients = _async_clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            client = client_class(
+                api_key=api_key,
+                timeout=timeout,
+                max_retries=LLM_MAX_RETRIES,
+                http_client=httpx.AsyncClient(
+                    timeout=httpx.Timeout(timeout, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+                    limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS),
+                ),
+            )
+            loop_clients[key] = client
+        return client
+
+async def aclose_clients():
+    """Close the async clients of the running event loop."""
+    with _clients_lock:
+        clients = list(_async_clients.pop(asyncio.get_running_loop(), {}).values())
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"Error closing LLM client: {e}")
+
+def _async_limiter(provider: str) -> asyncio.Semaphore:
+    """Per-provider semaphore shared by every async call on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        limiters = _async_limiters.setdefault(loop, {})
+        if provider not in limiters:
+            limiters[provider] = asyncio.Semaphore(max(1, LLM_MAX_CONCURRENCY[provider]))
+        return limiters[provider]
+
+def _gpt_messages(prompt: str, system_prompt: Optional[str]) -> list:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+def _parsed_message(completion) -> BaseModel:
+    """The Pydantic instance from a .parse() completion's first choice."""
+    # The .parse() method should directly return the parsed Pydantic model instance
+    # from the first choice's message.
+    if completion.choices and completion.choices[0].message and hasattr(completion.choices[0].message, 'parsed'):
+        return completion.choices[0].message.parsed
+    # This case should ideally not be hit if parse works as expected
+    print("Error: LLM response via .parse() did not yield expected parsed message structure.")
+    raise ValueError("Failed to get parsed message from LLM response using .parse().")
+
+def _claude_request(prompt: str, model: Optional[str], system_prompt: Optional[str]) -> dict:
+    # Build the request parameters
+    request_params = {
+        "model": model if model else DEFAULT_CLAUDE_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": 1024
+    }
+
+    # Only add system parameter if system_prompt is provided
+    if system_prompt:
+        request_params["system"] = system_prompt
+    return request_params
+
 def _call_gpt(
     prompt: str,
     model: str = None,
     system_prompt: Optional[str] = None,
     response_model: Optional[Type[BaseModel]] = None
 ) -> Union[str, BaseModel]:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable not set.")
-    
-    client = OpenAI(api_key=api_key)
+    client = get_client("gpt")
     current_model = model if model else DEFAULT_GPT_MODEL
-
-    messages = []
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
-    messages.append({"role": "user", "content": prompt})
+    messages = _gpt_messages(prompt, system_prompt)
 
     try:
         if response_model:
@@ -35,14 +192,7 @@ def _call_gpt(
                 messages=messages,
                 response_format=response_model # Pass the Pydantic model directly
             )
-            # The .parse() method should directly return the parsed Pydantic model instance
-            # from the first choice's message.
-            if completion.choices and completion.choices[0].message and hasattr(completion.choices[0].message, 'parsed'):
-                 return completion.choices[0].message.parsed
-            else:
-                # This case should ideally not be hit if parse works as expected
-                print("Error: LLM response via .parse() did not yield expected parsed message structure.")
-                raise ValueError("Failed to get parsed message from LLM response using .parse().")
+            return _parsed_message(completion)
         else:
             # Standard call for non-structured response
             response = client.chat.completions.create(
@@ -64,25 +214,10 @@ def _call_claude(
     model: str = None,
     system_prompt: Optional[str] = None,
 ) -> str:
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY environment variable not set.")
-    client = Anthropic(api_key=api_key)
-    current_model = model if model else DEFAULT_CLAUDE_MODEL
+    client = get_client("claude")
 
     try:
-        # Build the request parameters
-        request_params = {
-            "model": current_model,
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 1024
-        }
-        
-        # Only add system parameter if system_prompt is provided
-        if system_prompt:
-            request_params["system"] = system_prompt
-            
-        response = client.messages.create(**request_params)
+        response = client.messages.create(**_claude_request(prompt, model, system_prompt))
         return response.content[0].text
     except Exception as e:
         print(f"Error calling Anthropic API: {e}")
@@ -122,11 +257,7 @@ def generate_image(
     Returns:
         str: URL of the generated image
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable not set.")
-    
-    client = OpenAI(api_key=api_key)
+    client = get_client("gpt")
     
     try:
         response = client.images.generate(
@@ -142,3 +273,94 @@ def generate_image(
     except Exception as e:
         print(f"Error generating image: {e}")
         raise
+
+async def _acall_gpt(
+    prompt: str,
+    model: str = None,
+    system_prompt: Optional[str] = None,
+    response_model: Optional[Type[BaseModel]] = None
+) -> Union[str, BaseModel]:
+    client = get_async_client("gpt")
+    current_model = model if model else DEFAULT_GPT_MODEL
+    messages = _gpt_messages(prompt, system_prompt)
+
+    try:
+        if response_model:
+            completion = await client.beta.chat.completions.parse(
+                model=current_model,
+                messages=messages,
+                response_format=response_model
+            )
+            return _parsed_message(completion)
+        response = await client.chat.completions.create(
+            model=current_model,
+            messages=messages,
+        )
+        return response.choices[0].message.content
+    except Exception as e:
+        print(f"Error calling OpenAI API: {e}")
+        raise
+
+async def _acall_claude(
+    prompt: str,
+    model: str = None,
+    system_prompt: Optional[str] = None,
+) -> str:
+    client = get_async_client("claude")
+
+    try:
+        response = await client.messages.create(**_claude_request(prompt, model, system_prompt))
+        return response.content[0].text
+    except Exception as e:
+        print(f"Error calling Anthropic API: {e}")
+        raise
+
+async def acall_llm(
+    provider: str,
+    prompt: str,
+    model: str = None,
+    system_prompt: Optional[str] = None,
+    response_model: Optional[Type[BaseModel]] = None
+) -> Union[str, BaseModel]:
+    """
+    Async counterpart of call_llm, for issuing many calls at once without a thread each.
+
+    Calls share a per-provider semaphore (LLM_MAX_CONCURRENCY_GPT / _CLAUDE), so a
+    large asyncio.gather fans out only as far as the provider's limit. Arguments and
+    structured output behave exactly as in call_llm.
+    """
+    provider, _ = _api_key(provider)
+    async with _async_limiter(provider):
+        if provider == "gpt":
+            return await _acall_gpt(prompt, model, system_prompt, response_model)
+        if response_model:
+            print("Warning: 'response_model' is provided but not natively supported for Claude in this utility. Returning raw text.")
+        return await _acall_claude(prompt, model, system_prompt)
+
+async def agenerate_image(
+    prompt: str,
+    model: str = "dall-e-3",
+    size: str = "1024x1024",
+    quality: str = "standard"
+) -> str:
+    """
+    Async counterpart of generate_image, limited by the "gpt" provider semaphore.
+
+    Returns:
+        str: URL of the generated image
+    """
+    client = get_async_client("gpt")
+
+    async with _async_limiter("gpt"):
+        try:
+            response = await client.images.generate(
+                model=model,
+                prompt=prompt,
+                n=1,
+                size=size,
+                quality=quality if model == "dall-e-3" else None
+            )
+            return response.data[0].url
+        except Exception as e:
+            print(f"Error generating image: {e}")
+            raise
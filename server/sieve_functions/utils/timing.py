@@ -0,0 +1,100 @@
+import re
+from bisect import bisect_right
+from typing import List, Sequence, Tuple
+
+# Typical narration pace of the TTS voices, used before the real audio exists
+ESTIMATED_WORDS_PER_SECOND = 2.6
+ESTIMATED_SENTENCE_PAUSE_SECONDS = 0.3
+
+Anchor = Tuple[float, float]  # (estimated time, actual time)
+
+def split_sentences(text: str) -> List[str]:
+    """Split a script into sentences, keeping their punctuation."""
+    sentences = re.split(r"(?<=[.!?])\s+", (text or "").strip())
+    return [sentence for sentence in sentences if sentence]
+
+def estimate_transcription(script_text: str, words_per_second: float = ESTIMATED_WORDS_PER_SECOND) -> dict:
+    """
+    Estimate sentence timings for a script that has not been spoken yet.
+
+    Returns:
+        dict: {"segments": [{"text", "start", "end"}]}, the same shape as a
+              transcription, so it can drive visual planning directly
+    """
+    segments = []
+    current_time = 0.0
+    for sentence in split_sentences(script_text):
+        duration = max(len(sentence.split()) / words_per_second, 0.5)
+        segments.append({"text": sentence, "start": round(current_time, 3), "end": round(current_time + duration, 3)})
+        current_time += duration + ESTIMATED_SENTENCE_PAUSE_SECONDS
+    return {"segments": segments}
+
+def _char_timeline(segments: Sequence[dict]) -> List[Tuple[float, float]]:
+    """
+    Map transcript progress to time: (fraction of characters spoken, time) points.
+
+    Speech is assumed to advance linearly in characters within a segment.
+    """
+    lengths = [max(len(str(segment.get("text", "")).strip()), 1) for segment in segments]
+    total = float(sum(lengths)) or 1.0
+    points = []
+    spoken = 0
+    for segment, length in zip(segments, lengths):
+        points.append((spoken / total, float(segment["start"])))
+        spoken += length
+        points.append((spoken / total, float(segment["end"])))
+    return points
+
+def _interpolate(points: Sequence[Tuple[float, float]], x: float) -> float:
+    """Piecewise-linear interpolation over points sorted by x (clamped at the ends)."""
+    xs = [point[0] for point in points]
+    index = bisect_right(xs, x)
+    if index == 0:
+        return points[0][1]
+    if index >= len(points):
+        return points[-1][1]
+    (x0, y0), (x1, y1) = points[index - 1], points[index]
+    if x1 <= x0:
+        return y1
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+def build_retiming_anchors(estimated_segments: Sequence[dict], actual_segments: Sequence[dict]) -> List[Anchor]:
+    """
+    Build anchors mapping estimated times to real times.
+
+    Both transcripts are aligned by the fraction of text spoken, so anchors are
+    placed at every segment boundary of either transcript. The first anchor is
+    always (0, 0) and both coordinates are strictly increasing.
+
+    Returns:
+        list: [(estimated_time, actual_time), ...]
+    """
+    if not estimated_segments or not actual_segments:
+        return []
+
+    estimated_timeline = _char_timeline(estimated_segments)
+    actual_timeline = _char_timeline(actual_segments)
+    fractions = sorted({point[0] for point in estimated_timeline} | {point[0] for point in actual_timeline})
+
+    anchors: List[Anchor] = [(0.0, 0.0)]
+    for fraction in fractions:
+        estimated_time = _interpolate(estimated_timeline, fraction)
+        actual_time = _interpolate(actual_timeline, fraction)
+        if estimated_time > anchors[-1][0] + 1e-3 and actual_time > anchors[-1][1] + 1e-3:
+            anchors.append((round(estimated_time, 3), round(actual_time, 3)))
+    return anchors if len(anchors) > 1 else []
+
+def warp_time(t: float, anchors: Sequence[Anchor], inverse: bool = False) -> float:
+    """
+    Map an estimated time to a real time using the anchors (or back with inverse=True).
+
+    Outside the anchored range time advances at normal speed from the nearest anchor.
+    """
+    points = [(actual, estimated) for estimated, actual in anchors] if inverse else list(anchors)
+    if not points:
+        return t
+    if t <= points[0][0]:
+        return points[0][1] + (t - points[0][0])
+    if t >= points[-1][0]:
+        return points[-1][1] + (t - points[-1][0])
+    return _interpolate(points, t)
@@ -0,0 +1,261 @@
+import os
+import sys
+import time
+import queue
+import atexit
+import signal
+import tempfile
+import threading
+import traceback
+import multiprocessing
+from typing import Optional
+
+# Libraries the generated animation code is allowed to use; imported once per worker
+PRELOAD_MODULES = [
+    "numpy",
+    "matplotlib",
+    "matplotlib.pyplot",
+    "matplotlib.animation",
+    "scipy",
+    "scipy.special",
+    "scipy.integrate",
+    "scipy.optimize",
+    "scipy.interpolate",
+    "scipy.stats",
+    "sympy",
+    "seaborn",
+]
+
+# Thread pools of numpy/scipy (OpenBLAS, MKL, OpenMP) are capped at one thread per
+# render: several renders already run in parallel, and a worker that forks a job child
+# must not have started BLAS threads. Values already set in the environment win.
+RENDER_THREAD_ENV = {
+    "OMP_NUM_THREADS": "1",
+    "OPENBLAS_NUM_THREADS": "1",
+    "MKL_NUM_THREADS": "1",
+    "NUMEXPR_NUM_THREADS": "1",
+}
+
+# Extra time allowed for a worker to report back beyond the job timeout
+WORKER_RESPONSE_GRACE_SECONDS = 30
+
+def render_env() -> dict:
+    """Environment for a render process: the current one plus RENDER_THREAD_ENV defaults."""
+    return {**RENDER_THREAD_ENV, **os.environ}
+
+def _warm_up():
+    """Import the animation libraries and apply the shared matplotlib setup."""
+    import importlib
+    try:
+        import matplotlib
+        matplotlib.use("Agg")  # Headless backend, same as a fresh script without a display
+    except ImportError:
+        return  # The job itself will surface the ImportError
+
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass  # The job itself will surface the ImportError if it needs the module
+
+    import matplotlib.pyplot as plt
+    plt.style.use("dark_background")
+
+def _run_forked_job(script_path: str, timeout: float) -> dict:
+    """
+    Run one script in a forked child of this (already warm) worker.
+
+    The child starts with every preloaded library in memory but otherwise gets a
+    fresh process, so jobs stay isolated from each other exactly as with a
+    separate interpreter per script.
+    """
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        pid = os.fork()
+        if pid == 0:
+            # Child: capture output at the fd level so C extensions and ffmpeg are included
+            exit_code = 1
+            try:
+                os.dup2(stdout_file.fileno(), 1)
+                os.dup2(stderr_file.fileno(), 2)
+                import runpy
+                runpy.run_path(script_path, run_name="__main__")
+                exit_code = 0
+            except SystemExit as e:
+                if e.code is None:
+                    exit_code = 0
+                elif isinstance(e.code, int):
+                    exit_code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                try:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                finally:
+                    os._exit(exit_code)
+
+        # Parent: wait for the child with the same timeout as a subprocess run
+        deadline = time.monotonic() + timeout
+        timed_out = False
+        status = 0
+        while True:
+            finished_pid, status = os.waitpid(pid, os.WNOHANG)
+            if finished_pid:
+                break
+            if time.monotonic() >= deadline:
+                timed_out = True
+                os.kill(pid, signal.SIGKILL)
+                _, status = os.waitpid(pid, 0)
+                break
+            time.sleep(0.02)
+
+        stdout_file.seek(0)
+        stderr_file.seek(0)
+        return {
+            "returncode": os.waitstatus_to_exitcode(status),
+            "stdout": stdout_file.read().decode("utf-8", errors="replace"),
+            "stderr": stderr_file.read().decode("utf-8", errors="replace"),
+            "timed_out": timed_out,
+        }
+
+def _worker_main(conn):
+    """Worker loop: warm up once, then run each script received over the pipe."""
+    # Thread limits are read when the libraries load, so set them before preloading
+    os.environ.update(render_env())
+    _warm_up()
+    conn.send({"ready": True})
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        try:
+            result = _run_forked_job(job["script_path"], job["timeout"])
+        except Exception as e:
+            result = {"returncode": 1, "stdout": "", "stderr": f"Warm renderer error: {e}\n{traceback.format_exc()}", "timed_out": False}
+        conn.send(result)
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self, timeout: float) -> bool:
+        if not self.ready and self.conn.poll(timeout):
+            self.ready = bool(self.conn.recv().get("ready"))
+        return self.ready
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+class WarmRendererPool:
+    """
+    Pool of pre-warmed worker processes for executing animation scripts.
+
+    Each worker imports matplotlib, numpy, scipy, sympy and seaborn and sets the
+    dark_background style once. Scripts are sent over a pipe; the worker forks a
+    child per script, enforces the timeout, and returns the exit code and output.
+    """
+
+    def __init__(self, size: int, warmup_timeout: float = 120):
+        """
+        Initialize the pool (workers are started lazily by start()).
+
+        Args:
+            size: Number of warm worker processes
+            warmup_timeout: Seconds to wait for a worker to finish importing libraries
+        """
+        self.size = max(1, size)
+        self.warmup_timeout = warmup_timeout
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        # Workers are spawned (not forked) so they never inherit the parent's threads
+        self._ctx = multiprocessing.get_context("spawn")
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Warm workers fork a child per job, which requires a POSIX platform."""
+        return hasattr(os, "fork") and hasattr(os, "waitstatus_to_exitcode")
+
+    def start(self):
+        """Start the worker processes in the background (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(_Worker(self._ctx))
+            self._started = True
+
+    def run(self, script_path: str, timeout: float) -> dict:
+        """
+        Execute a script on a warm worker.
+
+        Args:
+            script_path: Path of the Python script to run
+            timeout: Seconds before the job is killed
+
+        Returns:
+            dict: {"returncode": int, "stdout": str, "stderr": str, "timed_out": bool}
+
+        Raises:
+            RuntimeError: If the worker could not be used (caller should fall back)
+        """
+        self.start()
+        worker = self._idle.get()
+        try:
+            if not worker.wait_ready(self.warmup_timeout):
+                raise RuntimeError("Warm renderer worker did not finish warming up")
+
+            worker.conn.send({"script_path": script_path, "timeout": timeout})
+            if not worker.conn.poll(timeout + WORKER_RESPONSE_GRACE_SECONDS):
+                raise RuntimeError("Warm renderer worker stopped responding")
+            result = worker.conn.recv()
+        except (RuntimeError, EOFError, OSError) as e:
+            # Replace the broken worker so the pool keeps its size
+            worker.stop()
+            self._idle.put(_Worker(self._ctx))
+            raise RuntimeError(str(e)) from e
+
+        self._idle.put(worker)
+        return result
+
+    def shutdown(self):
+        """Stop all idle workers."""
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().stop()
+                except queue.Empty:
+                    break
+            self._started = False
+
+_default_pool: Optional[WarmRendererPool] = None
+_default_pool_lock = threading.Lock()
+
+def get_pool(size: int) -> WarmRendererPool:
+    """Return the process-wide warm renderer pool, creating it on first use."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = WarmRendererPool(size)
+            # Stop the workers when the interpreter exits instead of leaving it to daemon cleanup
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
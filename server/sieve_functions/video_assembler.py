@@ -1,6 +1,11 @@
 import sieve
 import os
 import tempfile
+import traceback
+from typing import List, Optional
+
+from utils.ffmpeg import run_ffmpeg, probe_video
+from utils.timing import warp_time
 
 # Fix for MoviePy compatibility with newer Pillow versions
 try:
@@ -18,9 +23,23 @@ except ImportError:
     # Fallback to MoviePy v1.x imports (with .editor)
     from moviepy.editor import VideoFileClip, clips_array
 
+# Assembly backend: "ffmpeg" builds one scale/pad/vstack filter graph and copies the
+# celebrity audio untouched; "moviepy" composites frames in Python. The MoviePy path
+# is also used as the fallback if ffmpeg fails.
+VIDEO_ASSEMBLER_BACKEND = os.environ.get("VIDEO_ASSEMBLER_BACKEND", "ffmpeg").lower()
+
+# Mobile-friendly vertical dimensions (9:16 aspect ratio)
+CLIP_W = 1080  # Each clip width
+CLIP_H = 1080  # Each clip height (square clips)
+OUTPUT_FPS = 30
 
 def resize_and_pad(clip, target_w, target_h):
     """Resizes a clip to fit target dimensions, maintaining aspect ratio and centering."""
+    if (clip.w, clip.h) == (target_w, target_h):
+        # Preprocessed base videos already come at the final size
+        print(f"  Clip is already {target_w}x{target_h}, no resize needed")
+        return clip
+
     try:
         print(f"  Resizing clip from {clip.w}x{clip.h} to {target_w}x{target_h}")
         
@@ -71,46 +90,126 @@ def resize_and_pad(clip, target_w, target_h):
         raise
 
 
-@sieve.function(
-    name="spew_video_assembler",
-    python_packages=["moviepy", "Pillow"],
-    system_packages=["ffmpeg"]
-)
-def assemble_final_video(celebrity_video: sieve.File, visuals_video: sieve.File) -> sieve.File:
+def _fit_filter(input_label: str, output_label: str, extra: str = "", source_size: Optional[tuple] = None) -> str:
     """
-    Assembles the final video by stacking the visuals video on top of the 
-    celebrity video, creating a mobile-friendly vertical video (1080x2160).
+    Filter chain that scales a stream to fit CLIP_W x CLIP_H and pads it centered on black.
+
+    If source_size is already (CLIP_W, CLIP_H) the scale and pad steps are left out.
+    """
+    fit = "" if source_size == (CLIP_W, CLIP_H) else (
+        f"scale={CLIP_W}:{CLIP_H}:force_original_aspect_ratio=decrease,"
+        f"pad={CLIP_W}:{CLIP_H}:(ow-iw)/2:(oh-ih)/2:color=black,"
+    )
+    return f"[{input_label}]{fit}setsar=1,fps={OUTPUT_FPS}{extra}[{output_label}]"
+
+def _anchors_from_timing(visuals_timing: Optional[dict]) -> List[tuple]:
+    """Validated (estimated, actual) anchors from a visuals_timing dict, or [] if none."""
+    anchors = [(float(e), float(a)) for e, a in (visuals_timing or {}).get("anchors", [])]
+    if len(anchors) < 2:
+        return []
+    for (e0, a0), (e1, a1) in zip(anchors, anchors[1:]):
+        if e1 <= e0 or a1 <= a0:
+            raise ValueError("visuals_timing anchors must be strictly increasing")
+    return anchors
+
+def _retime_filter(input_label: str, output_label: str, anchors: List[tuple], source_duration: float) -> str:
+    """
+    Filter chain that re-times a stream piecewise: each estimated interval between two
+    anchors is cut out with trim and stretched with setpts to its actual length.
+    Anything after the last anchor plays at normal speed.
+    """
+    pieces = []
+    for (e0, a0), (e1, a1) in zip(anchors, anchors[1:]):
+        if e0 >= source_duration:
+            break
+        factor = (a1 - a0) / (e1 - e0)
+        pieces.append(f"trim=start={e0:.3f}:end={min(e1, source_duration):.3f},setpts=(PTS-STARTPTS)*{factor:.6f}")
+    if source_duration > anchors[-1][0] + 0.05:
+        pieces.append(f"trim=start={anchors[-1][0]:.3f},setpts=PTS-STARTPTS")
+
+    labels = [f"{output_label}_{i}" for i in range(len(pieces))]
+    chains = [f"[{input_label}]split={len(pieces)}" + "".join(f"[{label}_in]" for label in labels)]
+    for label, piece in zip(labels, pieces):
+        chains.append(f"[{label}_in]{piece}[{label}]")
+    chains.append("".join(f"[{label}]" for label in labels) + f"concat=n={len(pieces)}:v=1:a=0[{output_label}]")
+    return ";".join(chains)
+
+def assemble_with_ffmpeg(celebrity_path: str, visuals_path: str, output_path: str,
+                         visuals_timing: Optional[dict] = None) -> str:
+    """
+    Stack the visuals above the celebrity video with a single ffmpeg filter graph.
+    
+    The celebrity video's duration is the master duration: a shorter visuals track
+    holds its last frame, a longer one is cut. The celebrity audio is stream-copied.
     
     Args:
-        celebrity_video: Sieve.File object of the celebrity video (with audio)
-        visuals_video: Sieve.File object of the visuals video
+        celebrity_path: Path of the celebrity video (with audio)
+        visuals_path: Path of the visuals video
+        output_path: Path of the 1080x2160 output video
+        visuals_timing: Optional {"anchors": [[estimated, actual], ...]} re-timing the
+                        visuals when they were planned from estimated speech timings
         
     Returns:
-        sieve.File: The assembled final video
+        str: The output path
+    """
+    celebrity_info = probe_video(celebrity_path)
+    master_duration = celebrity_info["duration"]
+    if not master_duration:
+        raise RuntimeError(f"Could not determine duration of {celebrity_path}")
+    print(f"Using master duration: {master_duration}s")
+
+    visuals_input = "1:v"
+    retime_chains = []
+    anchors = _anchors_from_timing(visuals_timing)
+    if anchors:
+        visuals_duration = probe_video(visuals_path)["duration"] or anchors[-1][0]
+        print(f"Re-timing visuals with {len(anchors)} anchors")
+        retime_chains.append(_retime_filter("1:v", "retimed", anchors, visuals_duration))
+        visuals_input = "retimed"
+
+    filter_graph = ";".join(retime_chains + [
+        _fit_filter(visuals_input, "top", extra=f",tpad=stop_mode=clone:stop_duration={master_duration:.3f}"),
+        _fit_filter("0:v", "bottom", source_size=(celebrity_info.get("width"), celebrity_info.get("height"))),
+        "[top][bottom]vstack=inputs=2,format=yuv420p[out]",
+    ])
+
+    print("Running ffmpeg filter graph (scale/pad/vstack)...")
+    run_ffmpeg([
+        "-i", celebrity_path,
+        "-i", visuals_path,
+        "-filter_complex", filter_graph,
+        "-map", "[out]",
+        "-map", "0:a?",
+        "-c:v", "libx264", "-preset", "medium",
+        "-c:a", "copy",
+        "-t", f"{master_duration:.3f}",
+        "-movflags", "+faststart",
+        output_path,
+    ])
+    return output_path
+
+def assemble_with_moviepy(celebrity_path: str, visuals_path: str, output_path: str,
+                          visuals_timing: Optional[dict] = None) -> str:
+    """
+    Stack the visuals above the celebrity video by compositing frames with MoviePy.
+    
+    Args:
+        celebrity_path: Path of the celebrity video (with audio)
+        visuals_path: Path of the visuals video
+        output_path: Path of the 1080x2160 output video
+        visuals_timing: Optional re-timing anchors (see assemble_with_ffmpeg)
+        
+    Returns:
+        str: The output path
     """
-    print(f"Assembling mobile-friendly vertical video from celebrity and visuals videos")
     celeb_clip = None
     visuals_clip = None
     final_clip = None
 
     try:
-        # Create temporary directory for processing (don't auto-cleanup)
-        temp_dir = tempfile.mkdtemp()
-        final_path = os.path.join(temp_dir, 'final_video.mp4')
-
-        # Mobile-friendly vertical dimensions (9:16 aspect ratio)
-        clip_w = 1080  # Each clip width
-        clip_h = 1080  # Each clip height (square clips)
-        target_w = 1080  # Final video width
-        target_h = 2160  # Final video height (2 x 1080)
-
-        # Load clips from Sieve File objects
         print("Loading video clips...")
-        print(f"  Celebrity video path: {celebrity_video.path}")
-        print(f"  Visuals video path: {visuals_video.path}")
-        
-        celeb_clip = VideoFileClip(celebrity_video.path)
-        visuals_clip = VideoFileClip(visuals_video.path)
+        celeb_clip = VideoFileClip(celebrity_path)
+        visuals_clip = VideoFileClip(visuals_path)
         
         print(f"  Celebrity clip: {celeb_clip.w}x{celeb_clip.h}, duration: {celeb_clip.duration}s")
         print(f"  Visuals clip: {visuals_clip.w}x{visuals_clip.h}, duration: {visuals_clip.duration}s")
@@ -120,12 +219,22 @@ def assemble_final_video(celebrity_video: sieve.File, visuals_video: sieve.File)
         master_duration = celeb_clip.duration
         print(f"Using master duration: {master_duration}s")
         
+        visuals_source = visuals_clip
+        anchors = _anchors_from_timing(visuals_timing)
+        if anchors:
+            print(f"Re-timing visuals with {len(anchors)} anchors")
+            last_frame_time = max(visuals_clip.duration - 1.0 / (visuals_clip.fps or OUTPUT_FPS), 0)
+            visuals_source = visuals_clip.fl_time(
+                lambda t: min(max(warp_time(t, anchors, inverse=True), 0), last_frame_time),
+                keep_duration=False
+            )
+        
         # Resize and pad clips to 1080x1080, using master duration
         print("Resizing and padding clips to 1080x1080...")
         print("Processing celebrity clip...")
-        celeb_processed = resize_and_pad(celeb_clip, clip_w, clip_h).set_duration(master_duration)
+        celeb_processed = resize_and_pad(celeb_clip, CLIP_W, CLIP_H).set_duration(master_duration)
         print("Processing visuals clip...")
-        visuals_processed = resize_and_pad(visuals_clip, clip_w, clip_h).set_duration(master_duration)
+        visuals_processed = resize_and_pad(visuals_source, CLIP_W, CLIP_H).set_duration(master_duration)
         print("Clips processed.")
 
         # Stack the clips vertically (visuals on top)
@@ -141,31 +250,15 @@ def assemble_final_video(celebrity_video: sieve.File, visuals_video: sieve.File)
              print("Warning: Celebrity clip has no audio.")
 
         # Write the final video
-        print(f"Writing final video to: {final_path}...")
+        print(f"Writing final video to: {output_path}...")
         final_clip.write_videofile(
-            final_path, 
+            output_path, 
             codec='libx264', 
             audio_codec='aac',
             threads=4, # Use multiple threads for faster encoding
             logger='bar' # Show progress bar
         )
-        print("Final video written successfully.")
-        
-        # Verify the file exists before returning
-        if os.path.exists(final_path):
-            file_size = os.path.getsize(final_path)
-            print(f"Final video file size: {file_size} bytes ({file_size / (1024*1024):.2f} MB)")
-            
-            # Return as Sieve File object
-            return sieve.File(path=final_path)
-        else:
-            raise FileNotFoundError(f"Final video was not created at {final_path}")
-
-    except Exception as e:
-        print(f"Error assembling video: {e}")
-        import traceback
-        print(f"Full traceback: {traceback.format_exc()}")
-        raise # Re-raise the exception to signal failure in the Sieve function
+        return output_path
 
     finally:
         # Clean up resources
@@ -187,3 +280,65 @@ def assemble_final_video(celebrity_video: sieve.File, visuals_video: sieve.File)
             except Exception as e:
                  print(f"Error closing final_clip: {e}")
         print("Cleanup complete.")
+
+def assemble_video_files(celebrity_path: str, visuals_path: str, output_path: str,
+                         backend: str = VIDEO_ASSEMBLER_BACKEND, visuals_timing: Optional[dict] = None) -> str:
+    """
+    Assemble the stacked video with the selected backend, falling back to MoviePy.
+    
+    Returns:
+        str: The output path
+    """
+    if backend == "ffmpeg":
+        try:
+            return assemble_with_ffmpeg(celebrity_path, visuals_path, output_path, visuals_timing)
+        except Exception as e:
+            print(f"ffmpeg assembly failed, falling back to MoviePy: {e}")
+    return assemble_with_moviepy(celebrity_path, visuals_path, output_path, visuals_timing)
+
+
+@sieve.function(
+    name="spew_video_assembler",
+    python_packages=["moviepy", "Pillow"],
+    system_packages=["ffmpeg"]
+)
+def assemble_final_video(celebrity_video: sieve.File, visuals_video: sieve.File, visuals_timing: dict = None) -> sieve.File:
+    """
+    Assembles the final video by stacking the visuals video on top of the 
+    celebrity video, creating a mobile-friendly vertical video (1080x2160).
+    
+    Args:
+        celebrity_video: Sieve.File object of the celebrity video (with audio)
+        visuals_video: Sieve.File object of the visuals video
+        visuals_timing: Optional {"anchors": [[estimated, actual], ...]} used to re-time
+                        visuals that were planned from estimated speech timings
+        
+    Returns:
+        sieve.File: The assembled final video
+    """
+    print(f"Assembling mobile-friendly vertical video from celebrity and visuals videos ({VIDEO_ASSEMBLER_BACKEND} backend)")
+
+    try:
+        # Create temporary directory for processing (don't auto-cleanup)
+        temp_dir = tempfile.mkdtemp()
+        final_path = os.path.join(temp_dir, 'final_video.mp4')
+
+        print(f"  Celebrity video path: {celebrity_video.path}")
+        print(f"  Visuals video path: {visuals_video.path}")
+        assemble_video_files(celebrity_video.path, visuals_video.path, final_path, visuals_timing=visuals_timing)
+        print("Final video written successfully.")
+        
+        # Verify the file exists before returning
+        if os.path.exists(final_path):
+            file_size = os.path.getsize(final_path)
+            print(f"Final video file size: {file_size} bytes ({file_size / (1024*1024):.2f} MB)")
+            
+            # Return as Sieve File object
+            return sieve.File(path=final_path)
+        else:
+            raise FileNotFoundError(f"Final video was not created at {final_path}")
+
+    except Exception as e:
+        print(f"Error assembling video: {e}")
+        print(f"Full traceback: {traceback.format_exc()}")
+        raise # Re-raise the exception to signal failure in the Sieve function
@@ -2,19 +2,26 @@ import sieve
 import os
 import json # Added for json.dumps
 import re # Added for regex operations
-from typing import Dict, List, Literal, Optional # Added Literal and List
+from typing import Callable, Dict, List, Literal, Optional # Added Literal and List
 from pydantic import BaseModel # Added BaseModel
 import dotenv # Added dotenv
 import tempfile
 import shutil
 import requests
+from requests.adapters import HTTPAdapter
 import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 from PIL import Image
 
 # Import the utility functions
 from utils.llm import call_llm, generate_image
+from utils.content_cache import ContentCache, make_key, normalize_text
+from utils.code_corpus import AnimationCodeCorpus, bind_output_path
+from utils.warm_renderer import WarmRendererPool, get_pool as get_warm_renderer_pool, render_env
+from utils.ffmpeg import RawVideoEncoder, run_ffmpeg, probe_video, concat_files, CONCAT_COPY_KEYS
 
 # MoviePy version-agnostic imports
 try:
@@ -29,6 +36,80 @@ except ImportError:
 # import tempfile # Keep for potential future use if temporary files are needed # Removed
 # import shutil # Keep for potential future use if temporary files are needed # Removed
 
+# Concurrency limits for segment rendering.
+# Segments are independent until assembly, so they are rendered by a thread pool
+# (LLM and image calls are I/O bound); the number of concurrent matplotlib render
+# subprocesses is capped separately since those are CPU and memory heavy.
+VISUALS_MAX_WORKERS = int(os.environ.get("VISUALS_MAX_WORKERS", 4))
+VISUALS_MAX_RENDER_PROCESSES = int(os.environ.get("VISUALS_MAX_RENDER_PROCESSES", os.cpu_count() or 2))
+_render_slots = threading.BoundedSemaphore(max(1, VISUALS_MAX_RENDER_PROCESSES))
+
+# Animation scripts run on pre-warmed workers (libraries already imported) unless disabled
+VISUALS_WARM_RENDERER = os.environ.get("VISUALS_WARM_RENDERER", "true").lower() == "true"
+ANIMATION_TIMEOUT_SECONDS = 120  # Timeout per render attempt for complex animations
+
+# Shared HTTP session for image downloads (keeps connections alive across segments)
+IMAGE_DOWNLOAD_POOL_SIZE = int(os.environ.get("IMAGE_DOWNLOAD_POOL_SIZE", 16))
+IMAGE_DOWNLOAD_TIMEOUT_SECONDS = 60
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+def _get_http_session() -> requests.Session:
+    """Return the process-wide pooled HTTP session, creating it on first use."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=IMAGE_DOWNLOAD_POOL_SIZE,
+                pool_maxsize=IMAGE_DOWNLOAD_POOL_SIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+# Render settings shared by every segment; part of the render cache key so that
+# changing any of them invalidates previously rendered segments.
+RENDER_SETTINGS = {"width": 1080, "height": 1080, "fps": 30, "style": "dark_background", "codec": "h264", "version": 2}
+
+# Common codec profile for segment files, so segments can be joined without re-encoding
+SEGMENT_CODEC_ARGS = [
+    "-c:v", "libx264", "-preset", "medium", "-b:v", "5000k", "-pix_fmt", "yuv420p",
+    "-r", str(RENDER_SETTINGS["fps"]), "-video_track_timescale", "15360",
+]
+SEGMENT_PROFILE = {
+    "codec_name": "h264",
+    "width": RENDER_SETTINGS["width"],
+    "height": RENDER_SETTINGS["height"],
+    "pix_fmt": "yuv420p",
+    "r_frame_rate": f"{RENDER_SETTINGS['fps']}/1",
+    "time_base": "1/15360",
+}
+
+# Persistent render cache for visual segments
+VISUALS_CACHE_ENABLED = os.environ.get("VISUALS_CACHE_ENABLED", "true").lower() == "true"
+VISUALS_CACHE_DIR = os.environ.get("VISUALS_CACHE_DIR", os.path.expanduser("~/.cache/spew/segments"))
+VISUALS_CACHE_MAX_BYTES = int(os.environ.get("VISUALS_CACHE_MAX_MB", 2048)) * 1024 * 1024
+segment_cache = ContentCache(VISUALS_CACHE_DIR, VISUALS_CACHE_MAX_BYTES)
+
+# Corpus of animation code proven to render, reused for repeated or similar descriptions
+VISUALS_CODE_CORPUS_ENABLED = os.environ.get("VISUALS_CODE_CORPUS_ENABLED", "true").lower() == "true"
+VISUALS_CODE_CORPUS_PATH = os.environ.get("VISUALS_CODE_CORPUS_PATH", os.path.expanduser("~/.cache/spew/animation_code.db"))
+VISUALS_CODE_SIMILARITY_THRESHOLD = float(os.environ.get("VISUALS_CODE_SIMILARITY_THRESHOLD", 0.5))
+code_corpus = AnimationCodeCorpus(VISUALS_CODE_CORPUS_PATH)
+
+# How the visuals track is assembled:
+#   "stream"  - segments are written in plan order as soon as they are ready into one
+#               ffmpeg encoder for the whole track; image and placeholder frames (and
+#               cached image stills) go in directly, animations and cached animation
+#               mp4s are decoded and re-encoded
+#   "concat"  - normalize each segment to SEGMENT_PROFILE when it is produced, then join
+#               them with ffmpeg's concat demuxer and "-c copy" (requires ffmpeg; the
+#               other modes fall back to OpenCV's writer for image and placeholder segments)
+#   "moviepy" - load every segment with MoviePy and re-encode the concatenation
+VISUALS_ASSEMBLY_MODE = os.environ.get("VISUALS_ASSEMBLY_MODE", "stream").lower()
+
 # Define Pydantic models for structured output
 class VisualSegment(BaseModel):
     type: Literal["animation", "image"]
@@ -296,6 +377,127 @@ def _create_visual_plan(transcription: dict) -> VisualPlan:
         # For now, let's raise to make the error visible during testing
         raise
 
+def _fetch_image_variation(description: str, variation: int) -> np.ndarray:
+    """
+    Generate one style variation of an image and return it as a 1080x1080 BGR array.
+    
+    Args:
+        description: Description of the image to generate
+        variation: 1-based index of the style variation
+    
+    Returns:
+        np.ndarray: The decoded image in BGR order, ready for OpenCV
+    """
+    print(f"    Generating image variation {variation}...")
+    
+    # Add slight variation to prompt for diversity
+    varied_prompt = f"{description} (style variation {variation})"
+    image_url = generate_image(varied_prompt)
+    
+    # Stream the image into memory over the shared session
+    buffer = io.BytesIO()
+    with _get_http_session().get(image_url, stream=True, timeout=IMAGE_DOWNLOAD_TIMEOUT_SECONDS) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if chunk:
+                buffer.write(chunk)
+    buffer.seek(0)
+    
+    # Convert to PIL Image
+    img = Image.open(buffer)
+    
+    # Ensure consistent mobile-friendly size (1080x1080)
+    img = img.resize((1080, 1080), Image.Resampling.LANCZOS)
+    
+    # Convert to numpy array and then to BGR for OpenCV
+    img_array = np.array(img)
+    if len(img_array.shape) == 3 and img_array.shape[2] == 3:
+        # RGB to BGR
+        return cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+    elif len(img_array.shape) == 3 and img_array.shape[2] == 4:
+        # RGBA to BGR
+        return cv2.cvtColor(img_array, cv2.COLOR_RGBA2BGR)
+    else:
+        # Grayscale to BGR
+        return cv2.cvtColor(img_array, cv2.COLOR_GRAY2BGR)
+
+def _generate_image_stills(description: str, duration: float, segment_id: str, fps: int = 30) -> list:
+    """
+    Generate the still images of an image segment and how long each is shown.
+    
+    All style variations are generated, downloaded and decoded concurrently.
+    
+    Args:
+        description: Description of the image to generate
+        duration: Duration of the video segment in seconds
+        segment_id: Unique identifier for this segment
+        fps: Frame rate the frame counts are computed for
+    
+    Returns:
+        list: (BGR frame, frame count) pairs in display order
+    """
+    # Generate 3 variations of the image for visual interest
+    num_images = 3
+    
+    print(f"    Requesting {num_images} image variations concurrently...")
+    with ThreadPoolExecutor(max_workers=num_images, thread_name_prefix=f"{segment_id}-image") as executor:
+        image_arrays = list(executor.map(
+            lambda i: _fetch_image_variation(description, i + 1),
+            range(num_images)
+        ))
+    
+    total_frames = int(fps * duration)
+    frames_per_image = total_frames // num_images
+    remainder_frames = total_frames % num_images
+    
+    # Add remainder to last image
+    return [
+        (img_bgr, frames_per_image + (remainder_frames if i == num_images - 1 else 0))
+        for i, img_bgr in enumerate(image_arrays)
+    ]
+
+def _encode_stills(stills: list, video_path: str, fps: int = 30, opencv_fallback: Optional[bool] = None) -> str:
+    """
+    Encode (frame, frame count) pairs to a video in the common segment profile.
+    
+    Args:
+        stills: (BGR frame, frame count) pairs in display order
+        video_path: Output path
+        fps: Output frame rate
+        opencv_fallback: Write with OpenCV's own writer if the ffmpeg encoder fails.
+                         Defaults to every assembly mode except "concat", which needs
+                         SEGMENT_PROFILE files and therefore ffmpeg anyway.
+    
+    Returns:
+        str: video_path
+    """
+    if opencv_fallback is None:
+        opencv_fallback = VISUALS_ASSEMBLY_MODE != "concat"
+    
+    print(f"    Writing {sum(count for _, count in stills)} frames from {len(stills)} images...")
+    encoder = None
+    try:
+        encoder = RawVideoEncoder(video_path, 1080, 1080, fps, codec_args=SEGMENT_CODEC_ARGS)
+        for frame, count in stills:
+            for _ in range(count):
+                encoder.write_frame(frame)
+        encoder.close()
+        return video_path
+    except Exception as e:
+        if encoder is not None:
+            encoder.abort()
+        if not opencv_fallback:
+            raise
+        print(f"    ⚠️ Encoder unavailable ({e}), using OpenCV writer")
+    
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    video_writer = cv2.VideoWriter(video_path, fourcc, fps, (1080, 1080))
+    for frame, count in stills:
+        for _ in range(count):
+            video_writer.write(frame)
+    video_writer.release()
+    return video_path
+
 def create_static_image(description: str, duration: float, segment_id: str, output_dir: str) -> str:
     """
     Create a video from generated static images.
@@ -316,63 +518,8 @@ def create_static_image(description: str, duration: float, segment_id: str, outp
     video_path = os.path.join(output_dir, f"{segment_id}.mp4")
     
     try:
-        # Generate 3 variations of the image for visual interest
-        num_images = 3
-        image_arrays = []
-        
-        for i in range(num_images):
-            print(f"    Generating image {i+1}/{num_images}...")
-            
-            # Add slight variation to prompt for diversity
-            varied_prompt = f"{description} (style variation {i+1})"
-            image_url = generate_image(varied_prompt)
-            
-            # Download and process the image
-            response = requests.get(image_url)
-            response.raise_for_status()
-            
-            # Convert to PIL Image
-            img = Image.open(io.BytesIO(response.content))
-            
-            # Ensure consistent mobile-friendly size (1080x1080)
-            img = img.resize((1080, 1080), Image.Resampling.LANCZOS)
-            
-            # Convert to numpy array and then to BGR for OpenCV
-            img_array = np.array(img)
-            if len(img_array.shape) == 3 and img_array.shape[2] == 3:
-                # RGB to BGR
-                img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-            elif len(img_array.shape) == 3 and img_array.shape[2] == 4:
-                # RGBA to BGR
-                img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGBA2BGR)
-            else:
-                # Grayscale to BGR
-                img_bgr = cv2.cvtColor(img_array, cv2.COLOR_GRAY2BGR)
-            
-            image_arrays.append(img_bgr)
-        
-        # Create video from images
-        fps = 30
-        total_frames = int(fps * duration)
-        frames_per_image = total_frames // num_images
-        remainder_frames = total_frames % num_images
-        
-        # Initialize video writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        video_writer = cv2.VideoWriter(video_path, fourcc, fps, (1080, 1080))
-        
-        print(f"    Writing {total_frames} frames ({frames_per_image} per image)...")
-        
-        # Write frames for each image
-        for i, img_bgr in enumerate(image_arrays):
-            current_frames = frames_per_image
-            if i == num_images - 1:  # Add remainder to last image
-                current_frames += remainder_frames
-            
-            for _ in range(current_frames):
-                video_writer.write(img_bgr)
-        
-        video_writer.release()
+        stills = _generate_image_stills(description, duration, segment_id)
+        _encode_stills(stills, video_path)
         
         print(f"  ✅ Created static image video: {video_path}")
         return video_path
@@ -381,6 +528,45 @@ def create_static_image(description: str, duration: float, segment_id: str, outp
         print(f"  ❌ Error creating static image video: {e}")
         return None
 
+def _create_static_image_stills(description: str, duration: float, segment_id: str) -> Optional[list]:
+    """Stream-mode counterpart of create_static_image: the stills, without encoding a segment file."""
+    print(f"  🖼️ Creating static images for: {description[:50]}...")
+    try:
+        stills = _generate_image_stills(description, duration, segment_id)
+        print(f"  ✅ Created {len(stills)} static images for {segment_id}")
+        return stills
+    except Exception as e:
+        print(f"  ❌ Error creating static images: {e}")
+        return None
+
+def _image_segment_source(description: str, duration: float, segment_id: str, output_dir: str) -> Optional[dict]:
+    """
+    Produce an image segment as {"path", "stills"}, or None if it failed.
+    
+    In stream assembly the stills are written straight into the track encoder, so
+    no segment file is encoded here; other modes get a segment file.
+    """
+    if VISUALS_ASSEMBLY_MODE == "stream":
+        stills = _create_static_image_stills(description, duration, segment_id)
+        return {'path': None, 'stills': stills} if stills else None
+    
+    video_path = create_static_image(description, duration, segment_id, output_dir)
+    print(f"  📤 create_static_image returned: {video_path}")
+    if video_path and os.path.exists(video_path):
+        return {'path': video_path, 'stills': None}
+    return None
+
+def _segment_file(segment_data: dict, output_dir: str) -> str:
+    """Path of a segment's video file, encoding it from its stills first if it only has stills."""
+    if not segment_data.get('path'):
+        video_path = os.path.join(output_dir, f"{segment_data['segment_id']}_{segment_data['type']}.mp4")
+        segment_data['path'] = _encode_stills(segment_data['stills'], video_path)
+    return segment_data['path']
+
+def _placeholder_stills(duration: float = 3.0, color: tuple = (0, 0, 255)) -> list:
+    """A single colored frame held for the duration, as (frame, frame count) pairs."""
+    return [(np.full((1080, 1080, 3), color, dtype=np.uint8), int(30 * duration))]
+
 def _create_placeholder_video(temp_dir: str, filename: str, duration: float = 3.0, color: tuple = (0, 0, 255)) -> str:
     """
     Create a simple colored video for placeholders or errors.
@@ -394,20 +580,52 @@ def _create_placeholder_video(temp_dir: str, filename: str, duration: float = 3.
     Returns:
         str: Path to the created video
     """
-    video_path = os.path.join(temp_dir, filename)
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    video_writer = cv2.VideoWriter(video_path, fourcc, 30, (1080, 1080))
+    # Placeholders are the last resort, so OpenCV's own writer is always allowed as a fallback
+    return _encode_stills(_placeholder_stills(duration, color), os.path.join(temp_dir, filename), opencv_fallback=True)
+
+def _find_corpus_code(description: str, duration: float, llm_provider: str, llm_model: str) -> Optional[str]:
+    """
+    Look up previously validated animation code for this description.
+    
+    An exact match (same normalized description and duration) is returned as-is.
+    A similar description is adapted with a single fix-up call, seeded with the
+    stored code instead of generating from scratch.
+    
+    Returns:
+        Code to execute, or None if the corpus has nothing usable
+    """
+    if not VISUALS_CODE_CORPUS_ENABLED:
+        return None
     
-    frame = np.full((1080, 1080, 3), color, dtype=np.uint8)
-    total_frames = int(30 * duration)
+    try:
+        exact = code_corpus.find_exact(description, duration)
+        if exact:
+            print(f"  ♻️ Reusing validated animation code from corpus (entry {exact['id']})")
+            return exact["code"]
+        
+        similar = code_corpus.find_similar(description, VISUALS_CODE_SIMILARITY_THRESHOLD)
+    except Exception as e:
+        print(f"  ⚠️ Animation code corpus lookup failed: {e}")
+        return None
     
-    for _ in range(total_frames):
-        video_writer.write(frame)
+    if not similar:
+        return None
     
-    video_writer.release()
-    return video_path
+    print(f"  🌱 Seeding from similar corpus entry {similar['id']} (similarity {similar['similarity']:.2f}): {similar['description'][:50]}...")
+    return _fix_animation_code(
+        original_code=similar["code"],
+        error_message=(
+            f"This code runs correctly, but it was written for a different animation: "
+            f"'{similar['description']}' lasting {similar['duration']} seconds. "
+            f"Adapt it to the animation goal and target duration below, reusing as much of the working code as possible."
+        ),
+        original_description=description,
+        duration=duration,
+        llm_provider=llm_provider,
+        llm_model=llm_model
+    )
 
-def _create_matplotlib_animation(description: str, duration: float, segment_id: str, output_dir: str) -> Optional[str]:
+def _create_matplotlib_animation(description: str, duration: float, segment_id: str, output_dir: str) -> Optional[dict]:
     """
     Create a matplotlib animation using LLM-generated code with error correction and retry logic.
     
@@ -418,7 +636,7 @@ def _create_matplotlib_animation(description: str, duration: float, segment_id:
         output_dir: Directory to save the animation file
         
     Returns:
-        Path to the created animation MP4 file or None if creation fails
+        dict: {"video_path": str, "code": str} for the rendered animation, or None if creation fails
     """
     print(f"  🎬 Creating animation: {description[:50]}...")
     
@@ -431,21 +649,24 @@ def _create_matplotlib_animation(description: str, duration: float, segment_id:
     os.makedirs(output_dir, exist_ok=True)
     
     try:
-        # Step 1: Generate initial animation code
-        print(f"  📝 Generating animation code...")
-        animation_code = _generate_animation_code(
-            description=description,
-            duration=duration,
-            llm_provider=llm_provider,
-            llm_model=llm_model
-        )
+        # Step 1: Reuse proven code when possible, otherwise generate it
+        animation_code = _find_corpus_code(description, duration, llm_provider, llm_model)
+        
+        if not animation_code:
+            print(f"  📝 Generating animation code...")
+            animation_code = _generate_animation_code(
+                description=description,
+                duration=duration,
+                llm_provider=llm_provider,
+                llm_model=llm_model
+            )
         
         if not animation_code:
             print("  ❌ Failed to generate initial animation code")
             return None
         
         # Step 2: Execute with retry and fix loop
-        return _execute_with_retry(
+        result = _execute_with_retry(
             animation_code=animation_code,
             description=description,
             duration=duration,
@@ -456,12 +677,21 @@ def _create_matplotlib_animation(description: str, duration: float, segment_id:
             llm_model=llm_model
         )
         
+        # Step 3: Remember code that rendered so later segments can skip the LLM
+        if result and VISUALS_CODE_CORPUS_ENABLED:
+            try:
+                code_corpus.add(description, duration, result["code"])
+            except Exception as e:
+                print(f"  ⚠️ Failed to record animation code in corpus: {e}")
+        
+        return result
+        
     except Exception as e:
         print(f"  ❌ Unexpected error in animation creation: {e}")
         return None
 
 def _execute_with_retry(animation_code: str, description: str, duration: float, segment_id: str, 
-                       output_dir: str, max_attempts: int, llm_provider: str, llm_model: str) -> Optional[str]:
+                       output_dir: str, max_attempts: int, llm_provider: str, llm_model: str) -> Optional[dict]:
     """
     Execute animation code with retry and fix logic.
     
@@ -476,7 +706,8 @@ def _execute_with_retry(animation_code: str, description: str, duration: float,
         llm_model: LLM model for code fixing
         
     Returns:
-        Path to successful animation or None if all attempts fail
+        dict: {"video_path": str, "code": str} with the code that rendered successfully,
+              or None if all attempts fail
     """
     current_code = animation_code
     
@@ -495,7 +726,7 @@ def _execute_with_retry(animation_code: str, description: str, duration: float,
         if result["success"]:
             video_path = result["video_path"]
             print(f"  ✅ Animation created successfully: {video_path}")
-            return video_path
+            return {"video_path": video_path, "code": current_code}
         
         # Execution failed - log the error
         error_message = result["error_message"]
@@ -526,6 +757,41 @@ def _execute_with_retry(animation_code: str, description: str, duration: float,
     
     return None
 
+def _run_render_script(script_path: str) -> "subprocess.CompletedProcess":
+    """
+    Run an animation script, preferring a pre-warmed renderer worker.
+    
+    Falls back to a fresh `python` subprocess when warm workers are disabled or
+    unavailable. Both paths enforce ANIMATION_TIMEOUT_SECONDS, run each script
+    in its own process and cap numpy/scipy threads (see RENDER_THREAD_ENV).
+    
+    Raises:
+        subprocess.TimeoutExpired: If the script exceeds the timeout
+    """
+    import subprocess
+    
+    if VISUALS_WARM_RENDERER and WarmRendererPool.is_supported():
+        try:
+            warm_result = get_warm_renderer_pool(VISUALS_MAX_RENDER_PROCESSES).run(script_path, ANIMATION_TIMEOUT_SECONDS)
+            if warm_result["timed_out"]:
+                raise subprocess.TimeoutExpired(["python", script_path], ANIMATION_TIMEOUT_SECONDS)
+            return subprocess.CompletedProcess(
+                ["python", script_path],
+                warm_result["returncode"],
+                warm_result["stdout"],
+                warm_result["stderr"]
+            )
+        except RuntimeError as e:
+            print(f"  ⚠️ Warm renderer unavailable ({e}), falling back to a fresh interpreter")
+    
+    return subprocess.run(
+        ["python", script_path],
+        capture_output=True,
+        text=True,
+        timeout=ANIMATION_TIMEOUT_SECONDS,
+        env=render_env()
+    )
+
 def _execute_animation_code(animation_code: str, segment_id: str, output_dir: str, duration: float) -> dict:
     """
     Execute matplotlib animation code and return the result.
@@ -548,17 +814,8 @@ def _execute_animation_code(animation_code: str, segment_id: str, output_dir: st
     output_path = os.path.join(output_dir, f"{segment_id}.mp4")
     
     try:
-        # Modify the code to ensure it saves to the correct path
-        # Replace any existing 'animation.mp4' with our target path
-        modified_code = re.sub(
-            r"anim\.save\(['\"]animation\.mp4['\"]",
-            f"anim.save('{output_path}'",
-            animation_code
-        )
-        
-        # If no anim.save found, append one
-        if "anim.save(" not in modified_code:
-            modified_code += f"\nanim.save('{output_path}', writer='pillow', fps=30)\n"
+        # Make the code save to our target path instead of 'animation.mp4'
+        modified_code = bind_output_path(animation_code, output_path)
         
         # Create a temporary script file
         with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as script_file:
@@ -567,13 +824,9 @@ def _execute_animation_code(animation_code: str, segment_id: str, output_dir: st
         
         print(f"  📜 Executing script: {script_path}")
         
-        # Execute the script
-        result = subprocess.run(
-            ["python", script_path],
-            capture_output=True,
-            text=True,
-            timeout=120  # Increase timeout to 2 minutes for complex animations
-        )
+        # Execute the script (bounded by the render process limit)
+        with _render_slots:
+            result = _run_render_script(script_path)
         
         # Clean up the temporary script
         try:
@@ -618,7 +871,7 @@ def _execute_animation_code(animation_code: str, segment_id: str, output_dir: st
             }
             
     except subprocess.TimeoutExpired:
-        error_msg = f"Script execution timed out after 120 seconds"
+        error_msg = f"Script execution timed out after {ANIMATION_TIMEOUT_SECONDS} seconds"
         print(f"  ⏱️ {error_msg}")
         return {
             "success": False,
@@ -635,117 +888,502 @@ def _execute_animation_code(animation_code: str, segment_id: str, output_dir: st
             "error_message": error_msg
         }
 
-def _create_visual_segments(visual_plan: VisualPlan, temp_dir: str) -> list:
+def _segment_cache_key(segment_type: str, description: str, duration: float) -> str:
+    """Render cache key for a segment: type, normalized description, duration and render settings."""
+    return make_key("visual_segment", segment_type, normalize_text(description), round(duration, 1), RENDER_SETTINGS)
+
+def _write_stills_file(stills: list, path: str) -> str:
+    """Save the frames of (frame, frame count) pairs as one vertical PNG strip (fast, lossless)."""
+    if not cv2.imwrite(path, np.vstack([frame for frame, _ in stills]), [cv2.IMWRITE_PNG_COMPRESSION, 1]):
+        raise RuntimeError(f"Could not write {path}")
+    return path
+
+def _read_stills_file(path: str, frame_counts: list) -> list:
+    """Inverse of _write_stills_file: (frame, frame count) pairs from a PNG strip."""
+    strip = cv2.imread(path)
+    if strip is None:
+        raise RuntimeError(f"Could not read {path}")
+    return list(zip(np.split(strip, len(frame_counts)), frame_counts))
+
+def _load_cached_segment(cache_key: str, segment_id: str, output_dir: str) -> Optional[dict]:
     """
-    Create visual segments based on the visual plan.
+    Load a cached segment.
+    
+    Returns:
+        dict: {"path", "stills", "metadata"} or None on a miss. Image segments cached
+              by stream assembly come back as stills (path None), everything else as
+              an mp4 copied into output_dir (stills None).
+    """
+    if not VISUALS_CACHE_ENABLED:
+        return None
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        cached_path = os.path.join(output_dir, f"{segment_id}_cached")
+        cached = segment_cache.get(cache_key, dest_path=cached_path)
+        if not cached:
+            return None
+        frame_counts = cached["metadata"].get("frame_counts")
+        if frame_counts:
+            stills = _read_stills_file(cached_path, frame_counts)
+            os.remove(cached_path)
+            return {"path": None, "stills": stills, "metadata": cached["metadata"]}
+        os.replace(cached_path, f"{cached_path}.mp4")
+        return {"path": f"{cached_path}.mp4", "stills": None, "metadata": cached["metadata"]}
+    except Exception as e:
+        print(f"  ⚠️ Render cache lookup failed for {segment_id}: {e}")
+        return None
+
+def _store_cached_segment(cache_key: str, file_path: str, segment_type: str, description: str,
+                          duration: float, code: Optional[str], frame_counts: Optional[list] = None):
+    """
+    Store a rendered segment and the code that produced it in the render cache.
+    
+    file_path is an mp4, or a stills strip from _write_stills_file when frame_counts is given.
+    """
+    if not VISUALS_CACHE_ENABLED:
+        return
+    try:
+        segment_cache.put(cache_key, file_path, {
+            "type": segment_type,
+            "description": description,
+            "duration": duration,
+            "code": code,
+            "frame_counts": frame_counts,
+            "render_settings": RENDER_SETTINGS
+        })
+    except Exception as e:
+        print(f"  ⚠️ Failed to store segment in render cache: {e}")
+
+def _matches_segment_profile(video_info: dict) -> bool:
+    """Whether probed stream parameters already match SEGMENT_PROFILE."""
+    return all(video_info.get(key) == value for key, value in SEGMENT_PROFILE.items())
+
+def _normalize_segment(video_path: str) -> str:
+    """
+    Re-encode a segment to SEGMENT_PROFILE unless it already matches.
     
     Args:
-        visual_plan: The plan containing segment descriptions and timings
+        video_path: Segment file to normalize
+    
+    Returns:
+        str: Path of the normalized file (the input path if no work was needed or
+             normalizing failed)
+    """
+    try:
+        if _matches_segment_profile(probe_video(video_path)):
+            return video_path
+    except RuntimeError as e:
+        print(f"  ⚠️ Could not probe {os.path.basename(video_path)}, normalizing anyway: {e}")
+    
+    width, height, fps = RENDER_SETTINGS["width"], RENDER_SETTINGS["height"], RENDER_SETTINGS["fps"]
+    normalized_path = f"{os.path.splitext(video_path)[0]}_norm.mp4"
+    try:
+        run_ffmpeg([
+            "-i", video_path, "-an",
+            "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                   f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps}",
+            *SEGMENT_CODEC_ARGS,
+            normalized_path,
+        ])
+    except Exception as e:
+        # Keep the segment; the concat step re-encodes the join when parameters differ
+        print(f"  ⚠️ Could not normalize {os.path.basename(video_path)}, keeping it as is: {e}")
+        return video_path
+    print(f"  🎛️ Normalized {os.path.basename(video_path)} to the common segment profile")
+    return normalized_path
+
+def _create_visual_segment(index: int, segment: VisualSegment, total: int, temp_dir: str) -> Optional[dict]:
+    """
+    Create a single visual segment, falling back from animation to image to placeholder.
+    
+    Args:
+        index: Position of the segment in the visual plan
+        segment: The planned segment to render
+        total: Total number of segments in the plan (for logging)
         temp_dir: Temporary directory for output files
     
     Returns:
-        list: Dictionaries with segment data including paths, timings, and metadata
+        dict: Segment data including path, timings, and metadata, or None if the segment failed
     """
-    print("\n🎬 Creating visual segments...")
-    print(f"  📊 Total segments to process: {len(visual_plan.segments)}")
-    segment_data_list = []
+    segment_id = f"segment_{index:03d}"
+    duration = segment.end_time - segment.start_time
     
-    for i, segment in enumerate(visual_plan.segments):
-        segment_id = f"segment_{i:03d}"
-        duration = segment.end_time - segment.start_time
+    print(f"\n  📍 Processing segment {index+1}/{total}")
+    print(f"  Creating {segment.type} {index+1}/{total}: {segment.description[:50]}...")
+    
+    try:
+        # A cache hit skips both code generation and rendering
+        cache_key = _segment_cache_key(segment.type, segment.description, duration)
+        cached_segment = _load_cached_segment(cache_key, segment_id, temp_dir)
+        if cached_segment:
+            print(f"  ♻️ Render cache hit for {segment_id} ({cached_segment['metadata'].get('type', segment.type)})")
+            cached_data = {
+                'path': cached_segment['path'],
+                'stills': cached_segment['stills'],
+                'start_time': segment.start_time,
+                'end_time': segment.end_time,
+                'duration': duration,
+                'type': cached_segment['metadata'].get('type', segment.type),
+                'segment_id': segment_id,
+                'cached': True
+            }
+            if VISUALS_ASSEMBLY_MODE != "stream":
+                _segment_file(cached_data, temp_dir)
+            if VISUALS_ASSEMBLY_MODE == "concat":
+                cached_data['path'] = _normalize_segment(cached_data['path'])
+            return cached_data
         
-        print(f"\n  📍 Processing segment {i+1}/{len(visual_plan.segments)}")
-        print(f"  Creating {segment.type} {i+1}/{len(visual_plan.segments)}: {segment.description[:50]}...")
+        segment_data = None
+        animation_code = None
         
-        try:
-            if segment.type == "image":
-                print(f"  🖼️ Calling create_static_image for {segment_id}...")
-                video_path = create_static_image(
-                    description=segment.description,
-                    duration=duration,
-                    segment_id=segment_id,
-                    output_dir=temp_dir
-                )
-                
-                print(f"  📤 create_static_image returned: {video_path}")
+        if segment.type == "image":
+            print(f"  🖼️ Creating static image segment {segment_id}...")
+            image_source = _image_segment_source(segment.description, duration, segment_id, temp_dir)
+            
+            if image_source:
+                segment_data = {
+                    **image_source,
+                    'start_time': segment.start_time,
+                    'end_time': segment.end_time,
+                    'duration': duration,
+                    'type': 'image',
+                    'segment_id': segment_id
+                }
+                print(f"  ✅ Successfully created image segment: {segment_id}")
+            else:
+                print(f"  ❌ Failed to create image segment: {segment_id}")
+        
+        else:  # animation
+            print(f"  🎬 Calling _create_matplotlib_animation for {segment_id}...")
+            animation_result = _create_matplotlib_animation(
+                description=segment.description,
+                duration=duration,
+                segment_id=segment_id,
+                output_dir=temp_dir
+            )
+            video_path = animation_result["video_path"] if animation_result else None
+            animation_code = animation_result["code"] if animation_result else None
+            
+            print(f"  📤 _create_matplotlib_animation returned: {video_path}")
+            
+            if video_path and os.path.exists(video_path):
+                segment_data = {
+                    'path': video_path,
+                    'start_time': segment.start_time,
+                    'end_time': segment.end_time,
+                    'duration': duration,
+                    'type': 'animation',
+                    'segment_id': segment_id
+                }
+                print(f"  ✅ Successfully created animation segment: {segment_id}")
+            else:
+                print(f"  ❌ Failed to create animation segment: {segment_id}. Falling back to static image generation.")
+                # Fallback to static image generation instead of placeholder
+                fallback_source = _image_segment_source(segment.description, duration, f"{segment_id}_fallback", temp_dir)
                 
-                if video_path and os.path.exists(video_path):
-                    segment_data_list.append({
-                        'path': video_path,
+                if fallback_source:
+                    segment_data = {
+                        **fallback_source,
                         'start_time': segment.start_time,
                         'end_time': segment.end_time,
                         'duration': duration,
                         'type': 'image',
                         'segment_id': segment_id
-                    })
-                    print(f"  ✅ Successfully created image segment: {segment_id}")
+                    }
+                    print(f"  ✅ Successfully created fallback image segment: {segment_id}")
                 else:
-                    print(f"  ❌ Failed to create image segment: {segment_id}")
-            
-            else:  # animation
-                print(f"  🎬 Calling _create_matplotlib_animation for {segment_id}...")
-                video_path = _create_matplotlib_animation(
-                    description=segment.description,
-                    duration=duration,
-                    segment_id=segment_id,
-                    output_dir=temp_dir
-                )
-                
-                print(f"  📤 _create_matplotlib_animation returned: {video_path}")
-                
-                if video_path and os.path.exists(video_path):
-                    segment_data_list.append({
-                        'path': video_path,
+                    print(f"  ❌ Fallback image generation also failed for {segment_id}. Creating placeholder.")
+                    # Only create placeholder if both animation and image generation fail
+                    # Orange for total fail; in stream mode the frame goes straight into the track encoder
+                    placeholder_stills = _placeholder_stills(duration, (255, 165, 0))
+                    if VISUALS_ASSEMBLY_MODE == "stream":
+                        placeholder_path = None
+                    else:
+                        placeholder_path = _create_placeholder_video(temp_dir, f"{segment_id}_total_fail.mp4", duration, (255, 165, 0))
+                        placeholder_stills = None
+                    segment_data = {
+                        'path': placeholder_path,
+                        'stills': placeholder_stills,
                         'start_time': segment.start_time,
                         'end_time': segment.end_time,
                         'duration': duration,
-                        'type': 'animation',
+                        'type': 'placeholder',
                         'segment_id': segment_id
-                    })
-                    print(f"  ✅ Successfully created animation segment: {segment_id}")
-                else:
-                    print(f"  ❌ Failed to create animation segment: {segment_id}. Falling back to static image generation.")
-                    # Fallback to static image generation instead of placeholder
-                    fallback_video_path = create_static_image(
-                        description=segment.description,
-                        duration=duration,
-                        segment_id=f"{segment_id}_fallback",
-                        output_dir=temp_dir
-                    )
-                    
-                    if fallback_video_path and os.path.exists(fallback_video_path):
-                        segment_data_list.append({
-                            'path': fallback_video_path,
-                            'start_time': segment.start_time,
-                            'end_time': segment.end_time,
-                            'duration': duration,
-                            'type': 'image',
-                            'segment_id': segment_id
-                        })
-                        print(f"  ✅ Successfully created fallback image segment: {segment_id}")
-                    else:
-                        print(f"  ❌ Fallback image generation also failed for {segment_id}. Creating placeholder.")
-                        # Only create placeholder if both animation and image generation fail
-                        placeholder_path = _create_placeholder_video(temp_dir, f"{segment_id}_total_fail.mp4", duration, (255, 165, 0))  # Orange for total fail
-                        segment_data_list.append({
-                            'path': placeholder_path,
-                            'start_time': segment.start_time,
-                            'end_time': segment.end_time,
-                            'duration': duration,
-                            'type': 'placeholder',
-                            'segment_id': segment_id
-                        })
-                
-            print(f"  ✅ Completed processing segment {i+1}/{len(visual_plan.segments)}")
-                
-        except Exception as e:
-            print(f"  ❌ Error creating segment {segment_id}: {e}")
-            print(f"  �� Continuing to next segment...")
-            continue
+                    }
+        
+        # Normalize as soon as the segment exists so assembly can stream-copy
+        if segment_data and VISUALS_ASSEMBLY_MODE == "concat":
+            segment_data['path'] = _normalize_segment(segment_data['path'])
+        
+        # Cache whatever was produced (placeholders are never cached) under the key of the type
+        # actually produced, so a failed animation's fallback image never answers later
+        # animation requests. Stream-mode image segments have no mp4; their stills are cached
+        # as a PNG strip, which costs far less than a video encode on the critical path
+        if VISUALS_CACHE_ENABLED and segment_data and segment_data['type'] != 'placeholder':
+            if segment_data['type'] != segment.type:
+                cache_key = _segment_cache_key(segment_data['type'], segment.description, duration)
+            code = animation_code if segment_data['type'] == 'animation' else None
+            if segment_data.get('path'):
+                _store_cached_segment(cache_key, segment_data['path'], segment_data['type'], segment.description, duration, code)
+            elif segment_data.get('stills'):
+                try:
+                    stills_path = _write_stills_file(segment_data['stills'], os.path.join(temp_dir, f"{segment_id}_stills.png"))
+                    _store_cached_segment(cache_key, stills_path, segment_data['type'], segment.description, duration, code,
+                                          frame_counts=[count for _, count in segment_data['stills']])
+                except Exception as e:
+                    print(f"  ⚠️ Could not store stills of {segment_id} in the render cache: {e}")
+            
+        print(f"  ✅ Completed processing segment {index+1}/{total}")
+        return segment_data
+            
+    except Exception as e:
+        print(f"  ❌ Error creating segment {segment_id}: {e}")
+        print(f"  ⏭️ Continuing with remaining segments...")
+        return None
+
+def _create_visual_segments(visual_plan: VisualPlan, temp_dir: str, max_workers: Optional[int] = None,
+                            on_segment_ready: Optional[Callable[[dict], None]] = None) -> list:
+    """
+    Create visual segments based on the visual plan.
+    
+    Segments are rendered concurrently on a bounded worker pool; the returned
+    list keeps the order of the visual plan.
+    
+    Args:
+        visual_plan: The plan containing segment descriptions and timings
+        temp_dir: Temporary directory for output files
+        max_workers: Maximum number of segments rendered at once (defaults to VISUALS_MAX_WORKERS)
+        on_segment_ready: Called with each segment's data in plan order as soon as it
+                          and every segment before it are done
+    
+    Returns:
+        list: Dictionaries with segment data including paths, timings, and metadata
+    """
+    total = len(visual_plan.segments)
+    workers = max(1, min(max_workers or VISUALS_MAX_WORKERS, total or 1))
+    
+    print("\n🎬 Creating visual segments...")
+    print(f"  📊 Total segments to process: {total} ({workers} in parallel)")
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="visual-segment") as executor:
+        # executor.map yields results in submission order, which is the plan order
+        results = executor.map(
+            lambda item: _create_visual_segment(item[0], item[1], total, temp_dir),
+            enumerate(visual_plan.segments)
+        )
+        segment_data_list = []
+        for segment_data in results:
+            if not segment_data:
+                continue
+            segment_data_list.append(segment_data)
+            if on_segment_ready:
+                on_segment_ready(segment_data)
     
     print(f"\n📊 Segment processing complete. Created {len(segment_data_list)} segments.")
+    if VISUALS_CACHE_ENABLED:
+        print(f"  ♻️ Render cache stats: {segment_cache.stats()}")
     return segment_data_list
 
+def _fit_frame(frame: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Scale a frame to fit width x height, keeping aspect ratio, and center it on black."""
+    frame_height, frame_width = frame.shape[:2]
+    if frame_width == width and frame_height == height:
+        return frame
+    
+    scale = min(width / frame_width, height / frame_height)
+    new_width = max(1, int(round(frame_width * scale)))
+    new_height = max(1, int(round(frame_height * scale)))
+    resized = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_AREA)
+    
+    canvas = np.zeros((height, width, 3), dtype=np.uint8)
+    x_offset = (width - new_width) // 2
+    y_offset = (height - new_height) // 2
+    canvas[y_offset:y_offset + new_height, x_offset:x_offset + new_width] = resized
+    return canvas
+
+class VisualsTrackStream:
+    """
+    Encodes the visuals track in a single pass while segments are still rendering.
+    
+    Segments are handed over in plan order (see on_segment_ready in
+    _create_visual_segments) and their frames are written to one long-lived ffmpeg
+    encoder, so the track is finished almost as soon as the last segment is. Image
+    and placeholder segments (including cached images) arrive as in-memory stills
+    and are encoded once, here; animations are mp4 files that are decoded and
+    re-encoded. If
+    anything goes wrong the stream marks itself failed and the caller falls back to
+    _assemble_visual_segments.
+    """
+    
+    def __init__(self, output_path: str):
+        """
+        Args:
+            output_path: Path of the final visuals video
+        """
+        self.output_path = output_path
+        self.width = RENDER_SETTINGS["width"]
+        self.height = RENDER_SETTINGS["height"]
+        self.fps = RENDER_SETTINGS["fps"]
+        self.failed = False
+        self.segments_written = 0
+        self.duration = 0.0
+        self._encoder: Optional[RawVideoEncoder] = None
+    
+    def add_segment(self, segment_info: dict):
+        """Append one segment's frames to the track: stills directly, video files by decoding them."""
+        if self.failed:
+            return
+        
+        if segment_info.get('stills'):
+            self._add_stills(segment_info)
+            return
+        
+        segment_path = segment_info['path']
+        segment_id = segment_info.get('segment_id', os.path.basename(segment_path))
+        if not os.path.exists(segment_path):
+            print(f"  ⚠️  Warning: Segment file not found: {segment_path}")
+            return
+        
+        capture = cv2.VideoCapture(segment_path)
+        try:
+            if not capture.isOpened():
+                print(f"  ⚠️  Warning: Could not open segment {segment_id} for streaming")
+                return
+            
+            source_fps = capture.get(cv2.CAP_PROP_FPS) or self.fps
+            if self._encoder is None:
+                self._encoder = RawVideoEncoder(self.output_path, self.width, self.height, self.fps)
+            
+            # Resample to the track frame rate by timestamp, like MoviePy does when writing
+            frames_in = 0
+            frames_out = 0
+            while True:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                frames_in += 1
+                fitted = _fit_frame(frame, self.width, self.height)
+                while frames_out / self.fps < frames_in / source_fps:
+                    self._encoder.write_frame(fitted)
+                    frames_out += 1
+            
+            if frames_out == 0:
+                print(f"  ⚠️  Warning: Segment {segment_id} has no frames")
+                return
+            
+            self.segments_written += 1
+            self.duration += frames_out / self.fps
+            print(f"  📡 Streamed {segment_id} into the visuals track ({frames_out / self.fps:.2f}s, expected: {segment_info['duration']:.2f}s)")
+        except Exception as e:
+            print(f"  ❌ Streaming assembly failed on {segment_id}: {e}")
+            self._abort()
+        finally:
+            capture.release()
+    
+    def _add_stills(self, segment_info: dict):
+        """Write a segment's (frame, frame count) stills straight into the encoder, with no intermediate file."""
+        segment_id = segment_info.get('segment_id', 'segment')
+        try:
+            if self._encoder is None:
+                self._encoder = RawVideoEncoder(self.output_path, self.width, self.height, self.fps)
+            frames_out = 0
+            for frame, count in segment_info['stills']:
+                fitted = _fit_frame(frame, self.width, self.height)
+                for _ in range(count):
+                    self._encoder.write_frame(fitted)
+                frames_out += count
+            
+            if frames_out == 0:
+                print(f"  ⚠️  Warning: Segment {segment_id} has no frames")
+                return
+            
+            self.segments_written += 1
+            self.duration += frames_out / self.fps
+            print(f"  📡 Wrote {segment_id} stills into the visuals track ({frames_out / self.fps:.2f}s, expected: {segment_info['duration']:.2f}s)")
+        except Exception as e:
+            print(f"  ❌ Streaming assembly failed on {segment_id}: {e}")
+            self._abort()
+    
+    def finish(self) -> Optional[str]:
+        """
+        Close the encoder.
+        
+        Returns:
+            str: Path to the encoded track, or None if streaming failed or nothing was written
+        """
+        if self.failed or self._encoder is None or self.segments_written == 0:
+            self._abort()
+            return None
+        try:
+            self._encoder.close()
+        except Exception as e:
+            print(f"  ❌ Streaming encoder failed: {e}")
+            self.failed = True
+            return None
+        print(f"✅ Streamed {self.segments_written} segments into {self.output_path} ({self.duration:.2f}s)")
+        return self.output_path
+    
+    def _abort(self):
+        self.failed = True
+        if self._encoder is not None:
+            try:
+                self._encoder.abort()
+            except Exception:
+                pass
+            self._encoder = None
+
+def _concat_visual_segments(segments_data: list, output_dir: str, final_filename: str = "final_visuals.mp4") -> Optional[str]:
+    """
+    Join segments with ffmpeg's concat demuxer, stream-copying when possible.
+    
+    Segments normalized to SEGMENT_PROFILE are joined with "-c copy"; if any
+    segment's stream parameters differ, the join is re-encoded instead.
+    
+    Args:
+        segments_data: List of dictionaries with segment info (see _assemble_visual_segments)
+        output_dir: Directory to save the final assembled video
+        final_filename: Name for the output file (default: "final_visuals.mp4")
+        
+    Returns:
+        str: Path to the final assembled video or None if assembly failed
+    """
+    print("\n🎬 Concatenating visual segments...")
+    
+    try:
+        segment_paths = []
+        stream_params = set()
+        for segment_info in sorted(segments_data, key=lambda x: x['start_time']):
+            if not os.path.exists(segment_info['path']):
+                print(f"  ⚠️  Warning: Segment file not found: {segment_info['path']}")
+                continue
+            video_info = probe_video(segment_info['path'])
+            stream_params.add(tuple(video_info.get(key) for key in CONCAT_COPY_KEYS))
+            segment_paths.append(segment_info['path'])
+        
+        if not segment_paths:
+            print("  ❌ No valid segments to concatenate")
+            return None
+        
+        final_video_output_path = os.path.join(output_dir, final_filename)
+        if len(stream_params) == 1:
+            print(f"  ⚡ Stream-copying {len(segment_paths)} segments")
+            concat_files(segment_paths, final_video_output_path, copy=True)
+        else:
+            width, height, fps = RENDER_SETTINGS["width"], RENDER_SETTINGS["height"], RENDER_SETTINGS["fps"]
+            print(f"  🔄 Segment parameters differ ({len(stream_params)} variants), re-encoding the join")
+            concat_files(segment_paths, final_video_output_path, copy=False, encode_args=[
+                "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                       f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps}",
+                *SEGMENT_CODEC_ARGS,
+            ])
+        
+        print(f"✅ Video assembly complete: {final_video_output_path}")
+        return final_video_output_path
+    
+    except Exception as e:
+        print(f"❌ Error concatenating visual segments: {e}")
+        return None
+
 def _assemble_visual_segments(segments_data: list, output_dir: str, final_filename: str = "final_visuals.mp4") -> Optional[str]:
     """
     Assembles individual video segments into a final video using MoviePy.
@@ -913,6 +1551,13 @@ def generate_visuals(transcription: dict) -> sieve.File:
     print("🎨 Starting visuals generation...")
     temp_dir = tempfile.mkdtemp()
     
+    # Warm the renderer workers while the visual plan is being created
+    if VISUALS_WARM_RENDERER and WarmRendererPool.is_supported():
+        try:
+            get_warm_renderer_pool(VISUALS_MAX_RENDER_PROCESSES).start()
+        except Exception as e:
+            print(f"⚠️ Could not start warm renderer workers: {e}")
+    
     try:
         # Step 1: Create visual plan
         print("\n📋 Creating visual plan...")
@@ -925,11 +1570,32 @@ def generate_visuals(transcription: dict) -> sieve.File:
 
         print(f"✅ Created plan with {len(visual_plan.segments)} segments")
         
-        # Step 2: Create visual segments
-        segment_data_list = _create_visual_segments(visual_plan, temp_dir)
+        # Step 2: Create visual segments (streaming them into the encoder as they complete)
+        track_stream = None
+        if VISUALS_ASSEMBLY_MODE == "stream":
+            track_stream = VisualsTrackStream(os.path.join(temp_dir, "final_visuals.mp4"))
+        segment_data_list = _create_visual_segments(
+            visual_plan, temp_dir,
+            on_segment_ready=track_stream.add_segment if track_stream else None
+        )
         
         # Step 3: Assemble visual segments
-        final_video_path = _assemble_visual_segments(segment_data_list, temp_dir)
+        final_video_path = None
+        if track_stream:
+            final_video_path = track_stream.finish()
+        elif VISUALS_ASSEMBLY_MODE == "concat" and segment_data_list:
+            final_video_path = _concat_visual_segments(segment_data_list, temp_dir)
+        if not final_video_path and segment_data_list:
+            if VISUALS_ASSEMBLY_MODE != "moviepy":
+                print(f"⚠️ {VISUALS_ASSEMBLY_MODE} assembly unavailable, falling back to MoviePy assembly")
+            # Stream-mode stills have no segment file yet
+            for segment_data in list(segment_data_list):
+                try:
+                    _segment_file(segment_data, temp_dir)
+                except Exception as e:
+                    print(f"  ❌ Could not encode {segment_data['segment_id']} for MoviePy assembly: {e}")
+                    segment_data_list.remove(segment_data)
+            final_video_path = _assemble_visual_segments(segment_data_list, temp_dir)
         
         # Step 4: Return result
         if final_video_path:
@@ -0,0 +1,115 @@
+import unittest
+import importlib
+import os
+import queue
+import tempfile
+import shutil
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from types import ModuleType
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "twitter_bot"))
+from job_journal import JobJournal
+
+
+def import_action_handler():
+    """Import action_handler against stub sieve, Twitter, parser and asset modules."""
+    stub_sieve = ModuleType("sieve")
+    stub_sieve.File = object
+    stubs = {name: ModuleType(name) for name in ("twitter_client", "request_parser", "persona_assets")}
+    with mock.patch.dict(sys.modules, {"sieve": stub_sieve, **stubs}):
+        sys.modules.pop("action_handler", None)
+        module = importlib.import_module("action_handler")
+    sys.modules.pop("action_handler", None)
+    return module
+
+
+class TestJobTracking(unittest.TestCase):
+    def setUp(self):
+        self.action_handler = import_action_handler()
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal = JobJournal(os.path.join(self.temp_dir, 'journal.db'))
+        self.action_handler.journal = self.journal
+        self.completed = []
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _track(self, tweet_id, future, start_time=None):
+        job_data = {"future": future, "tweet_id": tweet_id, "topic": "DNS", "persona_name": "Steve Jobs",
+                    "start_time": time.time() if start_time is None else start_time}
+        self.journal.record_job(tweet_id, job_data)
+        self.action_handler._track_job(tweet_id, job_data)
+
+    def _on_completed(self, tweet_id, video_file, job_data):
+        self.completed.append((tweet_id, video_file))
+
+    def _status(self, tweet_id):
+        return self.journal._execute("SELECT status FROM jobs WHERE tweet_id = ?", (tweet_id,))[0]["status"]
+
+    def test_completed_future_is_posted_without_scanning(self):
+        """Only the job whose future finished is touched; other pending futures are never polled"""
+        finished = Future()
+        running = mock.Mock(spec=["add_done_callback"])  # result() or done() would raise AttributeError
+        self._track("1", finished)
+        self._track("2", running)
+
+        finished.set_result("video-1")
+        handled = self.action_handler.check_completed_jobs(on_completed=self._on_completed, timeout=1)
+
+        self.assertEqual(handled, 1)
+        self.assertEqual(self.completed, [("1", "video-1")])
+        self.assertEqual(list(self.action_handler.pending_jobs), ["2"])
+        self.assertEqual(self._status("1"), "completed")
+
+    def test_expired_job_is_dropped_and_marked_timed_out(self):
+        self._track("1", Future(), start_time=time.time() - self.action_handler.MAX_JOB_TIME_SECONDS - 1)
+
+        self.assertEqual(self.action_handler.check_completed_jobs(on_completed=self._on_completed), 0)
+
+        self.assertEqual(self.action_handler.pending_jobs, {})
+        self.assertEqual(self._status("1"), "timed_out")
+
+    def test_job_finishing_after_timeout_is_ignored(self):
+        """A late result reaches the ready queue but is not posted"""
+        future = Future()
+        self._track("1", future, start_time=time.time() - self.action_handler.MAX_JOB_TIME_SECONDS - 1)
+        self.action_handler.check_completed_jobs(on_completed=self._on_completed)
+
+        future.set_result("video-1")
+        handled = self.action_handler.check_completed_jobs(on_completed=self._on_completed, timeout=1)
+
+        self.assertEqual(handled, 0)
+        self.assertEqual(self.completed, [])
+        self.assertEqual(self._status("1"), "timed_out")
+
+    def test_wait_never_sleeps_past_next_deadline(self):
+        """The ready-queue wait is cut short so a job times out on schedule"""
+        max_time = self.action_handler.MAX_JOB_TIME_SECONDS
+        self._track("1", Future(), start_time=time.time() - max_time + 0.2)
+        self._track("2", Future(), start_time=time.time() - max_time + 30)
+
+        ready_jobs = mock.Mock()
+        ready_jobs.get.side_effect = queue.Empty
+        with mock.patch.object(self.action_handler, "_ready_jobs", ready_jobs):
+            self.action_handler.check_completed_jobs(on_completed=self._on_completed, timeout=60)
+        wait = ready_jobs.get.call_args.kwargs["timeout"]
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 0.2)
+
+        # Once the deadline passes the job expires and the next wait is bounded by the later job
+        time.sleep(wait)
+        ready_jobs.get.reset_mock()
+        with mock.patch.object(self.action_handler, "_ready_jobs", ready_jobs):
+            self.action_handler.check_completed_jobs(on_completed=self._on_completed, timeout=60)
+        self.assertEqual(list(self.action_handler.pending_jobs), ["2"])
+        self.assertEqual(self._status("1"), "timed_out")
+        self.assertLessEqual(ready_jobs.get.call_args.kwargs["timeout"], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
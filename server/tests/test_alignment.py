@@ -0,0 +1,43 @@
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+from utils.alignment import align_sentences, find_pauses
+
+
+def _voiced_track(spans, total_seconds, frame_seconds=0.02):
+    """Voice activity frames that are True inside the given (start, end) spans."""
+    frames = int(round(total_seconds / frame_seconds))
+    return [any(start <= i * frame_seconds < end for start, end in spans) for i in range(frames)]
+
+
+class TestForcedAlignment(unittest.TestCase):
+    def test_boundaries_snap_to_pauses(self):
+        """Sentence breaks land on the silences between spoken sentences"""
+        # Uneven sentence lengths, so a purely proportional split would be off
+        sentences = ["Short one.", "This second sentence is quite a bit longer than the first.", "Done."]
+        voiced = _voiced_track([(0.2, 1.0), (1.4, 5.0), (5.5, 6.0)], 6.5)
+
+        segments = align_sentences(sentences, voiced)
+
+        self.assertEqual([s["text"] for s in segments], sentences)
+        self.assertAlmostEqual(segments[0]["start"], 0.2, places=2)
+        self.assertAlmostEqual(segments[0]["end"], 1.0, places=2)
+        self.assertAlmostEqual(segments[1]["start"], 1.4, places=2)
+        self.assertAlmostEqual(segments[1]["end"], 5.0, places=2)
+        self.assertAlmostEqual(segments[2]["start"], 5.5, places=2)
+        self.assertAlmostEqual(segments[2]["end"], 6.0, places=2)
+
+    def test_short_gaps_are_not_pauses(self):
+        """Gaps between words are ignored and leading/trailing silence is not a pause"""
+        voiced = _voiced_track([(0.5, 1.0), (1.06, 2.0), (2.5, 3.0)], 4.0)
+        self.assertEqual(len(find_pauses(voiced)), 1)
+
+    def test_silence_is_rejected(self):
+        with self.assertRaises(ValueError):
+            align_sentences(["Hello."], [False] * 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import tempfile
+import shutil
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+from utils.code_corpus import (
+    AnimationCodeCorpus, bind_output_path, description_tokens, jaccard_similarity, with_placeholder_output,
+)
+
+CODE = "import matplotlib\nanim = make()\nanim.save('animation.mp4', writer='ffmpeg', fps=30)\n"
+
+
+class TestAnimationCodeCorpus(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.corpus = AnimationCodeCorpus(os.path.join(self.temp_dir, 'corpus.db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_exact_reuse_by_normalized_description_and_duration(self):
+        """Case, whitespace and trailing punctuation do not matter; the duration does"""
+        self.corpus.add("Binary search on a sorted array", 5.0, CODE)
+
+        exact = self.corpus.find_exact("  binary SEARCH on a sorted array.", 5.04)
+        self.assertEqual(exact["code"], CODE)
+        self.assertIsNone(self.corpus.find_exact("binary search on a sorted array", 8.0))
+
+    def test_add_replaces_code_for_same_key(self):
+        self.corpus.add("Binary search", 5.0, CODE)
+        self.corpus.add("binary search", 5.0, CODE.replace("make()", "make_better()"))
+        self.assertIn("make_better()", self.corpus.find_exact("Binary search", 5.0)["code"])
+
+    def test_similar_description_respects_jaccard_threshold(self):
+        """The closest entry is returned only if its token overlap reaches the threshold"""
+        self.corpus.add("Animate binary search over a sorted array of numbers", 5.0, CODE)
+        self.corpus.add("Show bubble sort swapping neighbours", 5.0, CODE)
+
+        query = "binary search through a sorted list of numbers"
+        expected = jaccard_similarity(description_tokens(query),
+                                      description_tokens("Animate binary search over a sorted array of numbers"))
+        self.assertAlmostEqual(expected, 4 / 8)
+
+        similar = self.corpus.find_similar(query, min_similarity=0.5)
+        self.assertEqual(similar["description"], "Animate binary search over a sorted array of numbers")
+        self.assertAlmostEqual(similar["similarity"], expected)
+        self.assertIsNone(self.corpus.find_similar(query, min_similarity=0.6))
+        self.assertIsNone(self.corpus.find_similar("the animation of a", min_similarity=0.0))
+
+    def test_stored_code_uses_placeholder_output(self):
+        """A concrete output path is rewritten to the placeholder before the code is stored"""
+        bound = bind_output_path(CODE, "/tmp/job/segment_3.mp4")
+        self.assertIn("anim.save('/tmp/job/segment_3.mp4', writer='ffmpeg'", bound)
+
+        self.corpus.add("Binary search", 5.0, bound)
+        stored = self.corpus.find_exact("Binary search", 5.0)["code"]
+        self.assertEqual(stored, CODE)
+        self.assertEqual(bind_output_path(stored, "/tmp/other/segment_9.mp4"),
+                         CODE.replace("animation.mp4", "/tmp/other/segment_9.mp4"))
+
+
+class TestOutputPathRewrite(unittest.TestCase):
+    def test_save_call_is_appended_when_missing(self):
+        bound = bind_output_path("anim = make()\n", "/tmp/out.mp4")
+        self.assertTrue(bound.endswith("anim.save('/tmp/out.mp4', writer='pillow', fps=30)\n"))
+
+    def test_placeholder_rewrite_handles_both_quote_styles(self):
+        code = 'anim.save("/work/x.mp4", fps=30)\nanim.save( \'y.mp4\')\nprint("z.mp4")\n'
+        self.assertEqual(with_placeholder_output(code),
+                         "anim.save('animation.mp4', fps=30)\nanim.save('animation.mp4')\nprint(\"z.mp4\")\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import tempfile
+import shutil
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+from utils.content_cache import ContentCache, make_key, normalize_text
+
+
+class TestContentCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write_file(self, name: str, size: int) -> str:
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(os.urandom(size))
+        return path
+
+    def test_normalized_descriptions_share_a_key(self):
+        """Whitespace, case and trailing punctuation should not change the key"""
+        key_a = make_key("visual_segment", "animation", normalize_text("  Binary   Search on a sorted array."), 5.0)
+        key_b = make_key("visual_segment", "animation", normalize_text("binary search on a sorted array"), 5.0)
+        key_c = make_key("visual_segment", "image", normalize_text("binary search on a sorted array"), 5.0)
+        self.assertEqual(key_a, key_b)
+        self.assertNotEqual(key_a, key_c)
+
+    def test_put_get_round_trip_and_counters(self):
+        """A stored file is returned with its metadata and counted as a hit"""
+        cache = ContentCache(self.cache_dir, max_bytes=10_000)
+        source = self._write_file('segment.mp4', 100)
+        key = make_key("segment", 1)
+
+        self.assertIsNone(cache.get(key))
+        self.assertTrue(cache.put(key, source, {"code": "print('hi')"}))
+
+        dest = os.path.join(self.temp_dir, 'copy.mp4')
+        entry = cache.get(key, dest_path=dest)
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry["path"], dest)
+        self.assertEqual(entry["metadata"]["code"], "print('hi')")
+        with open(source, 'rb') as a, open(dest, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_lru_eviction_by_total_bytes(self):
+        """The least recently used entry is evicted once the size limit is exceeded"""
+        cache = ContentCache(self.cache_dir, max_bytes=250)
+        keys = [make_key("segment", i) for i in range(3)]
+
+        cache.put(keys[0], self._write_file('a.mp4', 100))
+        cache.put(keys[1], self._write_file('b.mp4', 100))
+        cache.get(keys[0])  # keys[1] is now least recently used
+        cache.put(keys[2], self._write_file('c.mp4', 100))
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.stats()["total_bytes"], 250)
+
+    def test_entries_survive_a_new_instance(self):
+        """The cache is persistent across processes sharing the same directory"""
+        key = make_key("segment", "persistent")
+        ContentCache(self.cache_dir, max_bytes=10_000).put(key, self._write_file('p.mp4', 50))
+
+        reopened = ContentCache(self.cache_dir, max_bytes=10_000)
+        self.assertIsNotNone(reopened.get(key))
+        self.assertEqual(reopened.stats()["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
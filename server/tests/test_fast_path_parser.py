@@ -0,0 +1,48 @@
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "twitter_bot"))
+from fast_parser import FastPathParser, evaluate_fast_path
+
+PERSONAS = [
+    {"id": "steve_jobs", "name": "Steve Jobs"},
+    {"id": "leonardo_dicaprio", "name": "Leonardo DiCaprio"},
+    {"id": "kanye_west", "name": "Kanye West"},
+    {"id": "samuel_jackson", "name": "Samuel Jackson"},
+]
+
+
+class TestFastPathParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = FastPathParser(PERSONAS)
+
+    def test_documented_shape(self):
+        """Mentions, URLs and trailing filler are stripped; the last "by" splits topic from celebrity"""
+        result = self.parser.parse("@spewbot @friend explain standing by by Steve Jobs please https://t.co/x")
+        self.assertEqual((result.topic, result.persona_id, result.confidence), ("standing by", "steve_jobs", 1.0))
+
+    def test_typos_and_aliases(self):
+        """Misspelled names and unambiguous single-word aliases still resolve"""
+        self.assertEqual(self.parser.parse("@spewbot explain DNS by steve jbos").persona_id, "steve_jobs")
+        self.assertEqual(self.parser.parse("@spewbot explain black holes as Kanye").persona_id, "kanye_west")
+        self.assertGreaterEqual(self.parser.parse("@spewbot explain TCP by leonardo dicaprio").confidence, 0.99)
+
+    def test_low_confidence_input(self):
+        """Free-form tweets and unknown celebrities are left to the LLM"""
+        self.assertEqual(self.parser.parse("@spewbot what do you think about AI?").confidence, 0.0)
+        self.assertLess(self.parser.parse("@spewbot explain taxes by elon musk").confidence, 0.85)
+
+    def test_evaluate_fast_path(self):
+        corpus = [
+            {"text": "@spewbot explain recursion by steve jobs", "persona_id": "steve_jobs", "topic": "recursion"},
+            {"text": "@spewbot explain taxes by kanye", "persona_id": "kanye_west"},
+            {"text": "@spewbot make me a video", "persona_id": None},
+        ]
+        report = evaluate_fast_path(corpus, PERSONAS, thresholds=[0.9, 0.99])
+        self.assertEqual([row["hits"] for row in report], [2, 1])
+        self.assertEqual([row["precision"] for row in report], [1.0, 1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
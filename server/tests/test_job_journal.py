@@ -0,0 +1,164 @@
+import unittest
+import os
+import tempfile
+import shutil
+import time
+import queue
+from concurrent.futures import Future
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "twitter_bot"))
+from job_journal import JobJournal, _find_output_url
+
+
+class TestJobJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'journal.db')
+        self.journal = JobJournal(self.db_path)
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_state_survives_reopen(self):
+        """Checkpoint, unhandled mentions and outstanding jobs are read back after a restart"""
+        self.journal.save_since_id(1234)
+        self.journal.record_mention(SimpleNamespace(id=1235, author_id=7, text="explain DNS by steve jobs"))
+        self.journal.record_mention(SimpleNamespace(id=1236, author_id=8, text="explain TCP by steve jobs"))
+        self.journal.mark_mention_handled(1235)
+        self.journal.record_job("1236", {"sieve_job_id": "job-1", "author_id": "8", "topic": "TCP",
+                                         "persona_name": "Steve Jobs", "start_time": time.time()})
+        self.journal.close()
+
+        self.journal = JobJournal(self.db_path)
+        self.assertEqual(self.journal.get_since_id(), 1234)
+        self.assertEqual([m.id for m in self.journal.unhandled_mentions()], [1236])
+        self.assertEqual([j["sieve_job_id"] for j in self.journal.outstanding_jobs()], ["job-1"])
+
+    def test_no_duplicate_replies(self):
+        """Handled mentions are rejected and posted jobs are no longer outstanding"""
+        tweet = SimpleNamespace(id=42, author_id=1, text="hi")
+        self.assertTrue(self.journal.record_mention(tweet))
+        self.journal.mark_mention_handled(42)
+        self.assertFalse(self.journal.record_mention(tweet))
+
+        self.journal.record_job("42", {"sieve_job_id": "job-2", "start_time": time.time()})
+        self.journal.record_reply("42", "video", "99")
+        self.journal.set_job_status("42", "posted")
+        self.assertTrue(self.journal.has_reply("42", "video"))
+        self.assertFalse(self.journal.has_reply("42", "error"))
+        self.assertEqual(self.journal.outstanding_jobs(), [])
+
+        self.assertGreater(self.journal.compact(retention_seconds=-1), 0)
+        self.assertFalse(self.journal.has_reply("42", "video"))
+
+    def test_find_output_url(self):
+        outputs = [{"type": "sieve.File", "data": {"url": "https://storage.example.com/video.mp4"}}]
+        self.assertEqual(_find_output_url(outputs), "https://storage.example.com/video.mp4")
+        self.assertIsNone(_find_output_url([{"data": "text"}]))
+
+
+class TestResumeFromCheckpoint(unittest.TestCase):
+    def setUp(self):
+        try:
+            import twitter_client
+        except ImportError as e:
+            self.skipTest(f"Twitter bot dependencies not installed: {e}")
+        self.twitter_client = twitter_client
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal = JobJournal(os.path.join(self.temp_dir, 'journal.db'))
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_process_mentions_with_restored_checkpoint(self):
+        """since_id restored after a restart advances past every mention in the page"""
+        self.journal.save_since_id(100)
+        since_id = self.journal.get_since_id()
+
+        handled = []
+        mentions = [SimpleNamespace(id=tweet_id, author_id=1, text="explain DNS by steve jobs") for tweet_id in (103, 102, 101)]
+        updated = self.twitter_client._process_mentions(mentions, "bot", since_id, lambda tweet: handled.append(tweet.id))
+
+        self.assertEqual(handled, [101, 102, 103])
+        self.assertEqual(updated, 103)
+        self.assertEqual(self.twitter_client._process_mentions(mentions[:1], "bot", "100", lambda tweet: None), 103)
+
+    def test_resume_follows_pagination_to_the_checkpoint(self):
+        """Every page newer than the checkpoint is fetched and handled oldest first"""
+        pages = {
+            None: SimpleNamespace(data=[SimpleNamespace(id=i, author_id=1, text="t") for i in (105, 104)],
+                                  errors=[], meta={"next_token": "page-2"}),
+            "page-2": SimpleNamespace(data=[SimpleNamespace(id=i, author_id=1, text="t") for i in (103, 102)],
+                                      errors=[], meta={"next_token": "page-3"}),
+            "page-3": SimpleNamespace(data=[SimpleNamespace(id=101, author_id=1, text="t")], errors=[], meta={}),
+        }
+        requested = []
+
+        def fake_fetch(api, user_id, since_id, max_results, pagination_token=None):
+            requested.append((since_id, pagination_token))
+            return pages[pagination_token]
+
+        handled = []
+        with mock.patch.object(self.twitter_client, "fetch_mentions", side_effect=fake_fetch):
+            updated = self.twitter_client._process_mention_cycle("bot", 100, lambda tweet: handled.append(tweet.id), 2)
+
+        self.assertEqual(requested, [(100, None), (100, "page-2"), (100, "page-3")])
+        self.assertEqual(handled, [101, 102, 103, 104, 105])
+        self.assertEqual(updated, 105)
+
+
+class TestReattachPendingJobs(unittest.TestCase):
+    def setUp(self):
+        try:
+            import action_handler
+        except ImportError as e:
+            self.skipTest(f"Twitter bot dependencies not installed: {e}")
+        self.action_handler = action_handler
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal = JobJournal(os.path.join(self.temp_dir, 'journal.db'))
+        self.futures = {}
+
+        def remote_job(job_id):
+            self.futures[job_id] = Future()
+            return self.futures[job_id]
+
+        patcher = mock.patch.multiple(action_handler, journal=self.journal, pending_jobs={}, _job_deadlines=[],
+                                      _ready_jobs=queue.Queue())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        remote_patcher = mock.patch.object(action_handler.job_journal, "RemoteSieveJob", side_effect=remote_job)
+        remote_patcher.start()
+        self.addCleanup(remote_patcher.stop)
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_outstanding_jobs_are_tracked_again(self):
+        """Jobs with a Sieve id are re-attached with their start time; jobs without one are orphaned"""
+        started = time.time() - 60
+        self.journal.record_job("1", {"sieve_job_id": "job-1", "author_id": "7", "topic": "DNS",
+                                      "persona_name": "Steve Jobs", "start_time": started})
+        self.journal.record_job("2", {"author_id": "8", "topic": "TCP", "persona_name": "Steve Jobs", "start_time": started})
+
+        self.assertEqual(self.action_handler.reattach_pending_jobs(), 1)
+        self.assertEqual(list(self.action_handler.pending_jobs), ["1"])
+        self.assertEqual(self.action_handler.pending_jobs["1"]["start_time"], started)
+        self.assertEqual(self.action_handler._job_deadlines,
+                         [(started + self.action_handler.MAX_JOB_TIME_SECONDS, "1")])
+        self.assertEqual([job["tweet_id"] for job in self.journal.outstanding_jobs()], ["1"])
+
+        # Already tracked jobs are not attached twice; completion lands on the ready queue
+        self.assertEqual(self.action_handler.reattach_pending_jobs(), 0)
+        self.futures["job-1"].set_result("video")
+        self.assertEqual(self.action_handler._ready_jobs.get(timeout=1), "1")
+
+
+if __name__ == '__main__':
+    unittest.main()
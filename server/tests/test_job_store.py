@@ -0,0 +1,84 @@
+import unittest
+import os
+import tempfile
+import shutil
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+from job_store import JobStore
+from event_bus import EventBus, RESYNC
+
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'jobs.db')
+        self.store = JobStore(self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_create_and_update_job(self):
+        """Stage updates are recorded in order and finished jobs get completed_at"""
+        job = self.store.create_job("binary search", "steve_jobs")
+        self.assertEqual(job["status"], "pending")
+
+        self.store.update_job(job["job_id"], "processing", "Generating script", stage="script")
+        self.store.update_job(job["job_id"], "processing", "Script generated", stage="script", result="script text")
+        self.store.update_job(job["job_id"], "completed", "Done", video_path="/tmp/video.mp4")
+
+        stored = self.store.get_job(job["job_id"])
+        self.assertEqual(stored["status"], "completed")
+        self.assertEqual(stored["result"], "script text")
+        self.assertEqual(stored["stage"], "script")
+        self.assertIsNotNone(stored["completed_at"])
+
+        updates = self.store.get_updates(job["job_id"])
+        self.assertEqual([u["message"] for u in updates], ["Job created", "Generating script", "Script generated", "Done"])
+        self.assertEqual(self.store.get_updates(job["job_id"], after_id=updates[1]["id"]), updates[2:])
+
+    def test_unknown_job_and_status(self):
+        """Missing jobs return None and invalid statuses are rejected"""
+        self.assertIsNone(self.store.get_job("missing"))
+        job = self.store.create_job("topic", "steve_jobs")
+        with self.assertRaises(ValueError):
+            self.store.update_job(job["job_id"], "exploded", "nope")
+
+    def test_interrupted_jobs_fail_after_restart(self):
+        """Jobs left running by a previous process are marked failed on startup"""
+        running = self.store.create_job("topic", "steve_jobs")
+        self.store.update_job(running["job_id"], "processing", "Generating speech", stage="speech")
+        done = self.store.create_job("other", "steve_jobs")
+        self.store.update_job(done["job_id"], "completed", "Done")
+
+        reopened = JobStore(self.db_path)
+        self.assertEqual(reopened.mark_interrupted_jobs(), 1)
+        self.assertEqual(reopened.get_job(running["job_id"])["status"], "failed")
+        self.assertEqual(reopened.get_job(done["job_id"])["status"], "completed")
+
+    def test_updates_fan_out_to_subscribers(self):
+        """Committed updates are published to every subscriber of the job"""
+        bus = EventBus()
+        store = JobStore(self.db_path, on_update=lambda update: bus.publish(update["job_id"], update))
+        job = store.create_job("topic", "steve_jobs")
+
+        with bus.subscribe(job["job_id"]) as first, bus.subscribe(job["job_id"]) as second:
+            update = store.update_job(job["job_id"], "processing", "Generating visuals", stage="visuals")
+            self.assertEqual(first.get(timeout=1), update)
+            self.assertEqual(second.get(timeout=1), update)
+        self.assertEqual(bus.subscriber_count(job["job_id"]), 0)
+
+    def test_full_subscriber_queue_gets_resync_marker(self):
+        """Overflowing a slow subscriber replaces its backlog with RESYNC instead of silently losing events"""
+        bus = EventBus(max_queue_size=2)
+        with bus.subscribe("job") as slow:
+            self.assertEqual([bus.publish("job", event) for event in (1, 2, 3, 4)], [1, 1, 0, 1])
+            self.assertEqual(slow.dropped, 3)
+            # Events published after the overflow follow the marker
+            self.assertEqual(slow.get(timeout=1), RESYNC)
+            self.assertEqual(slow.get(timeout=1), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import json
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+from job_store import JobStore
+from event_bus import EventBus
+
+
+def parse_sse(chunk: bytes) -> dict:
+    """Split one SSE message into its id, event and decoded data fields."""
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+    return {"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])}
+
+
+class TestJobEventStream(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        try:
+            from flask import Flask
+            with mock.patch.dict(os.environ, {"JOBS_DB_PATH": os.path.join(self.temp_dir, "import.db"),
+                                              "JOBS_OUTPUT_DIR": os.path.join(self.temp_dir, "videos")}):
+                from routes import jobs
+        except ImportError as e:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.skipTest(f"Server dependencies not installed: {e}")
+
+        bus = EventBus()
+        self.store = JobStore(os.path.join(self.temp_dir, "jobs.db"),
+                              on_update=lambda update: bus.publish(update["job_id"], update))
+        patcher = mock.patch.multiple(jobs, event_bus=bus, job_store=self.store,
+                                      _load_personas=mock.Mock(return_value={}),
+                                      preload_in_background=mock.Mock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        app = Flask(__name__)
+        app.register_blueprint(jobs.jobs_bp)
+        self.client = app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_snapshot_then_updates(self):
+        """The stream opens with a snapshot, then sends one framed update per change and ends with the job"""
+        job_id = self.store.create_job("binary search", "steve_jobs")["job_id"]
+        response = self.client.get(f"/api/jobs/{job_id}/events")
+        self.assertEqual(response.mimetype, "text/event-stream")
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        chunks = iter(response.response)
+
+        snapshot = parse_sse(next(chunks))
+        self.assertEqual(snapshot["event"], "snapshot")
+        self.assertEqual(snapshot["data"]["job"]["status"], "pending")
+        self.assertEqual([u["message"] for u in snapshot["data"]["updates"]], ["Job created"])
+        self.assertEqual(snapshot["id"], snapshot["data"]["updates"][-1]["id"])
+
+        self.store.update_job(job_id, "processing", "Generating script", stage="script")
+        update = parse_sse(next(chunks))
+        self.assertEqual(update["event"], "update")
+        self.assertEqual(update["data"]["update"]["message"], "Generating script")
+        self.assertEqual(update["data"]["job"]["stage"], "script")
+        self.assertEqual(update["id"], update["data"]["update"]["id"])
+
+        self.store.update_job(job_id, "completed", "Done")
+        final = parse_sse(next(chunks))
+        self.assertEqual(final["data"]["job"]["status"], "completed")
+        self.assertEqual(list(chunks), [])
+        response.close()
+
+    def test_reconnect_snapshot_skips_seen_updates(self):
+        """Last-Event-ID resumes the snapshot after the updates the client already has"""
+        job_id = self.store.create_job("binary search", "steve_jobs")["job_id"]
+        self.store.update_job(job_id, "processing", "Generating script", stage="script")
+        self.store.update_job(job_id, "completed", "Done")
+        seen = self.store.get_updates(job_id)[1]["id"]
+
+        response = self.client.get(f"/api/jobs/{job_id}/events", headers={"Last-Event-ID": str(seen)})
+        snapshot = parse_sse(response.get_data())
+
+        self.assertEqual([u["message"] for u in snapshot["data"]["updates"]], ["Done"])
+        self.assertEqual(self.client.get("/api/jobs/missing/events").status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
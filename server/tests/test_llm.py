@@ -0,0 +1,166 @@
+import unittest
+import asyncio
+import importlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+
+
+def import_llm():
+    """Import utils.llm against stub SDK, httpx and pydantic modules; tests swap in fake client classes."""
+    stubs = {name: ModuleType(name) for name in ("httpx", "openai", "anthropic", "pydantic")}
+    stubs["httpx"].Client = stubs["httpx"].AsyncClient = lambda **kwargs: SimpleNamespace(**kwargs)
+    stubs["httpx"].Timeout = lambda timeout, connect: (timeout, connect)
+    stubs["httpx"].Limits = lambda **kwargs: kwargs
+    stubs["openai"].OpenAI = stubs["openai"].AsyncOpenAI = None
+    stubs["anthropic"].Anthropic = stubs["anthropic"].AsyncAnthropic = None
+    stubs["pydantic"].BaseModel = type("BaseModel", (), {})
+    stubs["pydantic"].ValidationError = ValueError
+    with mock.patch.dict(sys.modules, stubs):
+        sys.modules.pop("utils.llm", None)
+        module = importlib.import_module("utils.llm")
+    sys.modules.pop("utils.llm", None)
+    return module
+
+
+class FakeClient:
+    """SDK client stand-in that records each construction."""
+    created = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+        type(self).created.append(self)
+
+    def close(self):
+        self.closed = True
+
+
+class TestSharedClients(unittest.TestCase):
+    def setUp(self):
+        self.llm = import_llm()
+        FakeClient.created = []
+        patchers = [
+            mock.patch.object(self.llm, "OpenAI", FakeClient),
+            mock.patch.object(self.llm, "Anthropic", FakeClient),
+            mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key", "ANTHROPIC_API_KEY": "other-key"}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_client_is_shared_across_calls_and_threads(self):
+        """Concurrent first calls build one client per provider, reused afterwards"""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: self.llm.get_client("gpt"), range(16)))
+
+        self.assertTrue(all(client is clients[0] for client in clients))
+        self.assertIs(self.llm.get_client("GPT"), clients[0])
+        self.assertIsNot(self.llm.get_client("claude"), clients[0])
+        self.assertEqual(len(FakeClient.created), 2)
+        self.assertEqual(clients[0].kwargs["api_key"], "key")
+        self.assertEqual(clients[0].kwargs["timeout"], self.llm.LLM_TIMEOUT_SECONDS)
+
+    def test_client_is_rebuilt_after_close_or_key_change(self):
+        first = self.llm.get_client("gpt")
+
+        self.llm.close_clients()
+        self.assertTrue(first.closed)
+        reopened = self.llm.get_client("gpt")
+        self.assertIsNot(reopened, first)
+
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "rotated-key"}):
+            rotated = self.llm.get_client("gpt")
+        self.assertIsNot(rotated, reopened)
+        self.assertEqual(rotated.kwargs["api_key"], "rotated-key")
+        self.assertIsNot(self.llm.get_client("gpt", timeout=5), reopened)
+        self.assertIs(self.llm.get_client("gpt"), reopened)
+
+
+class FakeAsyncOpenAI:
+    """Async OpenAI stand-in whose calls take a moment and count how many are in flight."""
+    running = 0
+    max_running = 0
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.beta = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(parse=self._parse)))
+        self.images = SimpleNamespace(generate=self._generate)
+
+    async def _call(self, value):
+        cls = type(self)
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        await asyncio.sleep(0.01)
+        cls.running -= 1
+        return value
+
+    async def _create(self, model, messages):
+        content = f"answer to {messages[-1]['content']}"
+        return await self._call(SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))]))
+
+    async def _parse(self, model, messages, response_format):
+        message = SimpleNamespace(parsed=response_format())
+        return await self._call(SimpleNamespace(choices=[SimpleNamespace(message=message)]))
+
+    async def _generate(self, **kwargs):
+        return await self._call(SimpleNamespace(data=[SimpleNamespace(url="https://images.example/1.png")]))
+
+
+class TestAsyncHelpers(unittest.TestCase):
+    def setUp(self):
+        self.llm = import_llm()
+        FakeAsyncOpenAI.running = FakeAsyncOpenAI.max_running = 0
+        patchers = [
+            mock.patch.object(self.llm, "AsyncOpenAI", FakeAsyncOpenAI),
+            mock.patch.object(self.llm, "LLM_MAX_CONCURRENCY", {"gpt": 3, "claude": 2}),
+            mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key"}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_provider_semaphore_caps_gather(self):
+        """A large gather runs at most LLM_MAX_CONCURRENCY calls at once, images included"""
+        async def run():
+            calls = [self.llm.acall_llm("gpt", f"prompt {i}") for i in range(10)]
+            calls += [self.llm.agenerate_image(f"image {i}") for i in range(5)]
+            return await asyncio.gather(*calls)
+
+        results = asyncio.run(run())
+
+        self.assertEqual(results[:2], ["answer to prompt 0", "answer to prompt 1"])
+        self.assertEqual(results[-1], "https://images.example/1.png")
+        self.assertEqual(FakeAsyncOpenAI.max_running, 3)
+
+    def test_clients_are_kept_per_event_loop(self):
+        """Calls on one loop share a client and limiter; another loop gets its own"""
+        async def clients():
+            return (self.llm.get_async_client("gpt"), self.llm.get_async_client("gpt"),
+                    self.llm._async_limiter("gpt"))
+
+        first, again, limiter = asyncio.run(clients())
+        other, _, other_limiter = asyncio.run(clients())
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+        self.assertIsNot(limiter, other_limiter)
+        self.assertEqual(first.kwargs["api_key"], "key")
+
+    def test_response_model_returns_parsed_model(self):
+        class Plan(self.llm.BaseModel):
+            pass
+
+        result = asyncio.run(self.llm.acall_llm("gpt", "plan it", response_model=Plan))
+
+        self.assertIsInstance(result, Plan)
+
+
+if __name__ == '__main__':
+    unittest.main()
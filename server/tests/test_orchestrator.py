@@ -0,0 +1,133 @@
+import unittest
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import ModuleType
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+
+
+class StubFile:
+    """Stand-in for sieve.File."""
+
+    def __init__(self, path=None, url=None):
+        self.path = path
+        self.url = url
+
+
+class StubStage:
+    """Stand-in for a Sieve function handle: push() runs fn on a thread and counts calls in flight."""
+
+    def __init__(self, executor, fn, delay=0.0):
+        self.executor = executor
+        self.fn = fn
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def push(self, **kwargs):
+        return self.executor.submit(self._run, kwargs)
+
+    def _run(self, kwargs):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delay)
+            return self.fn(**kwargs)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+class StubFunctions:
+    """Stand-in for sieve.function: a no-op decorator whose get() returns registered stage handles."""
+
+    def __init__(self):
+        self.handles = {}
+
+    def __call__(self, **kwargs):
+        return lambda fn: fn
+
+    def get(self, name):
+        return self.handles[name.split("/")[-1]]
+
+
+def import_orchestrator(functions):
+    """Import orchestrator against a stub sieve module."""
+    stub_sieve = ModuleType("sieve")
+    stub_sieve.File = StubFile
+    stub_sieve.function = functions
+    with mock.patch.dict(sys.modules, {"sieve": stub_sieve}):
+        sys.modules.pop("orchestrator", None)
+        module = importlib.import_module("orchestrator")
+    sys.modules.pop("orchestrator", None)
+    return module
+
+
+def write_script(query, name, style):
+    if query == "boom":
+        raise RuntimeError("script generator failed")
+    return f"{name} explains {query}. " * 5
+
+
+class TestCreateVideosBatch(unittest.TestCase):
+    def setUp(self):
+        self.remote = ThreadPoolExecutor(max_workers=32)  # Stands in for Sieve's push()
+        functions = StubFunctions()
+        self.script = StubStage(self.remote, write_script, delay=0.05)
+        self.speech = StubStage(self.remote, lambda script_text, voice_link: {
+            "audio_file": StubFile(path=script_text), "transcription": {"segments": []}}, delay=0.05)
+        functions.handles = {
+            "spew_script_generator": self.script,
+            "spew_speech_synthesizer": self.speech,
+            "spew_visuals_generator": StubStage(self.remote, lambda transcription: StubFile(path="visuals.mp4")),
+            "spew_lipsync_processor": StubStage(self.remote, lambda persona_id, generated_audio, base_video_file:
+                                                StubFile(path=generated_audio.path)),
+            "spew_video_assembler": StubStage(self.remote, lambda celebrity_video, visuals_video:
+                                              StubFile(path=celebrity_video.path)),
+        }
+        self.orchestrator = import_orchestrator(functions)
+        self.persona = {"id": "steve_jobs", "name": "Steve Jobs", "style_prompt": "calm", "tts_voice_link": "voice"}
+
+    def tearDown(self):
+        self.remote.shutdown(wait=True)
+
+    def test_script_and_speech_concurrency_is_capped(self):
+        """At most SPEW_BATCH_CONCURRENCY script and TTS calls run at once, however many videos are in flight"""
+        queries = [f"topic {i}" for i in range(8)]
+        with mock.patch.multiple(self.orchestrator, SPEW_BATCH_CONCURRENCY=2, SPEW_BATCH_MAX_IN_FLIGHT=8,
+                                 SPEW_SPECULATIVE_VISUALS=False):
+            results = list(self.orchestrator.create_videos_batch(self.persona, StubFile(path="base.mp4"), queries))
+
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result["error"] is None for result in results))
+        self.assertEqual(self.script.max_running, 2)
+        self.assertEqual(self.speech.max_running, 2)
+
+    def test_results_keep_the_original_query_index(self):
+        """Each result carries its position in the submitted list; invalid and failed queries are errors"""
+        queries = ["binary search", "", "boom", None, "hash maps"]
+        with mock.patch.multiple(self.orchestrator, SPEW_BATCH_CONCURRENCY=2, SPEW_SPECULATIVE_VISUALS=False):
+            results = list(self.orchestrator.create_videos_batch(self.persona, StubFile(path="base.mp4"), queries))
+
+        by_index = {result["index"]: result for result in results}
+        self.assertEqual(sorted(by_index), [0, 1, 2, 3, 4])
+        self.assertEqual([results[0]["index"], results[1]["index"]], [1, 3])  # Invalid queries come first
+        for index in (1, 3):
+            self.assertIsNone(by_index[index]["video"])
+            self.assertEqual(by_index[index]["error"], "Query must be a non-empty string")
+        self.assertIn("script generator failed", by_index[2]["error"])
+        for index in (0, 4):
+            self.assertIsNone(by_index[index]["error"])
+            self.assertEqual(by_index[index]["query"], queries[index])
+            self.assertIn(queries[index], by_index[index]["video"].path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import importlib
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from types import ModuleType
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+class StubFile:
+    """Stand-in for sieve.File; uploads succeed unless the class attribute says otherwise."""
+    upload_url = "https://storage.example/base.mp4"
+    uploads = 0
+
+    def __init__(self, path=None, url=None):
+        self.path = path
+        self.url = url
+
+    def upload(self):
+        type(self).uploads += 1
+        self.url = self.upload_url
+
+
+class StubFileWithoutUpload:
+    def __init__(self, path=None, url=None):
+        self.path = path
+        self.url = url
+
+
+def import_persona_assets(file_class):
+    """Import persona_assets against a stub sieve module exposing file_class as File."""
+    stub_sieve = ModuleType("sieve")
+    stub_sieve.File = file_class
+    with mock.patch.dict(sys.modules, {"sieve": stub_sieve}):
+        sys.modules.pop("persona_assets", None)
+        module = importlib.import_module("persona_assets")
+    sys.modules.pop("persona_assets", None)
+    return module
+
+
+class TestPersonaAssetRegistry(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.video_path = os.path.join(self.temp_dir, 'base.mp4')
+        with open(self.video_path, 'wb') as f:
+            f.write(b'video')
+        self.cache_path = os.path.join(self.temp_dir, 'assets.json')
+        StubFile.uploads = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_upload_once_and_reuse_across_restarts(self):
+        """A base video is uploaded once; a new registry reuses the persisted reference"""
+        persona_assets = import_persona_assets(StubFile)
+        registry = persona_assets.PersonaAssetRegistry(self.cache_path)
+
+        self.assertEqual(registry.get_file(self.video_path).url, StubFile.upload_url)
+        self.assertEqual(registry.get_file(self.video_path).url, StubFile.upload_url)
+        reopened = persona_assets.PersonaAssetRegistry(self.cache_path)
+        self.assertEqual(reopened.get_file(self.video_path).url, StubFile.upload_url)
+
+        self.assertEqual(StubFile.uploads, 1)
+        self.assertEqual(registry.stats(), {"remote_references": 1, "local_fallbacks": {}})
+
+    def test_missing_upload_falls_back_visibly(self):
+        """Without File.upload the local file is used, with a warning and an entry in stats()"""
+        persona_assets = import_persona_assets(StubFileWithoutUpload)
+        registry = persona_assets.PersonaAssetRegistry(self.cache_path)
+
+        with self.assertLogs(persona_assets.logger, level='WARNING'):
+            file = registry.get_file(self.video_path)
+
+        self.assertEqual((file.path, file.url), (self.video_path, None))
+        stats = registry.stats()
+        self.assertEqual(stats["remote_references"], 0)
+        self.assertIn("File.upload", stats["local_fallbacks"]["base.mp4"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+from pipeline import Pipeline, PipelineError, Stage
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.remote = ThreadPoolExecutor(max_workers=4)  # Stands in for Sieve's push()
+
+    def tearDown(self):
+        self.remote.shutdown(wait=True)
+
+    def _push(self, fn):
+        return self.remote.submit(fn)
+
+    def test_independent_stages_overlap_and_trace_critical_path(self):
+        """Stages start as soon as their inputs exist; the slowest branch is the critical path"""
+        # Both branches wait at the barrier, so it only opens if they run at the same time.
+        # Visuals then waits until lipsync has completed, which fixes the critical path
+        both_running = threading.Barrier(2, timeout=5)
+        lipsync_completed = threading.Event()
+
+        def visuals():
+            both_running.wait()
+            lipsync_completed.wait(5)
+            return "visuals.mp4"
+
+        def lipsync():
+            both_running.wait()
+            return "celeb.mp4"
+
+        def on_event(name, status, outputs):
+            events.append((name, status))
+            if (name, status) == ("lipsync", "completed"):
+                lipsync_completed.set()
+
+        pipeline = Pipeline([
+            Stage("script", ("query",), ("script",), lambda query: self._push(lambda: f"script for {query}")),
+            Stage("speech", ("script",), ("speech",), lambda script: self._push(lambda: "audio")),
+            Stage("visuals", ("speech",), ("visuals_video",), lambda speech: self._push(visuals)),
+            Stage("lipsync", ("speech",), ("celebrity_video",), lambda speech: self._push(lipsync)),
+            Stage("assembly", ("celebrity_video", "visuals_video"), ("final_video",),
+                  lambda celebrity_video, visuals_video: f"{visuals_video}+{celebrity_video}"),
+        ])
+
+        events = []
+        result = pipeline.run({"query": "q"}, on_event=on_event)
+
+        self.assertEqual(result.outputs["final_video"], "visuals.mp4+celeb.mp4")
+        self.assertEqual(result.trace["critical_path"], ["script", "speech", "visuals", "assembly"])
+        # The trace shows visuals and lipsync in flight at the same time
+        stages = {stage["name"]: stage for stage in result.trace["stages"]}
+        visuals_trace, lipsync_trace = stages["visuals"], stages["lipsync"]
+        self.assertLessEqual(visuals_trace["started_at"], lipsync_trace["finished_at"])
+        self.assertLessEqual(lipsync_trace["started_at"], visuals_trace["finished_at"])
+        self.assertLessEqual(lipsync_trace["finished_at"], visuals_trace["finished_at"])
+        self.assertGreaterEqual(stages["assembly"]["started_at"], visuals_trace["finished_at"])
+        self.assertIsNotNone(visuals_trace["run_seconds"])
+        self.assertIn(("assembly", "completed"), events)
+
+    def test_failure_skips_downstream_stages(self):
+        """A failing stage raises PipelineError with a trace marking what never ran"""
+        def fail(script):
+            raise RuntimeError("tts unavailable")
+
+        pipeline = Pipeline([
+            Stage("script", ("query",), ("script",), lambda query: "script"),
+            Stage("speech", ("script",), ("speech",), fail),
+            Stage("assembly", ("speech",), ("final_video",), lambda speech: "video"),
+        ])
+
+        with self.assertRaises(PipelineError) as context:
+            pipeline.run({"query": "q"})
+        statuses = {stage["name"]: stage["status"] for stage in context.exception.trace["stages"]}
+        self.assertEqual(statuses, {"script": "completed", "speech": "failed", "assembly": "skipped"})
+
+    def test_missing_inputs_are_rejected(self):
+        pipeline = Pipeline([Stage("assembly", ("visuals_video",), ("final_video",), lambda visuals_video: "v")])
+        with self.assertRaises(ValueError):
+            pipeline.run({"query": "q"})
+
+
+if __name__ == "__main__":
+    unittest.main()
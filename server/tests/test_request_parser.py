@@ -0,0 +1,132 @@
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "twitter_bot"))
+
+try:
+    import request_parser
+    from request_parser import TweetBatchExtract, TweetBatchItem, TweetExtract
+except ImportError as e:  # openai, pydantic and python-dotenv are needed to import the parser
+    raise unittest.SkipTest(f"Request parser dependencies not installed: {e}")
+
+PERSONAS_DATA = {"personas": [
+    {"id": "steve_jobs", "name": "Steve Jobs"},
+    {"id": "kanye_west", "name": "Kanye West"},
+]}
+
+
+def batch_item(tweet_id, topic="DNS", persona_id="steve_jobs"):
+    return TweetBatchItem(tweet_id=tweet_id, topic=topic, persona_id=persona_id)
+
+
+class TestChunkByTokenBudget(unittest.TestCase):
+    def test_splits_on_token_budget(self):
+        """Tweets stay in order and a chunk closes once the next tweet would exceed the budget"""
+        tweets = [(str(i), "x" * 400) for i in range(5)]  # 140 estimated tokens each
+        chunks = request_parser._chunk_by_token_budget(tweets, token_budget=300, max_tweets=10)
+        self.assertEqual([[tweet_id for tweet_id, _ in chunk] for chunk in chunks], [["0", "1"], ["2", "3"], ["4"]])
+
+    def test_splits_on_tweet_count(self):
+        tweets = [(str(i), "short") for i in range(5)]
+        chunks = request_parser._chunk_by_token_budget(tweets, token_budget=10_000, max_tweets=2)
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+
+    def test_oversized_tweet_gets_its_own_chunk(self):
+        tweets = [("a", "short"), ("b", "x" * 10_000), ("c", "short")]
+        chunks = request_parser._chunk_by_token_budget(tweets, token_budget=100, max_tweets=10)
+        self.assertEqual([[tweet_id for tweet_id, _ in chunk] for chunk in chunks], [["a"], ["b"], ["c"]])
+
+
+class TestParseChunk(unittest.TestCase):
+    def setUp(self):
+        self.persona_info = request_parser.PersonaInfo(PERSONAS_DATA)
+        self.chunk = [("1", "explain DNS"), ("2", "explain TCP"), ("3", "explain UDP")]
+
+    def test_keeps_only_ids_returned_exactly_once(self):
+        """Duplicated ids are dropped, unknown ids ignored and missing ids left out for the fallback"""
+        response = TweetBatchExtract(results=[
+            batch_item("1"), batch_item("2", topic="TCP"), batch_item("2", topic="UDP"), batch_item("99"),
+        ])
+        with mock.patch.object(request_parser, "call_llm", return_value=response) as call_llm:
+            results = request_parser._parse_chunk(self.chunk, self.persona_info)
+
+        call_llm.assert_called_once()
+        self.assertEqual(set(results), {"1"})
+        self.assertEqual((results["1"].topic, results["1"].persona_id), ("DNS", "steve_jobs"))
+
+    def test_unexpected_response_raises(self):
+        with mock.patch.object(request_parser, "call_llm", return_value=None):
+            with self.assertRaises(ValueError):
+                request_parser._parse_chunk(self.chunk, self.persona_info)
+
+
+@mock.patch.object(request_parser, "FAST_PARSE_ENABLED", False)
+class TestParseTweetsBatch(unittest.TestCase):
+    tweets = {"1": "explain DNS", "2": "explain TCP", "3": "explain UDP"}
+
+    def test_missing_tweets_are_parsed_individually(self):
+        """Tweets the batched response leaves out get their own call and the same answer shape"""
+        def fake_llm(provider, prompt, system_prompt, response_model):
+            if response_model is TweetBatchExtract:
+                return TweetBatchExtract(results=[batch_item("1"), batch_item("3", persona_id="kanye_west")])
+            return TweetExtract(topic="TCP", persona_id="Steve_Jobs")
+
+        with mock.patch.object(request_parser, "call_llm", side_effect=fake_llm) as call_llm:
+            results = request_parser.parse_tweets_batch(self.tweets, PERSONAS_DATA)
+
+        self.assertEqual(call_llm.call_count, 2)
+        self.assertEqual(list(results), ["1", "2", "3"])
+        self.assertEqual(results["1"], ("DNS", "steve_jobs", None))
+        self.assertEqual(results["2"], ("TCP", "steve_jobs", None))
+        self.assertEqual(results["3"], ("DNS", "kanye_west", None))
+
+    def test_failed_batch_call_falls_back_for_every_tweet(self):
+        def fake_llm(provider, prompt, system_prompt, response_model):
+            if response_model is TweetBatchExtract:
+                raise RuntimeError("rate limited")
+            return TweetExtract(topic="DNS", persona_id="steve_jobs")
+
+        with mock.patch.object(request_parser, "call_llm", side_effect=fake_llm) as call_llm:
+            results = request_parser.parse_tweets_batch(self.tweets, PERSONAS_DATA)
+
+        self.assertEqual(call_llm.call_count, 1 + len(self.tweets))
+        self.assertEqual(set(results.values()), {("DNS", "steve_jobs", None)})
+
+    def test_unsupported_persona_is_reported_per_tweet(self):
+        response = TweetBatchExtract(results=[batch_item("1"), batch_item("2", persona_id="elvis"), batch_item("3", topic="")])
+        with mock.patch.object(request_parser, "call_llm", return_value=response):
+            results = request_parser.parse_tweets_batch(self.tweets, PERSONAS_DATA)
+
+        self.assertEqual(results["1"], ("DNS", "steve_jobs", None))
+        self.assertIsNone(results["2"][1])
+        self.assertIn("elvis", results["2"][2])
+        self.assertEqual(results["3"][:2], (None, None))
+
+
+class TestHandleMentionsParseFailure(unittest.TestCase):
+    def setUp(self):
+        try:
+            import action_handler
+        except ImportError as e:
+            self.skipTest(f"Twitter bot dependencies not installed: {e}")
+        self.action_handler = action_handler
+        patcher = mock.patch.multiple(action_handler, personas_data={"steve_jobs": PERSONAS_DATA["personas"][0]},
+                                      user_request_history={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_every_admitted_tweet_gets_an_error_reply(self):
+        """A parser crash is answered per tweet instead of escaping to the worker"""
+        tweets = [SimpleNamespace(id=tweet_id, author_id=tweet_id, text="explain DNS by steve jobs") for tweet_id in (1, 2)]
+        with mock.patch.object(request_parser, "parse_tweets_batch", side_effect=RuntimeError("boom")), \
+                mock.patch.object(self.action_handler, "handle_request_error") as handle_request_error:
+            self.action_handler.handle_mentions(tweets)
+
+        self.assertEqual([call.args[0] for call in handle_request_error.call_args_list], ["1", "2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
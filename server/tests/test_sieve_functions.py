@@ -9,6 +9,8 @@ from pathlib import Path
 # Import the orchestrator
 import sys
 sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+sys.path.append(str(Path(__file__).parent.parent))
+from persona_assets import base_video_path as persona_base_video_path, get_registry
 # Note: We no longer import create_video directly since it's now a Sieve function
 
 # Load environment variables from .env file if present
@@ -55,12 +57,12 @@ class TestSpewPipeline(unittest.TestCase):
         print(f"📝 Query: {QUERY}")
         
         # Load the base video file for this persona
-        base_video_path = PROJECT_ROOT / 'server' / persona_data['video_path']
+        base_video_path = PROJECT_ROOT / 'server' / persona_base_video_path(persona_data)
         if not base_video_path.exists():
             raise FileNotFoundError(f"Base video not found: {base_video_path}")
         
-        base_video_file = sieve.File(path=str(base_video_path))
-        print(f"📹 Loaded base video: {base_video_path}")
+        base_video_file = get_registry().get_file(str(base_video_path))
+        print(f"📹 Loaded base video: {base_video_path} ({'remote reference' if getattr(base_video_file, 'url', None) else 'local file'})")
         
         # Use the orchestrator to generate the complete video
         print("\n🎬 Generating complete video using orchestrator...")
@@ -0,0 +1,200 @@
+import unittest
+import importlib
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+from utils.content_cache import ContentCache
+
+
+class StubFile:
+    """Stand-in for sieve.File."""
+
+    def __init__(self, path=None, url=None):
+        self.path = path
+        self.url = url
+
+
+def import_speech_synthesizer():
+    """Import speech_synthesizer against stub sieve and requests modules, with its cache in a temp dir."""
+    stub_sieve = ModuleType("sieve")
+    stub_sieve.File = StubFile
+    stub_sieve.Env = SimpleNamespace
+    stub_sieve.function = lambda **kwargs: (lambda fn: fn)
+    cache_dir = tempfile.mkdtemp()
+    with mock.patch.dict(sys.modules, {"sieve": stub_sieve, "requests": ModuleType("requests")}), \
+            mock.patch.dict(os.environ, {"SPEECH_CACHE_DIR": cache_dir}):
+        sys.modules.pop("speech_synthesizer", None)
+        module = importlib.import_module("speech_synthesizer")
+    sys.modules.pop("speech_synthesizer", None)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return module
+
+
+speech_synthesizer = import_speech_synthesizer()
+
+
+def fake_tts(script_text, voice_link, user_id, api_key, output_path=None):
+    """Stand-in for the PlayHT call: writes the script as the "audio"."""
+    if not output_path:
+        fd, output_path = tempfile.mkstemp(suffix=".mp3")
+        os.close(fd)
+    with open(output_path, "w") as f:
+        f.write(script_text)
+    return output_path
+
+
+class TestSynthesizeAndTranscribe(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        patchers = [
+            mock.patch.object(speech_synthesizer, "SPEECH_OUTPUT_DIR", os.path.join(self.temp_dir, "output")),
+            mock.patch.object(speech_synthesizer, "SPEECH_CACHE_ENABLED", False),
+            mock.patch.object(speech_synthesizer, "SPEECH_STREAMING", False),
+            mock.patch.object(speech_synthesizer, "_generate_speech_audio", side_effect=fake_tts),
+            mock.patch.object(speech_synthesizer, "_speech_timings", return_value={"segments": []}),
+            mock.patch.dict(os.environ, {"PLAYHT_TTS_USER": "user", "PLAYHT_TTS_API_KEY": "key"}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_returned_audio_outlives_the_call(self):
+        """The audio handed to lipsync is still on disk when the result is serialized"""
+        result = speech_synthesizer._synthesize_and_transcribe("Hello there.", "voice")
+        with open(result["audio_file"].path) as f:
+            self.assertEqual(f.read(), "Hello there.")
+
+    def test_expired_output_is_pruned(self):
+        old = speech_synthesizer._synthesize_and_transcribe("Old.", "voice")["audio_file"].path
+        os.utime(old, (0, 0))
+        new = speech_synthesizer._synthesize_and_transcribe("New.", "voice")["audio_file"].path
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(new))
+
+
+class TestChunkedSynthesis(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        patchers = [
+            mock.patch.object(speech_synthesizer, "SPEECH_OUTPUT_DIR", os.path.join(self.temp_dir, "output")),
+            mock.patch.object(speech_synthesizer, "SPEECH_TIMING_MODE", "align"),
+            mock.patch.object(speech_synthesizer, "_generate_speech_audio", side_effect=fake_tts),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_stream_chunks_groups_sentences(self):
+        """Sentences are packed up to max_chars; a longer sentence stands alone"""
+        script = "One two. Three four. A much longer sentence than the rest. End."
+        self.assertEqual(speech_synthesizer._stream_chunks(script, max_chars=20),
+                         ["One two. Three four.", "A much longer sentence than the rest.", "End."])
+        self.assertEqual(speech_synthesizer._stream_chunks(script, max_chars=1000), [script])
+
+    def test_alignment_offset_carries_across_chunks(self):
+        """Each chunk is aligned starting where the previous chunk's audio ended"""
+        def fake_align(audio_path, text, offset=0.0):
+            duration = float(len(text))
+            return {"segments": [{"text": text, "start": offset, "end": offset + duration}], "duration": duration}
+
+        def fake_concat(paths, output_path, **kwargs):
+            with open(output_path, "w") as out:
+                for path in paths:
+                    with open(path) as f:
+                        out.write(f.read())
+
+        chunks = ["First chunk.", "Second one.", "Third."]
+        with mock.patch.object(speech_synthesizer, "align_script", side_effect=fake_align) as align_script, \
+                mock.patch.object(speech_synthesizer, "concat_files", side_effect=fake_concat):
+            audio_path, transcription = speech_synthesizer._synthesize_chunks(chunks, "voice", "user", "key")
+
+        self.assertEqual([call.kwargs["offset"] for call in align_script.call_args_list], [0.0, 12.0, 23.0])
+        self.assertEqual([(s["start"], s["end"]) for s in transcription["segments"]],
+                         [(0.0, 12.0), (12.0, 23.0), (23.0, 29.0)])
+        # The joined audio outlives the call; the per-chunk files do not
+        with open(audio_path) as f:
+            self.assertEqual(f.read(), "".join(chunks))
+        self.assertEqual(os.listdir(os.path.dirname(audio_path)), [os.path.basename(audio_path)])
+        for call in align_script.call_args_list:
+            self.assertFalse(os.path.exists(call.args[0]))
+
+
+class TestSpeechCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ContentCache(os.path.join(self.temp_dir, "cache"), max_bytes=10_000)
+        patchers = [
+            mock.patch.object(speech_synthesizer, "SPEECH_OUTPUT_DIR", os.path.join(self.temp_dir, "output")),
+            mock.patch.object(speech_synthesizer, "SPEECH_CACHE_ENABLED", True),
+            mock.patch.object(speech_synthesizer, "speech_cache", self.cache),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_cache_key_collapses_whitespace_only(self):
+        """Whitespace does not change the key; case and punctuation are spoken, so they do"""
+        key = speech_synthesizer._speech_cache_key("Hello there.  How are you?", "voice")
+        self.assertEqual(speech_synthesizer._speech_cache_key("  Hello there.\n How   are you?\n", "voice"), key)
+        self.assertNotEqual(speech_synthesizer._speech_cache_key("hello there. How are you?", "voice"), key)
+        self.assertNotEqual(speech_synthesizer._speech_cache_key("Hello there, how are you?", "voice"), key)
+
+    def test_cache_key_changes_with_voice_timing_and_synthesis(self):
+        script = "Hello there."
+        with mock.patch.object(speech_synthesizer, "SPEECH_TIMING_MODE", "align"), \
+                mock.patch.object(speech_synthesizer, "SPEECH_STREAMING", False):
+            key = speech_synthesizer._speech_cache_key(script, "voice")
+            self.assertNotEqual(speech_synthesizer._speech_cache_key(script, "other-voice"), key)
+            with mock.patch.object(speech_synthesizer, "SPEECH_TIMING_MODE", "transcribe"):
+                self.assertNotEqual(speech_synthesizer._speech_cache_key(script, "voice"), key)
+            with mock.patch.object(speech_synthesizer, "SPEECH_STREAMING", True):
+                streamed = speech_synthesizer._speech_cache_key(script, "voice")
+                self.assertNotEqual(streamed, key)
+                with mock.patch.object(speech_synthesizer, "SPEECH_STREAM_CHUNK_CHARS", 100):
+                    self.assertNotEqual(speech_synthesizer._speech_cache_key(script, "voice"), streamed)
+
+    def test_round_trip_returns_a_copy_that_survives_eviction(self):
+        """A stored result is found again; the returned audio is the caller's copy, not the cache entry"""
+        key = speech_synthesizer._speech_cache_key("Hello there.", "voice")
+        self.assertIsNone(speech_synthesizer._load_cached_speech(key))
+        self.assertEqual(os.listdir(speech_synthesizer.SPEECH_OUTPUT_DIR), [])  # A miss leaves no file behind
+
+        audio_path = os.path.join(self.temp_dir, "speech.mp3")
+        with open(audio_path, "wb") as f:
+            f.write(b"audio")
+        transcription = {"segments": [{"text": "Hello there.", "start": 0.0, "end": 1.0}]}
+        speech_synthesizer._store_cached_speech(key, audio_path, transcription)
+
+        cached = speech_synthesizer._load_cached_speech(key)
+        self.assertEqual(cached["transcription"], transcription)
+        self.assertEqual(os.path.dirname(cached["audio_file"].path), speech_synthesizer.SPEECH_OUTPUT_DIR)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+        # A concurrent put evicts the entry; the returned audio is unaffected
+        big_path = os.path.join(self.temp_dir, "big.mp3")
+        with open(big_path, "wb") as f:
+            f.write(os.urandom(9_999))
+        self.cache.put("other", big_path, {})
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertIsNone(self.cache.get(key))
+        with open(cached["audio_file"].path, "rb") as f:
+            self.assertEqual(f.read(), b"audio")
+
+
+if __name__ == '__main__':
+    unittest.main()
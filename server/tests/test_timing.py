@@ -0,0 +1,41 @@
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+from utils.timing import estimate_transcription, build_retiming_anchors, warp_time
+
+
+class TestRetiming(unittest.TestCase):
+    SCRIPT = "Integration finds the area under a curve. We slice it into thin rectangles! Then we add them all up."
+
+    def test_estimated_transcription_is_sequential(self):
+        """Estimated sentences follow each other without overlap"""
+        segments = estimate_transcription(self.SCRIPT)["segments"]
+        self.assertEqual(len(segments), 3)
+        for previous, current in zip(segments, segments[1:]):
+            self.assertGreaterEqual(current["start"], previous["end"])
+
+    def test_anchors_map_estimates_onto_real_timings(self):
+        """Slower real speech stretches the estimated timeline proportionally"""
+        estimated = estimate_transcription(self.SCRIPT)["segments"]
+        actual = [
+            {"text": s["text"], "start": s["start"] * 2, "end": s["end"] * 2} for s in estimated
+        ]
+        anchors = build_retiming_anchors(estimated, actual)
+
+        self.assertEqual(anchors[0], (0.0, 0.0))
+        for (e0, a0), (e1, a1) in zip(anchors, anchors[1:]):
+            self.assertGreater(e1, e0)
+            self.assertGreater(a1, a0)
+        for estimated_time in (0.5, 2.0, estimated[-1]["end"]):
+            self.assertAlmostEqual(warp_time(estimated_time, anchors), estimated_time * 2, places=2)
+            self.assertAlmostEqual(warp_time(estimated_time * 2, anchors, inverse=True), estimated_time, places=2)
+
+    def test_no_anchors_is_identity(self):
+        self.assertEqual(build_retiming_anchors([], [{"text": "hi", "start": 0, "end": 1}]), [])
+        self.assertEqual(warp_time(3.0, []), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'sieve_functions'))
+from utils.warm_renderer import WarmRendererPool
+
+
+@unittest.skipUnless(WarmRendererPool.is_supported(), "Warm renderer needs os.fork")
+class TestWarmRendererPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = WarmRendererPool(1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _script(self, code: str) -> str:
+        path = os.path.join(self.temp_dir, 'script.py')
+        with open(path, 'w') as f:
+            f.write(code)
+        return path
+
+    def test_runs_script_with_capped_threads(self):
+        """Output and exit code come back from the forked job, which sees the thread limits"""
+        script = self._script("import os, sys\nprint(os.environ['OMP_NUM_THREADS'])\nsys.exit(3)\n")
+        result = self.pool.run(script, timeout=30)
+        self.assertEqual(result["returncode"], 3)
+        self.assertEqual(result["stdout"].strip(), os.environ.get("OMP_NUM_THREADS", "1"))
+        self.assertFalse(result["timed_out"])
+
+    def test_dead_worker_raises_and_is_replaced(self):
+        """A broken worker raises RuntimeError (callers fall back) and the pool replaces it"""
+        script = self._script("print('ok')\n")
+        self.pool.run(script, timeout=30)
+        worker = self.pool._idle.get()
+        worker.process.kill()
+        worker.process.join()
+        self.pool._idle.put(worker)
+
+        with self.assertRaises(RuntimeError):
+            self.pool.run(script, timeout=30)
+        self.assertEqual(self.pool.run(script, timeout=30)["stdout"], "ok\n")
+
+
+class TestRenderScriptFallback(unittest.TestCase):
+    def setUp(self):
+        try:
+            import visuals_generator
+        except ImportError as e:
+            self.skipTest(f"Visuals generator dependencies not installed: {e}")
+        self.visuals_generator = visuals_generator
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_unavailable_pool_falls_back_to_subprocess(self):
+        """When the warm pool fails the script still runs in a fresh interpreter"""
+        script = os.path.join(self.temp_dir, 'script.py')
+        with open(script, 'w') as f:
+            f.write("import os\nprint(os.environ['OPENBLAS_NUM_THREADS'])\n")
+
+        broken_pool = mock.Mock()
+        broken_pool.run.side_effect = RuntimeError("Warm renderer worker stopped responding")
+        with mock.patch.object(self.visuals_generator, "get_warm_renderer_pool", return_value=broken_pool):
+            result = self.visuals_generator._run_render_script(script)
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout.strip(), os.environ.get("OPENBLAS_NUM_THREADS", "1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+import importlib
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "twitter_bot"))
+
+
+class MentionBackpressure(Exception):
+    pass
+
+
+def import_workers():
+    """Import workers against stub twitter_client and action_handler modules (no tweepy or sieve needed)."""
+    stub_client = ModuleType("twitter_client")
+    stub_client.MentionBackpressure = MentionBackpressure
+    stub_handler = ModuleType("action_handler")
+    with mock.patch.dict(sys.modules, {"twitter_client": stub_client, "action_handler": stub_handler}):
+        sys.modules.pop("workers", None)
+        module = importlib.import_module("workers")
+    sys.modules.pop("workers", None)
+    return module
+
+
+def fake_mention(tweet_id):
+    return SimpleNamespace(id=tweet_id, author_id=1, text=f"@bot explain topic {tweet_id}")
+
+
+class TestMentionIntake(unittest.TestCase):
+    def setUp(self):
+        self.workers = import_workers()
+        patcher = mock.patch.multiple(self.workers, MENTION_QUEUE_SIZE=2, MENTION_ENQUEUE_TIMEOUT_SECONDS=0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bot_workers = self.workers.BotWorkers()
+
+    def test_full_queue_raises_backpressure(self):
+        """A mention that does not fit is refused and can be offered again later"""
+        self.bot_workers.enqueue_mention(fake_mention(1))
+        self.bot_workers.enqueue_mention(fake_mention(2))
+
+        with self.assertRaises(MentionBackpressure):
+            self.bot_workers.enqueue_mention(fake_mention(3))
+        self.assertEqual(self.bot_workers._queued_mention_ids, {"1", "2"})
+
+        self.bot_workers.mention_queue.get_nowait()
+        self.bot_workers.enqueue_mention(fake_mention(3))
+        self.assertEqual(self.bot_workers.mention_queue.qsize(), 2)
+
+    def test_queued_mention_is_not_queued_twice(self):
+        """Intake fetching a mention again while it is still queued does not duplicate it"""
+        self.bot_workers.enqueue_mention(fake_mention(1))
+        self.bot_workers.enqueue_mention(fake_mention(1))
+        self.bot_workers.replay_mentions([fake_mention(1)])
+
+        self.assertEqual(self.bot_workers.mention_queue.qsize(), 1)
+        self.assertEqual(self.bot_workers.get_status()["mention_queue_size"], 1)
+
+
+class TestDrain(unittest.TestCase):
+    def setUp(self):
+        self.workers = import_workers()
+        patcher = mock.patch.multiple(self.workers, PARSE_BATCH_WAIT_SECONDS=0.01, COMPLETION_WAIT_SECONDS=0.05)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.lock = threading.Lock()
+        self.futures = {}  # tweet_id -> fake Sieve job future
+        self.parsed = []
+        self.posted = []
+        handler = self.workers.action_handler
+        handler.handle_mentions = self.fake_handle_mentions
+        handler.check_completed_jobs = self.fake_check_completed_jobs
+        handler.post_completed_video = self.fake_post_completed_video
+
+    def fake_handle_mentions(self, tweets):
+        time.sleep(0.02)  # Parsing is slow enough that mentions are still queued when drain() starts
+        with self.lock:
+            for tweet in tweets:
+                self.parsed.append(tweet.id)
+                future = Future()
+                future.set_result(f"video-{tweet.id}")
+                self.futures[str(tweet.id)] = future
+
+    def fake_check_completed_jobs(self, on_completed=None, timeout=0.0):
+        with self.lock:
+            done = [(tweet_id, future) for tweet_id, future in self.futures.items() if future.done()]
+            for tweet_id, _ in done:
+                del self.futures[tweet_id]
+        for tweet_id, future in done:
+            on_completed(tweet_id, future.result(), {"tweet_id": tweet_id})
+        if not done:
+            time.sleep(timeout)
+        return len(done)
+
+    def fake_post_completed_video(self, tweet_id, video_file, job_data):
+        time.sleep(0.01)
+        with self.lock:
+            self.posted.append((tweet_id, video_file))
+
+    def test_drain_finishes_queued_mentions_and_uploads(self):
+        """Mentions queued before drain() are parsed and their videos posted before the threads stop"""
+        bot_workers = self.workers.BotWorkers(parse_workers=1, upload_workers=2)
+        bot_workers.start()
+        for tweet_id in range(1, 6):
+            bot_workers.enqueue_mention(fake_mention(tweet_id))
+
+        bot_workers.drain(timeout=10)
+
+        self.assertEqual(sorted(self.parsed), [1, 2, 3, 4, 5])
+        self.assertEqual(sorted(self.posted), [(str(i), f"video-{i}") for i in range(1, 6)])
+        self.assertEqual(bot_workers.get_status(), {
+            "mention_queue_size": 0, "upload_queue_size": 0, "parse_workers_alive": 0, "upload_workers_alive": 0,
+        })
+        self.assertFalse(bot_workers._watcher_thread.is_alive())
+        self.assertEqual(bot_workers._queued_mention_ids, set())
+
+
+class TestIntakeBackpressure(unittest.TestCase):
+    def setUp(self):
+        try:
+            import twitter_client
+            import workers
+        except ImportError as e:
+            self.skipTest(f"Twitter bot dependencies not installed: {e}")
+        self.twitter_client = twitter_client
+        patcher = mock.patch.multiple(workers, MENTION_QUEUE_SIZE=1, MENTION_ENQUEUE_TIMEOUT_SECONDS=0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bot_workers = workers.BotWorkers()
+
+    def test_since_id_stops_at_last_accepted_mention(self):
+        """Mentions refused by a full queue are fetched again because since_id does not move past them"""
+        mentions = [fake_mention(103), fake_mention(102), fake_mention(101)]  # newest first, as the API returns them
+
+        updated = self.twitter_client._process_mentions(mentions, "bot", 100, self.bot_workers.enqueue_mention)
+
+        self.assertEqual(updated, 101)
+        self.assertEqual(self.bot_workers.mention_queue.get_nowait().id, 101)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+Tune the mention fast-path parser's confidence threshold against labelled tweets.
+
+The corpus is a JSONL file with one labelled mention per line:
+
+    {"text": "@spewbot explain DNS by steve jbos", "persona_id": "steve_jobs", "topic": "DNS"}
+
+persona_id is null for mentions that should not resolve to a persona; topic is
+optional. For each threshold the report shows the share of mentions the fast path
+would answer without the LLM (hit rate) and how many of those answers are correct
+(precision). Pick the lowest threshold whose precision is acceptable and set it as
+FAST_PARSE_CONFIDENCE_THRESHOLD.
+
+Usage:
+    python tools/evaluate_fast_parser.py corpus.jsonl [--thresholds 0.8 0.85 0.9]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+PERSONAS_FILE = SERVER_DIR / "data" / "personas.json"
+
+sys.path.append(str(SERVER_DIR / "twitter_bot"))
+
+from fast_parser import evaluate_fast_path, FAST_PARSE_CONFIDENCE_THRESHOLD
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="JSONL file of labelled mentions")
+    parser.add_argument("--thresholds", nargs="*", type=float, default=[0.7, 0.75, 0.8, 0.85, 0.9, 0.95])
+    args = parser.parse_args()
+
+    with open(args.corpus, "r") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+    with open(PERSONAS_FILE, "r") as f:
+        personas = json.load(f)["personas"]
+
+    print(f"📋 {len(corpus)} labelled mentions, current threshold {FAST_PARSE_CONFIDENCE_THRESHOLD}")
+    print(f"  {'threshold':>9} {'hit rate':>9} {'precision':>10} {'hits':>6} {'errors':>7}")
+    for row in evaluate_fast_path(corpus, personas, args.thresholds):
+        print(f"  {row['threshold']:9.2f} {row['hit_rate']:9.1%} {row['precision']:10.1%} {row['hits']:6d} {row['errors']:7d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Produce lipsync-ready base videos for every persona in personas.json.
+
+Each base video is cropped to a square around the speaker's face, scaled down to
+the final clip size (1080x1080) if the crop is larger and resampled to the output
+frame rate, then recorded in the persona entry as "lipsync_video_path". Lipsync
+then processes only the pixels that end up in the final video. Smaller crops are
+never upscaled here; the assembler enlarges them once, after lipsync, so lipsync
+does not work on interpolated pixels.
+
+The face box is found with OpenCV's bundled Haar cascade on frames sampled across
+the clip; the crop is fixed for the whole clip so the framing does not jitter.
+
+Usage:
+    python tools/preprocess_base_videos.py [--personas steve_jobs ...] [--force] [--dry-run]
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+PERSONAS_FILE = SERVER_DIR / "data" / "personas.json"
+OUTPUT_DIR = SERVER_DIR / "data" / "base_videos" / "lipsync"
+
+sys.path.append(str(SERVER_DIR / "sieve_functions"))
+
+from utils.ffmpeg import run_ffmpeg, probe_video
+from video_assembler import CLIP_W, CLIP_H, OUTPUT_FPS
+
+# Frames sampled for face detection, and how much of the frame around the face to keep
+FACE_SAMPLE_FRAMES = 24
+FACE_CROP_SCALE = 2.6  # crop side as a multiple of the detected face size
+
+Box = Tuple[int, int, int, int]  # x, y, w, h
+
+def _detect_face_box(video_path: str, samples: int = FACE_SAMPLE_FRAMES) -> Optional[Box]:
+    """
+    Median face box over frames sampled evenly across the video.
+
+    Returns:
+        tuple: (x, y, w, h) in source pixels, or None if no face was found
+    """
+    import cv2
+
+    cascade = cv2.CascadeClassifier(os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml"))
+    capture = cv2.VideoCapture(video_path)
+    frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) or samples
+    boxes = []
+    try:
+        for index in range(samples):
+            capture.set(cv2.CAP_PROP_POS_FRAMES, int(index * frame_count / samples))
+            ok, frame = capture.read()
+            if not ok:
+                continue
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            min_side = max(32, min(gray.shape[:2]) // 10)
+            faces = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(min_side, min_side))
+            if len(faces):
+                # The speaker is the largest face in frame
+                boxes.append(max(faces, key=lambda face: face[2] * face[3]))
+    finally:
+        capture.release()
+
+    if not boxes:
+        return None
+    median = lambda values: sorted(values)[len(values) // 2]
+    return tuple(int(median([box[i] for box in boxes])) for i in range(4))
+
+def square_crop(frame_w: int, frame_h: int, face: Optional[Box]) -> Box:
+    """
+    Square crop of the frame centered on the face, clamped to the frame.
+
+    Without a face the largest centered square is used.
+    """
+    if face:
+        x, y, w, h = face
+        side = int(max(w, h) * FACE_CROP_SCALE)
+        center_x, center_y = x + w / 2, y + h / 2
+    else:
+        side = min(frame_w, frame_h)
+        center_x, center_y = frame_w / 2, frame_h / 2
+
+    side = min(side, frame_w, frame_h) // 2 * 2  # even sizes for yuv420p
+    left = int(min(max(center_x - side / 2, 0), frame_w - side))
+    top = int(min(max(center_y - side / 2, 0), frame_h - side))
+    return left, top, side, side
+
+def preprocess_video(source_path: str, output_path: str) -> dict:
+    """
+    Crop a base video to the speaker's face and encode it at no more than the final size, at the final frame rate.
+
+    Args:
+        source_path: Original base video
+        output_path: Where to write the lipsync-ready video
+
+    Returns:
+        dict: Crop box and whether a face was found
+    """
+    info = probe_video(source_path)
+    face = _detect_face_box(source_path)
+    left, top, side, _ = square_crop(info["width"], info["height"], face)
+    output_side = min(side, CLIP_W)  # downscale only; smaller crops are enlarged by the assembler
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    run_ffmpeg([
+        "-i", source_path,
+        "-vf", f"crop={side}:{side}:{left}:{top},scale={output_side}:{output_side}:flags=lanczos,setsar=1,fps={OUTPUT_FPS}",
+        "-map", "0:v:0", "-map", "0:a?",
+        "-c:v", "libx264", "-preset", "slow", "-crf", "18", "-pix_fmt", "yuv420p",
+        "-c:a", "aac",
+        "-movflags", "+faststart",
+        output_path,
+    ])
+    return {"crop": [left, top, side, side], "size": output_side, "face_found": face is not None}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--personas", nargs="*", help="Persona ids to process (default: all)")
+    parser.add_argument("--force", action="store_true", help="Re-encode even if the output is newer than the source")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be done without writing anything")
+    args = parser.parse_args()
+
+    with open(PERSONAS_FILE, "r") as f:
+        personas_data = json.load(f)
+
+    selected: List[dict] = [
+        persona for persona in personas_data["personas"]
+        if not args.personas or persona["id"] in args.personas
+    ]
+
+    # Several personas can share a base video; encode each source once
+    processed = {}
+    for persona in selected:
+        source = SERVER_DIR / persona["video_path"]
+        if not source.exists():
+            print(f"⚠️ {persona['id']}: base video {source} not found, skipping")
+            continue
+
+        output = OUTPUT_DIR / source.name
+        relative_output = str(output.relative_to(SERVER_DIR))
+        if str(source) not in processed:
+            up_to_date = output.exists() and output.stat().st_mtime >= source.stat().st_mtime
+            if up_to_date and not args.force:
+                print(f"✅ {source.name}: lipsync variant is up to date")
+            elif args.dry_run:
+                print(f"📝 {source.name}: would write {relative_output}")
+            else:
+                print(f"🎬 {source.name}: cropping to at most {CLIP_W}x{CLIP_H} @ {OUTPUT_FPS} fps...")
+                result = preprocess_video(str(source), str(output))
+                face_note = "face-centered" if result["face_found"] else "no face found, center crop"
+                print(f"  ✅ Wrote {relative_output} ({result['size']}x{result['size']}, crop {result['crop']}, {face_note})")
+            processed[str(source)] = relative_output
+
+        if not args.dry_run:
+            persona["lipsync_video_path"] = processed[str(source)]
+
+    if not args.dry_run and processed:
+        temp_path = f"{PERSONAS_FILE}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(personas_data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        os.replace(temp_path, PERSONAS_FILE)
+        print(f"📋 Updated {len(selected)} persona entries in {PERSONAS_FILE.name}")
+
+if __name__ == "__main__":
+    main()
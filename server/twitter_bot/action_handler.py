@@ -3,8 +3,10 @@ import os
 import sys
 import time
 import json
-from typing import Optional
-from pathlib import Path
+import heapq
+import queue
+import threading
+from typing import Callable, Optional
 import sieve
 
 # Add parent directory to path for imports
@@ -15,14 +17,20 @@ if parent_dir not in sys.path:
 # Import our modules - since we're in twitter_bot directory, import directly
 import twitter_client
 import request_parser
+import persona_assets
+import job_journal
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Global variables for job tracking and personas data
 pending_jobs: dict = {}  # tweet_id -> job_data
+_pending_jobs_lock = threading.Lock()
+_ready_jobs: "queue.Queue[str]" = queue.Queue()  # tweet_ids whose Sieve job has finished
+_job_deadlines: list = []  # min-heap of (timeout deadline, tweet_id), guarded by _pending_jobs_lock
 personas_data: Optional[dict] = None
 create_video_function = None
+journal: Optional[job_journal.JobJournal] = None  # Durable record of jobs and replies, set at startup
 
 # Rate limiting settings
 MAX_TOTAL_REQUESTS_PER_HOUR = 3
@@ -31,24 +39,38 @@ RATE_LIMIT_WINDOW_SECONDS = 3600  # 1 hour
 
 # Rate limiting data structure
 user_request_history: dict = {}  # user_id -> {"total_requests": [timestamps], "video_requests": [timestamps]}
+_rate_limit_lock = threading.RLock()  # Mentions are handled by several worker threads
 
 # Job timeout settings
 MAX_JOB_TIME_SECONDS = 21600  # 6 hours timeout
 
-def init_action_handler(personas_file_path: str = None):
+# Rate limit history is pruned at most this often (job checks now run continuously)
+RATE_LIMIT_CLEANUP_INTERVAL_SECONDS = 60
+_last_rate_limit_cleanup = 0.0
+
+def init_action_handler(personas_file_path: str = None, journal_instance: Optional[job_journal.JobJournal] = None):
     """
     Initialize the action handler with Sieve functions and personas data.
     This should be called once by bot_core.py during startup.
+    
+    Args:
+        personas_file_path: Optional path to personas.json
+        journal_instance: Optional journal that makes pending jobs and replies survive restarts
     """
-    global personas_data, create_video_function
+    global personas_data, create_video_function, journal
     
     try:
+        journal = journal_instance
+        
         # Load personas data directly
         personas_data = _load_personas_data(personas_file_path)
         
         # Get the Sieve function for video generation
         create_video_function = sieve.function.get("sieve-internal/spew_complete_video_generator")
         
+        # Upload base videos once up front; requests then reuse the remote references
+        persona_assets.preload_in_background(personas_data)
+        
         persona_names = [p.get('name', 'Unknown') for p in personas_data.values()]
         logger.info(f"Action handler initialized with {len(personas_data)} personas: {persona_names}")
         
@@ -89,18 +111,19 @@ def _cleanup_old_rate_limit_data():
     cutoff_time = current_time - RATE_LIMIT_WINDOW_SECONDS
     
     users_to_remove = []
-    for user_id, history in user_request_history.items():
-        # Filter out old timestamps
-        history["total_requests"] = [ts for ts in history["total_requests"] if ts > cutoff_time]
-        history["video_requests"] = [ts for ts in history["video_requests"] if ts > cutoff_time]
+    with _rate_limit_lock:
+        for user_id, history in user_request_history.items():
+            # Filter out old timestamps
+            history["total_requests"] = [ts for ts in history["total_requests"] if ts > cutoff_time]
+            history["video_requests"] = [ts for ts in history["video_requests"] if ts > cutoff_time]
+            
+            # Mark users with no recent activity for removal
+            if not history["total_requests"] and not history["video_requests"]:
+                users_to_remove.append(user_id)
         
-        # Mark users with no recent activity for removal
-        if not history["total_requests"] and not history["video_requests"]:
-            users_to_remove.append(user_id)
-    
-    # Remove inactive users
-    for user_id in users_to_remove:
-        del user_request_history[user_id]
+        # Remove inactive users
+        for user_id in users_to_remove:
+            del user_request_history[user_id]
     
     if users_to_remove:
         logger.info(f"Cleaned up rate limit data for {len(users_to_remove)} inactive users")
@@ -174,68 +197,107 @@ def handle_mention(tweet):
     Args:
         tweet: Tweepy Tweet object from Twitter API v2
     """
+    handle_mentions([tweet])
+
+def handle_mentions(tweets: list):
+    """
+    Process several mentions, parsing them with batched LLM calls.
+    
+    Rate limits are checked per mention before parsing, so over-limit mentions
+    are answered without ever reaching the LLM.
+    
+    Args:
+        tweets: Tweepy Tweet objects from Twitter API v2, oldest first
+    """
     if not personas_data:
         logger.error("Action handler not initialized. Cannot process mention.")
         return
     
-    tweet_id = str(tweet.id)
-    tweet_text = tweet.text
-    author_id = str(tweet.author_id)
+    admitted = {}  # tweet_id -> tweet, in arrival order
+    for tweet in tweets:
+        tweet_id = str(tweet.id)
+        author_id = str(tweet.author_id)
+        logger.info(f"Processing mention: Tweet ID {tweet_id}, Author {author_id}, Text: '{tweet.text}'")
+        
+        try:
+            # FIRST: Check total request limit (3/hour) - applies to ALL interactions.
+            # Check and record atomically, since mentions are handled on several threads
+            with _rate_limit_lock:
+                within_limit = _check_total_request_limit(author_id)
+                if within_limit:
+                    _record_total_request(author_id)
+            if not within_limit:
+                logger.warning(f"User {author_id} exceeded total request limit for Tweet {tweet_id}")
+                handle_request_error(tweet_id, "You've reached the hourly request limit (3 requests/hour). Please wait before trying again.")
+                continue
+            logger.info(f"Recorded total request for user {author_id}")
+            admitted[tweet_id] = tweet
+            
+        except Exception as e:
+            logger.error(f"Unexpected error processing mention {tweet_id}: {e}", exc_info=True)
+            handle_request_error(tweet_id, "Sorry, I encountered an unexpected error. Please try again later.")
     
-    logger.info(f"Processing mention: Tweet ID {tweet_id}, Author {author_id}, Text: '{tweet_text}'")
+    if not admitted:
+        return
     
+    # Parse all admitted tweets to extract topic and persona
     try:
-        # FIRST: Check total request limit (3/hour) - applies to ALL interactions
-        if not _check_total_request_limit(author_id):
-            logger.warning(f"User {author_id} exceeded total request limit for Tweet {tweet_id}")
-            handle_request_error(tweet_id, "You've reached the hourly request limit (3 requests/hour). Please wait before trying again.")
-            return
-        
-        # Record this total request
-        _record_total_request(author_id)
-        logger.info(f"Recorded total request for user {author_id}")
-        
-        # Parse the tweet to extract topic and persona
-        topic, persona_id, error_message = request_parser.parse_tweet(tweet_text, {"personas": list(personas_data.values())})
-        
-        # If parsing failed or no celebrity was identified, show celebrity list
-        if error_message or not persona_id:
-            logger.warning(f"Tweet parsing error or no celebrity identified for {tweet_id}: error='{error_message}', persona_id='{persona_id}'")
-            celebrity_list_error = _create_celebrity_list_error_message()
-            handle_request_error(tweet_id, celebrity_list_error)
-            return
-            
-        if not topic:
-            logger.warning(f"No topic identified for {tweet_id}: topic='{topic}'")
-            handle_request_error(tweet_id, "I couldn't identify a topic from your request. Please mention me with: explain [topic] by [celebrity name]")
-            return
-        
-        # Validate persona exists in our supported list
-        if persona_id not in personas_data:
-            logger.warning(f"Unsupported persona for {tweet_id}: persona_id='{persona_id}'")
-            celebrity_list_error = _create_celebrity_list_error_message()
-            handle_request_error(tweet_id, celebrity_list_error)
-            return
-        
-        # SECOND: Check video request limit (1/hour) - only for successful video requests
-        if not _check_video_request_limit(author_id):
-            logger.warning(f"User {author_id} exceeded video request limit for Tweet {tweet_id}")
-            handle_request_error(tweet_id, "You've already requested a video this hour. Please wait before requesting another video.")
-            return
-        
-        # Record this video request
-        _record_video_request(author_id)
-        logger.info(f"Recorded video request for user {author_id}")
-        
-        # Process the valid video request
-        persona_name = personas_data[persona_id].get('name', 'the selected celebrity')
-        logger.info(f"Valid request for Tweet {tweet_id}: Topic='{topic}', Persona='{persona_name}' ({persona_id})")
-        
-        process_video_request(tweet_id, author_id, topic, persona_id, persona_name)
-        
+        parsed = request_parser.parse_tweets_batch(
+            {tweet_id: tweet.text for tweet_id, tweet in admitted.items()},
+            {"personas": list(personas_data.values())}
+        )
     except Exception as e:
-        logger.error(f"Unexpected error processing mention {tweet_id}: {e}", exc_info=True)
-        handle_request_error(tweet_id, "Sorry, I encountered an unexpected error. Please try again later.")
+        logger.error(f"Unexpected error parsing mentions {list(admitted)}: {e}", exc_info=True)
+        for tweet_id in admitted:
+            handle_request_error(tweet_id, "Sorry, I encountered an unexpected error. Please try again later.")
+        return
+    
+    for tweet_id, tweet in admitted.items():
+        try:
+            topic, persona_id, error_message = parsed[tweet_id]
+            _handle_parsed_mention(tweet_id, str(tweet.author_id), topic, persona_id, error_message)
+        except Exception as e:
+            logger.error(f"Unexpected error processing mention {tweet_id}: {e}", exc_info=True)
+            handle_request_error(tweet_id, "Sorry, I encountered an unexpected error. Please try again later.")
+
+def _handle_parsed_mention(tweet_id: str, author_id: str, topic: Optional[str], persona_id: Optional[str],
+                           error_message: Optional[str]):
+    """Validate a parsed mention, check the video limit and start the video job."""
+    # If parsing failed or no celebrity was identified, show celebrity list
+    if error_message or not persona_id:
+        logger.warning(f"Tweet parsing error or no celebrity identified for {tweet_id}: error='{error_message}', persona_id='{persona_id}'")
+        celebrity_list_error = _create_celebrity_list_error_message()
+        handle_request_error(tweet_id, celebrity_list_error)
+        return
+        
+    if not topic:
+        logger.warning(f"No topic identified for {tweet_id}: topic='{topic}'")
+        handle_request_error(tweet_id, "I couldn't identify a topic from your request. Please mention me with: explain [topic] by [celebrity name]")
+        return
+    
+    # Validate persona exists in our supported list
+    if persona_id not in personas_data:
+        logger.warning(f"Unsupported persona for {tweet_id}: persona_id='{persona_id}'")
+        celebrity_list_error = _create_celebrity_list_error_message()
+        handle_request_error(tweet_id, celebrity_list_error)
+        return
+    
+    # SECOND: Check video request limit (1/hour) - only for successful video requests
+    with _rate_limit_lock:
+        within_limit = _check_video_request_limit(author_id)
+        if within_limit:
+            _record_video_request(author_id)
+    if not within_limit:
+        logger.warning(f"User {author_id} exceeded video request limit for Tweet {tweet_id}")
+        handle_request_error(tweet_id, "You've already requested a video this hour. Please wait before requesting another video.")
+        return
+    logger.info(f"Recorded video request for user {author_id}")
+    
+    # Process the valid video request
+    persona_name = personas_data[persona_id].get('name', 'the selected celebrity')
+    logger.info(f"Valid request for Tweet {tweet_id}: Topic='{topic}', Persona='{persona_name}' ({persona_id})")
+    
+    process_video_request(tweet_id, author_id, topic, persona_id, persona_name)
 
 def process_video_request(tweet_id: str, author_id: str, topic: str, persona_id: str, persona_name: str):
     """
@@ -255,8 +317,7 @@ def process_video_request(tweet_id: str, author_id: str, topic: str, persona_id:
         try:
             # Get persona data and base video file
             persona_data = personas_data[persona_id]
-            base_video_path = Path(__file__).parent.parent / persona_data['video_path']
-            base_video_file = sieve.File(path=str(base_video_path))
+            base_video_file = persona_assets.get_registry().get_file(persona_assets.base_video_path(persona_data))
             
             # Push video generation job to Sieve (non-blocking)
             video_future = create_video_function.push(
@@ -265,15 +326,18 @@ def process_video_request(tweet_id: str, author_id: str, topic: str, persona_id:
                 query=topic
             )
             
-            # Store job info for tracking
-            pending_jobs[tweet_id] = {
+            # Store job info for tracking, and journal it so a restarted bot can re-attach
+            job_data = {
                 'future': video_future,
+                'sieve_job_id': job_journal.sieve_job_id(video_future),
                 'tweet_id': tweet_id,
                 'topic': topic,
                 'persona_name': persona_name,
                 'start_time': time.time(),
                 'author_id': author_id
             }
+            _track_job(tweet_id, job_data)
+            job_journal.safe_call(journal, "record_job", tweet_id, job_data)
             
             logger.info(f"Successfully queued video generation job for Tweet {tweet_id}")
             
@@ -292,60 +356,169 @@ def process_video_request(tweet_id: str, author_id: str, topic: str, persona_id:
         if not response:
             logger.error(f"❌ Also failed to post error message to Twitter for Tweet {tweet_id}")
 
-def check_completed_jobs():
-    """Check for completed video generation jobs and post results."""
-    # Clean up old rate limit data periodically
-    _cleanup_old_rate_limit_data()
-    
-    logger.info(f"📊 Currently tracking {len(pending_jobs)} pending video jobs")
-    
-    if not pending_jobs:
-        logger.info("📝 No pending jobs to check")
+def _track_job(tweet_id: str, job_data: dict):
+    """Register a pending job, its timeout deadline and a completion notification."""
+    with _pending_jobs_lock:
+        pending_jobs[tweet_id] = job_data
+        heapq.heappush(_job_deadlines, (job_data['start_time'] + MAX_JOB_TIME_SECONDS, tweet_id))
+    _notify_when_done(tweet_id, job_data['future'])
+
+def _notify_when_done(tweet_id: str, future):
+    """Put tweet_id on the ready queue as soon as its future finishes."""
+    add_done_callback = getattr(future, 'add_done_callback', None)
+    if callable(add_done_callback):
+        add_done_callback(lambda _: _ready_jobs.put(tweet_id))
         return
+
+    # Futures without callbacks get a waiter thread that blocks on the result
+    def wait_for_result():
+        try:
+            future.result()
+        except Exception:
+            pass  # Reported when the job is processed
+        _ready_jobs.put(tweet_id)
+
+    threading.Thread(target=wait_for_result, name=f"job-waiter-{tweet_id}", daemon=True).start()
+
+def _expire_timed_out_jobs() -> Optional[float]:
+    """
+    Drop jobs whose deadline has passed.
     
-    completed_jobs = []
+    Returns:
+        Seconds until the next deadline, or None if no job is pending
+    """
     current_time = time.time()
+    expired = []
+    with _pending_jobs_lock:
+        while _job_deadlines and _job_deadlines[0][0] <= current_time:
+            _, tweet_id = heapq.heappop(_job_deadlines)
+            # Entries of jobs that already finished are skipped lazily
+            if pending_jobs.pop(tweet_id, None) is not None:
+                expired.append(tweet_id)
+        next_deadline = _job_deadlines[0][0] if _job_deadlines else None
+    
+    for tweet_id in expired:
+        logger.warning(f"Job for Tweet {tweet_id} timed out after {MAX_JOB_TIME_SECONDS} seconds - staying silent")
+        job_journal.safe_call(journal, "set_job_status", tweet_id, "timed_out")
+    return None if next_deadline is None else max(0.0, next_deadline - current_time)
+
+def _finish_job(tweet_id: str, on_completed: Optional[Callable[[str, sieve.File, dict], None]]) -> bool:
+    """Hand a finished job's video on. Returns False if the job was no longer pending."""
+    with _pending_jobs_lock:
+        job_data = pending_jobs.pop(tweet_id, None)
+    if job_data is None:
+        return False  # Timed out before it finished
     
-    for tweet_id, job_data in pending_jobs.items():
-        future = job_data['future']
-        start_time = job_data['start_time']
-        elapsed_time = current_time - start_time
-        
-        logger.info(f"🔍 Job {tweet_id}: {elapsed_time:.1f}s elapsed, done={future.done()}")
-        
-        # Check for timeout
-        if current_time - start_time > MAX_JOB_TIME_SECONDS:
-            completed_jobs.append(tweet_id)
-            logger.warning(f"Job for Tweet {tweet_id} timed out after {MAX_JOB_TIME_SECONDS} seconds - staying silent")
+    try:
+        # Get the result
+        video_file = job_data['future'].result()
+        logger.info(f"🎉 Video generation completed for Tweet {tweet_id} after {time.time() - job_data['start_time']:.1f}s")
+    except Exception as e:
+        logger.error(f"Video generation failed for Tweet {tweet_id}: {e} - staying silent", exc_info=True)
+        job_journal.safe_call(journal, "set_job_status", tweet_id, "failed")
+        return True
+    
+    job_journal.safe_call(journal, "set_job_status", tweet_id, "completed")
+    if on_completed:
+        on_completed(tweet_id, video_file, job_data)
+    else:
+        post_completed_video(tweet_id, video_file, job_data)
+    return True
+
+def reattach_pending_jobs() -> int:
+    """
+    Resume tracking the Sieve jobs a previous bot process started but never posted.
+    
+    Jobs are re-attached by their Sieve job id and keep their original start time,
+    so the usual timeout still applies. Call once at startup, before the workers
+    start checking for completed jobs.
+    
+    Returns:
+        Number of jobs re-attached
+    """
+    if journal is None:
+        return 0
+    
+    reattached = 0
+    for row in job_journal.safe_call(journal, "outstanding_jobs", default=[]):
+        tweet_id = row['tweet_id']
+        with _pending_jobs_lock:
+            already_tracked = tweet_id in pending_jobs
+        if already_tracked:
+            continue
+        if not row.get('sieve_job_id'):
+            logger.warning(f"Job for Tweet {tweet_id} has no Sieve job id - cannot re-attach")
+            job_journal.safe_call(journal, "set_job_status", tweet_id, "orphaned")
             continue
         
-        # Check if job is done
-        if future.done():
-            completed_jobs.append(tweet_id)
-            
-            try:
-                # Get the result
-                video_file = future.result()
-                logger.info(f"🎉 Video generation completed for Tweet {tweet_id}")
-                _post_completed_video(tweet_id, video_file, job_data)
-                
-            except Exception as e:
-                logger.error(f"Video generation failed for Tweet {tweet_id}: {e} - staying silent", exc_info=True)
-    
-    # Clean up completed jobs
-    for tweet_id in completed_jobs:
-        del pending_jobs[tweet_id]
-    
-    if completed_jobs:
-        logger.info(f"✅ Processed {len(completed_jobs)} completed jobs. {len(pending_jobs)} jobs still pending.")
-    else:
-        logger.info(f"⏳ No completed jobs found. {len(pending_jobs)} jobs still pending.")
+        _track_job(tweet_id, {
+            'future': job_journal.RemoteSieveJob(row['sieve_job_id']),
+            'sieve_job_id': row['sieve_job_id'],
+            'tweet_id': tweet_id,
+            'topic': row['topic'],
+            'persona_name': row['persona_name'],
+            'start_time': row['start_time'],
+            'author_id': row['author_id']
+        })
+        reattached += 1
+    
+    if reattached:
+        logger.info(f"Re-attached {reattached} Sieve jobs from the job journal")
+    return reattached
+
+def check_completed_jobs(on_completed: Optional[Callable[[str, sieve.File, dict], None]] = None,
+                         timeout: float = 0.0) -> int:
+    """
+    Post results of finished video generation jobs and expire timed-out ones.
+    
+    Finished jobs arrive on a ready queue from their futures' completion callbacks,
+    so this never scans every pending job, and timeouts come off a deadline heap.
+    
+    Args:
+        on_completed: Optional callable(tweet_id, video_file, job_data) that takes over
+                      posting a finished video (e.g. by queueing it for an upload worker).
+                      By default the video is uploaded and posted inline.
+        timeout: Seconds to wait for a job to finish if none is ready yet (0 returns at once)
+        
+    Returns:
+        Number of finished jobs handled
+    """
+    global _last_rate_limit_cleanup
+    if time.time() - _last_rate_limit_cleanup > RATE_LIMIT_CLEANUP_INTERVAL_SECONDS:
+        _last_rate_limit_cleanup = time.time()
+        _cleanup_old_rate_limit_data()
+    
+    # Never sleep past the next timeout deadline
+    next_deadline_in = _expire_timed_out_jobs()
+    wait_seconds = timeout if next_deadline_in is None else min(timeout, next_deadline_in)
+    
+    try:
+        tweet_id = _ready_jobs.get(timeout=wait_seconds) if wait_seconds > 0 else _ready_jobs.get_nowait()
+    except queue.Empty:
+        return 0
+    
+    handled = 0
+    while True:
+        handled += _finish_job(tweet_id, on_completed)
+        try:
+            tweet_id = _ready_jobs.get_nowait()
+        except queue.Empty:
+            break
+    
+    if handled:
+        logger.info(f"✅ Processed {handled} completed jobs. {get_pending_jobs_count()} jobs still pending.")
+    return handled
 
-def _post_completed_video(tweet_id: str, video_file: sieve.File, job_data: dict):
+def post_completed_video(tweet_id: str, video_file: sieve.File, job_data: dict):
     """Upload video and post final reply."""
     topic = job_data['topic']
     persona_name = job_data['persona_name']
     
+    if job_journal.safe_call(journal, "has_reply", tweet_id, "video", default=False):
+        logger.info(f"Video reply for Tweet {tweet_id} was already posted - skipping")
+        job_journal.safe_call(journal, "set_job_status", tweet_id, "posted")
+        return
+    
     try:
         # Download video file locally using .path
         local_video_path = video_file.path
@@ -370,11 +543,20 @@ def _post_completed_video(tweet_id: str, video_file: sieve.File, job_data: dict)
         final_response = twitter_client.post_reply(tweet_id, final_message, media_id)
         if final_response:
             logger.info(f"Successfully posted video reply for Tweet {tweet_id}")
+            job_journal.safe_call(journal, "record_reply", tweet_id, "video", _reply_id(final_response))
+            job_journal.safe_call(journal, "set_job_status", tweet_id, "posted")
         else:
             logger.error(f"❌ Failed to post final video reply for Tweet {tweet_id}")
+            job_journal.safe_call(journal, "set_job_status", tweet_id, "failed")
             
     except Exception as e:
         logger.error(f"Error posting completed video for Tweet {tweet_id}: {e} - staying silent", exc_info=True)
+        job_journal.safe_call(journal, "set_job_status", tweet_id, "failed")
+
+def _reply_id(response) -> Optional[str]:
+    """Id of a posted reply from a Tweepy Response, if present."""
+    data = getattr(response, 'data', None)
+    return str(data.get('id')) if isinstance(data, dict) and data.get('id') else None
 
 def handle_request_error(tweet_id: str, error_message: str):
     """
@@ -384,6 +566,10 @@ def handle_request_error(tweet_id: str, error_message: str):
         tweet_id: Tweet ID to reply to
         error_message: Error message to post
     """
+    if job_journal.safe_call(journal, "has_reply", tweet_id, "error", default=False):
+        logger.info(f"Error reply for Tweet {tweet_id} was already posted - skipping")
+        return
+    
     try:
         # Make error message more helpful
         if "couldn't identify" in error_message.lower() or "couldn't understand" in error_message.lower():
@@ -396,6 +582,7 @@ def handle_request_error(tweet_id: str, error_message: str):
         
         if response:
             logger.info(f"Successfully posted error reply for Tweet {tweet_id}")
+            job_journal.safe_call(journal, "record_reply", tweet_id, "error", _reply_id(response))
         else:
             logger.error(f"❌ Twitter API returned None when posting reply for Tweet {tweet_id}")
             
@@ -415,14 +602,17 @@ def get_available_personas() -> list:
 
 def get_pending_jobs_count() -> int:
     """Get count of pending jobs for monitoring."""
-    return len(pending_jobs)
+    with _pending_jobs_lock:
+        return len(pending_jobs)
 
 def get_pending_jobs_info() -> list:
     """Get detailed info about pending jobs for monitoring."""
     current_time = time.time()
     jobs_info = []
+    with _pending_jobs_lock:
+        jobs = list(pending_jobs.items())
     
-    for tweet_id, job_data in pending_jobs.items():
+    for tweet_id, job_data in jobs:
         elapsed_time = current_time - job_data['start_time']
         jobs_info.append({
             'tweet_id': tweet_id,
@@ -439,14 +629,20 @@ def get_rate_limit_stats() -> dict:
     current_time = time.time()
     cutoff_time = current_time - RATE_LIMIT_WINDOW_SECONDS
     
+    with _rate_limit_lock:
+        histories = [
+            {"total_requests": list(h["total_requests"]), "video_requests": list(h["video_requests"])}
+            for h in user_request_history.values()
+        ]
+    
     stats = {
-        'total_tracked_users': len(user_request_history),
+        'total_tracked_users': len(histories),
         'users_with_recent_activity': 0,
         'total_recent_requests': 0,
         'total_recent_video_requests': 0
     }
     
-    for user_id, history in user_request_history.items():
+    for history in histories:
         recent_total = [ts for ts in history["total_requests"] if ts > cutoff_time]
         recent_video = [ts for ts in history["video_requests"] if ts > cutoff_time]
         
@@ -463,7 +659,12 @@ def get_user_rate_limit_status(user_id: str) -> dict:
     current_time = time.time()
     cutoff_time = current_time - RATE_LIMIT_WINDOW_SECONDS
     
-    if user_id not in user_request_history:
+    with _rate_limit_lock:
+        history = user_request_history.get(user_id)
+        if history:
+            history = {"total_requests": list(history["total_requests"]), "video_requests": list(history["video_requests"])}
+    
+    if not history:
         return {
             'user_id': user_id,
             'total_requests_used': 0,
@@ -474,7 +675,6 @@ def get_user_rate_limit_status(user_id: str) -> dict:
             'can_make_video_request': True
         }
     
-    history = user_request_history[user_id]
     recent_total = len([ts for ts in history["total_requests"] if ts > cutoff_time])
     recent_video = len([ts for ts in history["video_requests"] if ts > cutoff_time])
     
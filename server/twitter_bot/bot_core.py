@@ -13,6 +13,10 @@ if parent_dir not in sys.path:
 # Import our modules - since we're in twitter_bot directory, import directly
 import twitter_client
 import action_handler
+import request_parser
+import persona_assets
+from job_journal import JobJournal
+from workers import BotWorkers
 
 # Configure logging
 level_str = os.environ.get('LOG_LEVEL', 'INFO').upper()
@@ -20,6 +24,12 @@ level = logging.getLevelName(level_str)
 logging.basicConfig(level=level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Durable record of pending jobs, handled mentions and the mention checkpoint
+BOT_JOURNAL_PATH = os.environ.get(
+    'BOT_JOURNAL_PATH',
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'bot_journal.db')
+)
+
 class TwitterBot:
     """
     Main Twitter bot orchestrator that coordinates all components.
@@ -40,6 +50,8 @@ class TwitterBot:
         self.api_v2: Optional[twitter_client.tweepy.Client] = None
         self.is_running = False
         self.bot_username = None
+        self.workers: Optional[BotWorkers] = None
+        self.journal: Optional[JobJournal] = None
         
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -112,8 +124,9 @@ class TwitterBot:
     def _init_action_handler(self) -> bool:
         """Initialize the action handler with Sieve orchestrator"""
         try:
+            self.journal = self._open_journal()
             logger.info("Initializing action handler and Sieve orchestrator...")
-            action_handler.init_action_handler(self.personas_file_path)
+            action_handler.init_action_handler(self.personas_file_path, self.journal)
             logger.info("Action handler initialized successfully!")
             return True
             
@@ -121,6 +134,17 @@ class TwitterBot:
             logger.critical(f"Failed to initialize action handler: {e}")
             return False
             
+    def _open_journal(self) -> Optional[JobJournal]:
+        """Open the job journal; the bot still runs without one, but cannot resume after a restart."""
+        try:
+            journal = JobJournal(BOT_JOURNAL_PATH)
+            journal.compact()
+            logger.info(f"Job journal opened at {BOT_JOURNAL_PATH}")
+            return journal
+        except Exception as e:
+            logger.error(f"Failed to open job journal at {BOT_JOURNAL_PATH}: {e} - restarts will not resume pending work")
+            return None
+            
     def start(self):
         """
         Start the bot's main mention listening loop.
@@ -140,11 +164,27 @@ class TwitterBot:
         logger.info(f"Starting TwitterBot mention listener for @{bot_username}...")
         logger.info("Bot is now running and listening for mentions. Press Ctrl+C to stop.")
         
+        # Parsing, completion checks and uploads run on worker threads;
+        # this thread only polls for mentions and queues them
+        self.workers = BotWorkers(journal=self.journal)
+        self.workers.start()
+        
+        # Resume work from before a restart: re-attach running Sieve jobs and
+        # requeue mentions that were accepted but never handled
+        since_id = None
+        if self.journal:
+            action_handler.reattach_pending_jobs()
+            self.workers.replay_mentions(self.journal.unhandled_mentions())
+            since_id = self.journal.get_since_id()
+        
         try:
             # Start the mention listening loop - this blocks until shutdown
             twitter_client.listen_for_mentions(
-                callback_on_mention=action_handler.handle_mention,
-                test_mode=self.test_mode
+                callback_on_mention=self.workers.enqueue_mention,
+                test_mode=self.test_mode,
+                check_jobs=False,
+                since_id=since_id,
+                on_since_id=self.journal.save_since_id if self.journal else None
             )
             
         except KeyboardInterrupt:
@@ -155,6 +195,10 @@ class TwitterBot:
         except Exception as e:
             logger.critical(f"Twitter mention listener failed: {e}")
             self.shutdown()
+        finally:
+            # Intake has stopped: finish queued mentions and uploads before returning
+            self.workers.drain()
+            self.is_running = False
             
     def shutdown(self):
         """Gracefully shutdown the bot"""
@@ -164,13 +208,11 @@ class TwitterBot:
         logger.info("Shutting down TwitterBot...")
         self.is_running = False
         
-        # Request shutdown of the mention listening loop
+        # Request shutdown of the mention listening loop; start() then drains
+        # the worker queues once intake has stopped
         twitter_client.request_shutdown()
         
-        # Currently, we don't have background threads to clean up
-        # In future phases with worker threads, we'd clean them up here
-        
-        logger.info("TwitterBot shutdown complete.")
+        logger.info("TwitterBot shutdown requested, draining workers...")
         
     def get_status(self) -> dict:
         """
@@ -187,8 +229,13 @@ class TwitterBot:
             "action_handler_initialized": action_handler.personas_data is not None,
             "available_personas": action_handler.get_available_personas(),
             "pending_jobs_count": action_handler.get_pending_jobs_count(),
+            "fast_path": request_parser.get_fast_path_stats(),
+            "persona_assets": persona_assets.get_registry().stats(),
         }
         
+        if self.workers:
+            status["workers"] = self.workers.get_status()
+        
         # Add detailed job info if there are pending jobs
         if action_handler.get_pending_jobs_count() > 0:
             status["pending_jobs"] = action_handler.get_pending_jobs_info()
@@ -0,0 +1,186 @@
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Fast-path results at or above this confidence skip the LLM; tune it with
+# evaluate_fast_path (or tools/evaluate_fast_parser.py) against labelled tweets
+FAST_PARSE_CONFIDENCE_THRESHOLD = float(os.getenv("FAST_PARSE_CONFIDENCE_THRESHOLD", 0.85))
+FAST_PARSE_ENABLED = os.getenv("FAST_PARSE_ENABLED", "true").lower() == "true"
+
+# A persona must beat the runner-up by this much, or its confidence is reduced
+MIN_PERSONA_MARGIN = 0.1
+# Single-word aliases ("trump", "kanye") are slightly less trustworthy than full names
+SINGLE_WORD_ALIAS_WEIGHT = 0.95
+MAX_TOPIC_LENGTH = 200
+
+# The documented request shape: "@spewbot explain [topic] by [celebrity]". The topic
+# is greedy so the last "by"/"as"/"like" separates it from the celebrity.
+_REQUEST_PATTERN = re.compile(
+    r"^(?:please\s+)?(?:(?:can|could|would)\s+you\s+)?"
+    r"(?:explain|describe|break\s+down|teach(?:\s+me)?|tell\s+me\s+about)\s+"
+    r"(?:to\s+me\s+|me\s+)?"
+    r"(?P<topic>.+)\s+(?:by|as|like|in\s+the\s+style\s+of)\s+(?P<persona>.+?)\s*$",
+    re.IGNORECASE,
+)
+_LEADING_MENTIONS = re.compile(r"^(?:@\w+\s*)+")
+_URLS = re.compile(r"https?://\S+")
+_TRAILING_FILLER = re.compile(r"(?:\s+(?:please|pls|plz|thanks|thx|ty)|\s*#\w+)+$", re.IGNORECASE)
+
+def normalize_name(text: str) -> str:
+    """Lowercase, accent-free words separated by single spaces ("Leonardo_DiCaprio!" -> "leonardo dicaprio")."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+@dataclass
+class FastParseResult:
+    """Outcome of the deterministic parser; persona_id and topic are None when the grammar did not match."""
+    topic: Optional[str]
+    persona_id: Optional[str]
+    confidence: float
+
+class FastPathParser:
+    """
+    Deterministic parser for mentions that follow the documented request shape.
+
+    Matches the request grammar with a regular expression, then fuzzy-matches the
+    celebrity against persona ids, names and unambiguous single-word aliases, so
+    typos like "steve jbos" still resolve. The confidence is the persona match
+    score, reduced when a second persona scores almost as well.
+    """
+
+    def __init__(self, personas: Iterable[dict]):
+        """
+        Build the persona alias index.
+
+        Args:
+            personas: Persona entries (with "id" and "name") from personas.json
+        """
+        self._aliases: List[Tuple[str, str, float]] = []  # (alias, persona_id, weight)
+        word_owners: Dict[str, set] = {}
+        for persona in personas:
+            persona_id = persona.get("id")
+            if not persona_id:
+                continue
+            full_names = {normalize_name(persona_id), normalize_name(persona.get("name", ""))} - {""}
+            for alias in full_names:
+                self._aliases.append((alias, persona_id, 1.0))
+                for word in alias.split():
+                    word_owners.setdefault(word, set()).add(persona_id)
+
+        # Single words of a name are aliases only if they belong to one persona and are not too short
+        for word, owners in word_owners.items():
+            if len(owners) == 1 and len(word) >= 4:
+                self._aliases.append((word, next(iter(owners)), SINGLE_WORD_ALIAS_WEIGHT))
+
+    def match_persona(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Best persona for a celebrity name as written in a tweet.
+
+        Returns:
+            tuple: (persona_id, confidence), (None, 0.0) if nothing resembles a persona
+        """
+        candidate = normalize_name(text)
+        if not candidate:
+            return None, 0.0
+
+        best: Dict[str, float] = {}
+        for alias, persona_id, weight in self._aliases:
+            score = 1.0 if alias == candidate else SequenceMatcher(None, candidate, alias).ratio()
+            best[persona_id] = max(best.get(persona_id, 0.0), score * weight)
+        if not best:
+            return None, 0.0
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        persona_id, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        margin = score - runner_up
+        if margin < MIN_PERSONA_MARGIN:
+            score -= MIN_PERSONA_MARGIN - margin
+        return persona_id, max(0.0, score)
+
+    def parse(self, tweet_text: str) -> FastParseResult:
+        """Parse a mention; a result with confidence 0.0 means the grammar did not match."""
+        text = _URLS.sub(" ", tweet_text or "")
+        text = _LEADING_MENTIONS.sub("", " ".join(text.split()))
+        text = text.strip().rstrip(".!?")
+
+        match = _REQUEST_PATTERN.match(text)
+        if not match:
+            return FastParseResult(None, None, 0.0)
+
+        topic = match.group("topic").strip(" \"'“”‘’:,-")
+        persona_text = _TRAILING_FILLER.sub("", match.group("persona")).strip(" \"'“”‘’.,!?")
+        if not topic or len(topic) > MAX_TOPIC_LENGTH or "@" in topic:
+            return FastParseResult(None, None, 0.0)
+
+        persona_id, confidence = self.match_persona(persona_text)
+        if not persona_id:
+            return FastParseResult(topic, None, 0.0)
+        return FastParseResult(topic, persona_id, round(confidence, 3))
+
+class FastPathStats:
+    """Thread-safe counters of how many mentions the fast path answered without the LLM."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.hits = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            self.attempts += 1
+            self.hits += int(hit)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts, hits = self.attempts, self.hits
+        return {
+            "attempts": attempts,
+            "hits": hits,
+            "hit_rate": round(hits / attempts, 3) if attempts else 0.0,
+            "confidence_threshold": FAST_PARSE_CONFIDENCE_THRESHOLD,
+        }
+
+def _topics_agree(predicted: str, expected: str) -> bool:
+    return SequenceMatcher(None, normalize_name(predicted), normalize_name(expected)).ratio() >= 0.8
+
+def evaluate_fast_path(corpus: Sequence[dict], personas: Iterable[dict],
+                       thresholds: Sequence[float] = (0.7, 0.75, 0.8, 0.85, 0.9, 0.95)) -> List[dict]:
+    """
+    Measure fast-path hit rate and precision at several confidence thresholds.
+
+    Args:
+        corpus: Labelled tweets: {"text", "persona_id", optional "topic"}. persona_id is
+                None for tweets that should not resolve to a persona.
+        personas: Persona entries from personas.json
+        thresholds: Confidence thresholds to evaluate
+
+    Returns:
+        list: One {"threshold", "hit_rate", "precision", "hits", "errors"} per threshold,
+              where a hit is correct if its persona (and labelled topic, if any) matches
+    """
+    parser = FastPathParser(personas)
+    parsed = [(example, parser.parse(example.get("text", ""))) for example in corpus]
+
+    report = []
+    for threshold in thresholds:
+        hits = errors = 0
+        for example, result in parsed:
+            if not result.persona_id or result.confidence < threshold:
+                continue
+            hits += 1
+            expected_topic = example.get("topic")
+            if result.persona_id != example.get("persona_id") or (expected_topic and not _topics_agree(result.topic, expected_topic)):
+                errors += 1
+        report.append({
+            "threshold": threshold,
+            "hit_rate": round(hits / len(parsed), 3) if parsed else 0.0,
+            "precision": round((hits - errors) / hits, 3) if hits else 1.0,
+            "hits": hits,
+            "errors": errors,
+        })
+    return report
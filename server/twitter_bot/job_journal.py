@@ -0,0 +1,256 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SIEVE_JOBS_API_URL = os.getenv("SIEVE_JOBS_API_URL", "https://mango.sievedata.com/v2/jobs")
+REATTACH_POLL_INTERVAL_SECONDS = float(os.getenv("BOT_REATTACH_POLL_INTERVAL_SECONDS", 15))
+
+# Journal rows of finished work are kept this long, then compacted away
+JOURNAL_RETENTION_SECONDS = float(os.getenv("BOT_JOURNAL_RETENTION_DAYS", 7)) * 86400
+
+# Jobs in these states still owe the user a reply and are re-attached on startup
+OUTSTANDING_JOB_STATUSES = ("pending", "completed")
+
+def sieve_job_id(future) -> Optional[str]:
+    """Best-effort id of the Sieve job behind a future returned by push()."""
+    job = getattr(future, "job", None)
+    if isinstance(job, dict):
+        return job.get("id")
+    return getattr(job, "id", None) or getattr(future, "job_id", None)
+
+class JobJournal:
+    """
+    Durable journal of the bot's in-flight work.
+
+    Records the mentions the bot has accepted, the Sieve job started for each
+    video request, the replies already posted and the mention polling
+    checkpoint (since_id), so a restarted bot can pick up where it left off
+    without replying twice. Backed by SQLite in WAL mode; rows of finished work
+    are removed by compact().
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the journal.
+
+        Args:
+            db_path: Path of the SQLite database file (created if missing)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS checkpoint (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS mentions (
+                tweet_id TEXT PRIMARY KEY,
+                author_id TEXT,
+                text TEXT,
+                status TEXT NOT NULL,
+                received_at REAL NOT NULL,
+                handled_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                tweet_id TEXT PRIMARY KEY,
+                sieve_job_id TEXT,
+                author_id TEXT,
+                topic TEXT,
+                persona_name TEXT,
+                start_time REAL NOT NULL,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS replies (
+                tweet_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                reply_tweet_id TEXT,
+                posted_at REAL NOT NULL,
+                PRIMARY KEY (tweet_id, kind)
+            );
+            CREATE INDEX IF NOT EXISTS idx_mentions_status ON mentions (status);
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+        """)
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+            return rows
+
+    # Mention polling checkpoint
+
+    def get_since_id(self) -> Optional[int]:
+        """Saved mention checkpoint as an int, like the tweet ids it is compared with."""
+        rows = self._execute("SELECT value FROM checkpoint WHERE key = 'since_id'")
+        return int(rows[0]["value"]) if rows else None
+
+    def save_since_id(self, since_id):
+        if since_id:
+            self._execute("INSERT OR REPLACE INTO checkpoint (key, value) VALUES ('since_id', ?)", (str(since_id),))
+
+    # Mentions
+
+    def record_mention(self, tweet) -> bool:
+        """
+        Record an accepted mention.
+
+        Returns:
+            False if the mention was already handled (it must not be processed again)
+        """
+        tweet_id = str(tweet.id)
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM mentions WHERE tweet_id = ?", (tweet_id,)).fetchone()
+            if row and row["status"] == "handled":
+                return False
+            if not row:
+                self._conn.execute(
+                    "INSERT INTO mentions (tweet_id, author_id, text, status, received_at) VALUES (?, ?, ?, 'received', ?)",
+                    (tweet_id, str(getattr(tweet, "author_id", "")), getattr(tweet, "text", ""), time.time())
+                )
+                self._conn.commit()
+            return True
+
+    def mark_mention_handled(self, tweet_id):
+        self._execute("UPDATE mentions SET status = 'handled', handled_at = ? WHERE tweet_id = ?", (time.time(), str(tweet_id)))
+
+    def unhandled_mentions(self) -> List[SimpleNamespace]:
+        """Mentions accepted before a restart but never handled, oldest first, as tweet-like objects."""
+        rows = self._execute("SELECT tweet_id, author_id, text FROM mentions WHERE status = 'received' ORDER BY received_at")
+        return [SimpleNamespace(id=int(row["tweet_id"]), author_id=row["author_id"], text=row["text"]) for row in rows]
+
+    # Jobs
+
+    def record_job(self, tweet_id: str, job_data: dict):
+        self._execute(
+            "INSERT OR REPLACE INTO jobs (tweet_id, sieve_job_id, author_id, topic, persona_name, start_time, status, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, 'pending', ?)",
+            (tweet_id, job_data.get("sieve_job_id"), job_data.get("author_id"), job_data.get("topic"),
+             job_data.get("persona_name"), job_data["start_time"], time.time())
+        )
+
+    def set_job_status(self, tweet_id: str, status: str):
+        self._execute("UPDATE jobs SET status = ?, updated_at = ? WHERE tweet_id = ?", (status, time.time(), tweet_id))
+
+    def outstanding_jobs(self) -> List[dict]:
+        """Jobs that were started (or finished) but whose video was never posted."""
+        placeholders = ", ".join("?" for _ in OUTSTANDING_JOB_STATUSES)
+        rows = self._execute(f"SELECT * FROM jobs WHERE status IN ({placeholders}) ORDER BY start_time", OUTSTANDING_JOB_STATUSES)
+        return [dict(row) for row in rows]
+
+    # Replies
+
+    def has_reply(self, tweet_id: str, kind: str) -> bool:
+        return bool(self._execute("SELECT 1 FROM replies WHERE tweet_id = ? AND kind = ?", (tweet_id, kind)))
+
+    def record_reply(self, tweet_id: str, kind: str, reply_tweet_id: Optional[str] = None):
+        self._execute(
+            "INSERT OR REPLACE INTO replies (tweet_id, kind, reply_tweet_id, posted_at) VALUES (?, ?, ?, ?)",
+            (tweet_id, kind, reply_tweet_id, time.time())
+        )
+
+    def compact(self, retention_seconds: float = JOURNAL_RETENTION_SECONDS) -> int:
+        """
+        Delete finished work older than the retention period and reclaim space.
+
+        Returns:
+            int: Number of rows removed
+        """
+        cutoff = time.time() - retention_seconds
+        placeholders = ", ".join("?" for _ in OUTSTANDING_JOB_STATUSES)
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM mentions WHERE status = 'handled' AND handled_at < ?", (cutoff,)).rowcount
+            removed += self._conn.execute(
+                f"DELETE FROM jobs WHERE status NOT IN ({placeholders}) AND updated_at < ?", (*OUTSTANDING_JOB_STATUSES, cutoff)
+            ).rowcount
+            removed += self._conn.execute("DELETE FROM replies WHERE posted_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+            if removed:
+                self._conn.execute("VACUUM")
+        logger.info(f"Journal compacted: removed {removed} finished entries")
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class RemoteSieveJob:
+    """
+    Future-like handle on a Sieve job started by an earlier bot process.
+
+    Polls the Sieve jobs API until the job finishes; result() returns the job's
+    output video as a sieve.File.
+    """
+
+    def __init__(self, job_id: str, api_key: Optional[str] = None, poll_interval: float = REATTACH_POLL_INTERVAL_SECONDS):
+        self.job_id = job_id
+        self.api_key = api_key or os.getenv("SIEVE_API_KEY")
+        self.poll_interval = poll_interval
+        self._status: Optional[dict] = None
+
+    def _fetch(self) -> dict:
+        import requests
+
+        response = requests.get(f"{SIEVE_JOBS_API_URL}/{self.job_id}", headers={"X-API-Key": self.api_key or ""}, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        return data if isinstance(data, dict) else {}
+
+    def done(self) -> bool:
+        if self._status is None or str(self._status.get("status", "")).lower() not in ("finished", "error", "cancelled"):
+            try:
+                self._status = self._fetch()
+            except Exception as e:
+                logger.warning(f"Could not fetch status of Sieve job {self.job_id}: {e}")
+                return False
+        return str(self._status.get("status", "")).lower() in ("finished", "error", "cancelled")
+
+    def result(self):
+        while not self.done():
+            time.sleep(self.poll_interval)
+
+        status = str(self._status.get("status", "")).lower()
+        if status != "finished":
+            raise RuntimeError(f"Sieve job {self.job_id} ended with status '{status}': {self._status.get('error')}")
+
+        url = _find_output_url(self._status.get("outputs"))
+        if not url:
+            raise RuntimeError(f"Sieve job {self.job_id} finished without a file output")
+        import sieve
+        return sieve.File(url=url)
+
+def _find_output_url(value: Any) -> Optional[str]:
+    """First http(s) URL stored under a "url" key anywhere in a job's outputs."""
+    if isinstance(value, dict):
+        url = value.get("url")
+        if isinstance(url, str) and url.startswith("http"):
+            return url
+        value = list(value.values())
+    if isinstance(value, list):
+        for item in value:
+            url = _find_output_url(item)
+            if url:
+                return url
+    return None
+
+def safe_call(journal: Optional[JobJournal], method: str, *args, default=None):
+    """Call a journal method, logging instead of raising; the bot keeps working without its journal."""
+    if journal is None:
+        return default
+    try:
+        return getattr(journal, method)(*args)
+    except Exception as e:
+        logger.error(f"Job journal {method} failed: {e}")
+        return default
@@ -1,6 +1,7 @@
 import os
 import json
 import logging
+from functools import lru_cache
 from typing import Optional, Tuple, List, Dict
 from pydantic import BaseModel
 from dotenv import load_dotenv
@@ -11,10 +12,17 @@ load_dotenv()
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from sieve_functions.utils.llm import call_llm
+from fast_parser import FastPathParser, FastPathStats, FAST_PARSE_CONFIDENCE_THRESHOLD, FAST_PARSE_ENABLED
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Batched parsing: tweets per structured call are bounded by an estimated token
+# budget (about 4 characters per token) as well as a hard count
+BATCH_PARSE_TOKEN_BUDGET = int(os.getenv("BATCH_PARSE_TOKEN_BUDGET", 3000))
+BATCH_PARSE_MAX_TWEETS = int(os.getenv("BATCH_PARSE_MAX_TWEETS", 25))
+BATCH_PARSE_TOKENS_PER_TWEET_OVERHEAD = 40  # id, quoting and the extracted fields in the response
+
 class TweetExtract(BaseModel):
     """
     Pydantic model for structured LLM output.
@@ -53,6 +61,81 @@ class PersonaInfo:
         """Find persona ID by exact persona ID match (case-insensitive)."""
         identifier_lower = persona_id.strip().lower()
         return self._id_lookup.get(identifier_lower)
+    
+    def fast_parser(self) -> FastPathParser:
+        """Deterministic parser over these personas (shared by every PersonaInfo with the same personas)."""
+        key = tuple((persona.get("id", ""), persona.get("name", "")) for persona in self.personas_data.get("personas", []))
+        return _fast_path_parser(key)
+
+@lru_cache(maxsize=8)
+def _fast_path_parser(personas_key: Tuple[Tuple[str, str], ...]) -> FastPathParser:
+    return FastPathParser({"id": persona_id, "name": name} for persona_id, name in personas_key)
+
+_fast_path_stats = FastPathStats()
+
+def get_fast_path_stats() -> dict:
+    """Fast-path attempts, hits and hit rate since startup, for monitoring."""
+    return _fast_path_stats.snapshot()
+
+def _fast_parse(tweet_text: str, persona_info: PersonaInfo) -> Optional[Tuple[str, str, None]]:
+    """(topic, persona_id, None) if the deterministic parser is confident enough, else None."""
+    if not FAST_PARSE_ENABLED:
+        return None
+    result = persona_info.fast_parser().parse(tweet_text)
+    hit = result.persona_id is not None and result.confidence >= FAST_PARSE_CONFIDENCE_THRESHOLD
+    _fast_path_stats.record(hit)
+    if not hit:
+        return None
+    logger.info(f"Fast path parsed: Topic='{result.topic}', Persona ID='{result.persona_id}' (confidence {result.confidence})")
+    return result.topic, result.persona_id, None
+
+class TweetBatchItem(TweetExtract):
+    """One tweet's extraction within a batched call, keyed by the tweet id it was given."""
+    tweet_id: str
+
+class TweetBatchExtract(BaseModel):
+    """Pydantic model for structured LLM output covering several tweets."""
+    results: List[TweetBatchItem]
+
+def _system_prompt(supported_persona_ids: List[str]) -> str:
+    """System prompt for extracting topic and persona ID from a tweet."""
+    return f"""You are an expert tweet analyst.
+            Your task is to identify two key pieces of information from a user's tweet:
+            1. The main **topic** or question the user wants explained.
+            2. The **persona_id** that the user wants to use for the explanation.
+
+            Supported persona IDs include: {', '.join(supported_persona_ids)}
+
+            If the user doesn't explicitly mention a persona ID, or if the persona ID is not clearly identifiable, return null for `persona_id`.
+            The topic should be a concise summary of what needs to be explained.
+            The persona_id should be extracted exactly as mentioned in the tweet.
+            Do not infer a persona_id if not mentioned, but adjust for spelling mistakes and other variations."""
+
+def _resolve_extract(extracted_data: TweetExtract, persona_info: PersonaInfo) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Validate an LLM extraction and match its persona ID; returns (topic, persona_id, error_message)."""
+    topic = extracted_data.topic
+    persona_id = extracted_data.persona_id
+
+    logger.info(f"LLM extracted: Topic='{topic}', Persona ID='{persona_id}'")
+
+    # Validate topic extraction
+    if not topic or not topic.strip():
+        return None, None, "Error: Could not determine the topic from the tweet."
+
+    # Handle missing persona ID
+    if not persona_id or not persona_id.strip():
+        return topic, None, "No persona ID mentioned or identified in the tweet."
+
+    # Match persona ID to persona
+    matched_persona_id = persona_info.find_persona_id(persona_id)
+    
+    if not matched_persona_id:
+        supported_list = ', '.join(persona_info.get_supported_persona_ids())
+        logger.warning(f"Persona ID '{persona_id}' not found in personas data.")
+        return topic, None, f"Error: Persona ID '{persona_id}' is not supported. Supported persona IDs: {supported_list}"
+
+    logger.info(f"Successfully matched persona ID '{persona_id}' to persona ID: '{matched_persona_id}'")
+    return topic, matched_persona_id, None
 
 def parse_tweet(tweet_text: str, personas_data: dict) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
@@ -78,31 +161,25 @@ def parse_tweet(tweet_text: str, personas_data: dict) -> Tuple[Optional[str], Op
 
     # Initialize persona helper
     persona_info = PersonaInfo(personas_data)
-    supported_persona_ids = persona_info.get_supported_persona_ids()
     
+    # Well-formed requests are answered locally without an LLM round trip
+    fast_result = _fast_parse(tweet_text, persona_info)
+    if fast_result:
+        return fast_result
+    return _parse_with_llm(tweet_text, persona_info)
+
+def _parse_with_llm(tweet_text: str, persona_info: PersonaInfo) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Parse one tweet with a structured LLM call; returns (topic, persona_id, error_message)."""
     try:
         logger.info(f"Parsing tweet: \"{tweet_text}\"")
         
-        # Create system prompt with supported persona IDs for better extraction
-        system_prompt = f"""You are an expert tweet analyst.
-            Your task is to identify two key pieces of information from a user's tweet:
-            1. The main **topic** or question the user wants explained.
-            2. The **persona_id** that the user wants to use for the explanation.
-
-            Supported persona IDs include: {', '.join(supported_persona_ids)}
-
-            If the user doesn't explicitly mention a persona ID, or if the persona ID is not clearly identifiable, return null for `persona_id`.
-            The topic should be a concise summary of what needs to be explained.
-            The persona_id should be extracted exactly as mentioned in the tweet.
-            Do not infer a persona_id if not mentioned, but adjust for spelling mistakes and other variations."""
-
         user_prompt = f"Here's the tweet: \"{tweet_text}\""
 
         # Use the existing LLM utility with structured output
         extracted_data = call_llm(
             provider="gpt",
             prompt=user_prompt,
-            system_prompt=system_prompt,
+            system_prompt=_system_prompt(persona_info.get_supported_persona_ids()),
             response_model=TweetExtract
         )
 
@@ -110,33 +187,131 @@ def parse_tweet(tweet_text: str, personas_data: dict) -> Tuple[Optional[str], Op
             logger.error("LLM parsing failed to return expected TweetExtract structure.")
             return None, None, "Error: Could not parse tweet structure from LLM."
 
-        topic = extracted_data.topic
-        persona_id = extracted_data.persona_id
+        return _resolve_extract(extracted_data, persona_info)
 
-        logger.info(f"LLM extracted: Topic='{topic}', Persona ID='{persona_id}'")
+    except Exception as e:
+        logger.error(f"Error during tweet parsing or LLM call: {e}")
+        return None, None, f"An unexpected error occurred: {str(e)}"
 
-        # Validate topic extraction
-        if not topic or not topic.strip():
-            return None, None, "Error: Could not determine the topic from the tweet."
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + BATCH_PARSE_TOKENS_PER_TWEET_OVERHEAD
 
-        # Handle missing persona ID
-        if not persona_id or not persona_id.strip():
-            return topic, None, "No persona ID mentioned or identified in the tweet."
+def _chunk_by_token_budget(tweets: List[Tuple[str, str]], token_budget: int = BATCH_PARSE_TOKEN_BUDGET,
+                           max_tweets: int = BATCH_PARSE_MAX_TWEETS) -> List[List[Tuple[str, str]]]:
+    """Split (tweet_id, text) pairs into consecutive chunks that fit the token budget and count limit."""
+    chunks, current, current_tokens = [], [], 0
+    for tweet_id, text in tweets:
+        tokens = _estimate_tokens(text)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_tweets):
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append((tweet_id, text))
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
 
-        # Match persona ID to persona
-        matched_persona_id = persona_info.find_persona_id(persona_id)
-        
-        if not matched_persona_id:
-            supported_list = ', '.join(supported_persona_ids)
-            logger.warning(f"Persona ID '{persona_id}' not found in personas data.")
-            return topic, None, f"Error: Persona ID '{persona_id}' is not supported. Supported persona IDs: {supported_list}"
+def _parse_chunk(chunk: List[Tuple[str, str]], persona_info: PersonaInfo) -> Dict[str, TweetExtract]:
+    """
+    Extract several tweets with one structured LLM call.
 
-        logger.info(f"Successfully matched persona ID '{persona_id}' to persona ID: '{matched_persona_id}'")
-        return topic, matched_persona_id, None
+    Returns:
+        Extractions keyed by tweet id, only for ids the response returned exactly once
+        and that were asked for; callers re-parse the rest individually.
+    """
+    tweets_block = "\n".join(json.dumps({"tweet_id": tweet_id, "text": text}, ensure_ascii=False) for tweet_id, text in chunk)
+    user_prompt = (
+        f"Here are {len(chunk)} tweets, one JSON object per line. Analyze each tweet independently "
+        f"and return exactly one result per tweet, copying its tweet_id unchanged:\n{tweets_block}"
+    )
 
-    except Exception as e:
-        logger.error(f"Error during tweet parsing or LLM call: {e}")
-        return None, None, f"An unexpected error occurred: {str(e)}"
+    extracted_data = call_llm(
+        provider="gpt",
+        prompt=user_prompt,
+        system_prompt=_system_prompt(persona_info.get_supported_persona_ids()),
+        response_model=TweetBatchExtract
+    )
+    if not isinstance(extracted_data, TweetBatchExtract):
+        raise ValueError("LLM parsing failed to return expected TweetBatchExtract structure.")
+
+    requested_ids = {tweet_id for tweet_id, _ in chunk}
+    results: Dict[str, TweetExtract] = {}
+    duplicates = set()
+    for item in extracted_data.results:
+        if item.tweet_id not in requested_ids:
+            logger.warning(f"Batched parse returned unknown tweet id '{item.tweet_id}'")
+        elif item.tweet_id in results:
+            duplicates.add(item.tweet_id)
+        else:
+            results[item.tweet_id] = TweetExtract(topic=item.topic, persona_id=item.persona_id)
+    for tweet_id in duplicates:
+        del results[tweet_id]  # Ambiguous; trust neither answer
+    return results
+
+def parse_tweets_batch(tweets: Dict[str, str], personas_data: dict) -> Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]]:
+    """
+    Parse many tweets with as few LLM calls as possible.
+
+    Well-formed requests are resolved by the fast path first. The rest are sent in
+    chunks sized by an estimated token budget, one structured call per chunk. Any
+    tweet the batched response misses, duplicates or that fails validation (and
+    every tweet of a chunk whose call fails) is parsed again on its own, so each
+    tweet gets the same answer shape as parse_tweet.
+
+    Args:
+        tweets: Tweet text keyed by tweet id, in the order they should be handled.
+        personas_data: Loaded personas data (from personas.json).
+
+    Returns:
+        A dict mapping every given tweet id to (topic, persona_id, error_message),
+        as returned by parse_tweet.
+    """
+    if not tweets:
+        return {}
+    if not personas_data or "personas" not in personas_data:
+        return {tweet_id: (None, None, "Personas data is invalid or missing.") for tweet_id in tweets}
+
+    persona_info = PersonaInfo(personas_data)
+    results: Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+    pending = []
+    for tweet_id, text in tweets.items():
+        if not text or not text.strip():
+            results[tweet_id] = (None, None, "Tweet text is empty.")
+            continue
+        fast_result = _fast_parse(text, persona_info)
+        if fast_result:
+            results[tweet_id] = fast_result
+        else:
+            pending.append((tweet_id, text))
+
+    if len(pending) == 1:
+        tweet_id, text = pending[0]
+        results[tweet_id] = _parse_with_llm(text, persona_info)
+    if len(pending) <= 1:
+        return {tweet_id: results[tweet_id] for tweet_id in tweets}
+
+    fallback = []
+    chunks = _chunk_by_token_budget(pending)
+    logger.info(f"Parsing {len(pending)} tweets in {len(chunks)} batched LLM call(s)")
+    for chunk in chunks:
+        try:
+            extracted = _parse_chunk(chunk, persona_info)
+        except Exception as e:
+            logger.error(f"Batched tweet parsing failed for {len(chunk)} tweets, parsing individually: {e}")
+            extracted = {}
+
+        for tweet_id, text in chunk:
+            if tweet_id in extracted:
+                results[tweet_id] = _resolve_extract(extracted[tweet_id], persona_info)
+            else:
+                fallback.append((tweet_id, text))
+
+    if fallback:
+        logger.warning(f"Falling back to per-tweet parsing for {len(fallback)} tweets")
+    for tweet_id, text in fallback:
+        results[tweet_id] = _parse_with_llm(text, persona_info)
+
+    return {tweet_id: results[tweet_id] for tweet_id in tweets}
 
 def load_personas_data(data_dir: str = "data") -> dict:
     """
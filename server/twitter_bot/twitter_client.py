@@ -15,6 +15,11 @@ logger = logging.getLogger(__name__)
 # Global variables for mention listening
 MENTIONS_POLLING_INTERVAL_SECONDS = int(os.getenv("MENTIONS_POLLING_INTERVAL_SECONDS", 30))
 TWITTER_BOT_USERNAME = os.getenv("TWITTER_BOT_USERNAME")
+DEFAULT_MAX_RESULTS = 25
+RESUME_MAX_RESULTS = 100  # API maximum; used for the first fetch after resuming from a checkpoint
+# A fetch with a checkpoint follows next_token until it reaches the checkpoint; the
+# mentions timeline only reaches back 800 tweets, so more pages would be empty anyway
+MAX_MENTION_PAGES = 8
 
 # Global API client objects (will be set by init_client)
 api_v1: Optional[tweepy.API] = None
@@ -23,6 +28,13 @@ api_v2: Optional[tweepy.Client] = None
 # Global shutdown flag for graceful shutdown
 _shutdown_requested = False
 
+class MentionBackpressure(Exception):
+    """Raised by a mention callback that cannot accept more work right now.
+
+    The polling loop stops processing the current batch and keeps since_id at the
+    last accepted mention, so the rest are fetched again on the next cycle.
+    """
+
 def request_shutdown():
     """Request shutdown of the mention listening loop."""
     global _shutdown_requested
@@ -163,10 +175,20 @@ def _init_v2_client(api_key: str, api_key_secret: str, access_token: str, access
 # MENTION LISTENING 
 # ============================================
 
-def listen_for_mentions(callback_on_mention: Callable, test_mode: bool = False):
+def listen_for_mentions(callback_on_mention: Callable, test_mode: bool = False, check_jobs: bool = True,
+                        since_id: Optional[str] = None, on_since_id: Optional[Callable[[str], None]] = None):
     """
     Periodically polls for new mentions to the bot's authenticated user using Twitter API v2.
-    Also checks for completed video generation jobs.
+    Also checks for completed video generation jobs, unless check_jobs is False
+    (when a separate completion worker does that).
+    
+    Args:
+        callback_on_mention: Called with each new mention
+        test_mode: Wait for Enter between cycles instead of sleeping
+        check_jobs: Also post completed video jobs from the polling loop
+        since_id: Checkpoint to resume from; mentions newer than it are replayed.
+                  Without one, polling starts from the latest existing mention.
+        on_since_id: Called with the new since_id whenever it advances (to persist it)
     """
     if not api_v2:
         raise RuntimeError("Twitter API v2 client must be initialized before listening for mentions.")
@@ -176,7 +198,13 @@ def listen_for_mentions(callback_on_mention: Callable, test_mode: bool = False):
 
     # Initialize mention listener
     bot_user_id, bot_username = _initialize_mention_listener()
-    last_processed_mention_id = get_baseline_mention_id(api_v2)
+    if since_id:
+        logger.info(f"Resuming from mention checkpoint {since_id}; replaying mentions received since")
+        last_processed_mention_id = since_id
+        max_results = RESUME_MAX_RESULTS
+    else:
+        last_processed_mention_id = get_baseline_mention_id(api_v2)
+        max_results = DEFAULT_MAX_RESULTS
     
     logger.info(f"Starting mention polling for @{bot_username}")
     
@@ -184,17 +212,22 @@ def listen_for_mentions(callback_on_mention: Callable, test_mode: bool = False):
     while not is_shutdown_requested():
         try:
             # Check for new mentions
+            previous_mention_id = last_processed_mention_id
             last_processed_mention_id = _process_mention_cycle(
-                bot_user_id, last_processed_mention_id, callback_on_mention
+                bot_user_id, last_processed_mention_id, callback_on_mention, max_results
             )
+            max_results = DEFAULT_MAX_RESULTS
+            if on_since_id and last_processed_mention_id and last_processed_mention_id != previous_mention_id:
+                on_since_id(last_processed_mention_id)
             
             # Check for completed video generation jobs
-            try:
-                logger.info("🎬 Checking for completed video generation jobs...")
-                action_handler.check_completed_jobs()
-                logger.info("✅ Completed job check finished")
-            except Exception as e:
-                logger.error(f"❌ Error checking completed jobs: {e}", exc_info=True)
+            if check_jobs:
+                try:
+                    logger.info("🎬 Checking for completed video generation jobs...")
+                    action_handler.check_completed_jobs()
+                    logger.info("✅ Completed job check finished")
+                except Exception as e:
+                    logger.error(f"❌ Error checking completed jobs: {e}", exc_info=True)
             
         except Exception as e:
             logger.error(f"Error in polling cycle: {e}")
@@ -216,24 +249,49 @@ def _initialize_mention_listener():
     
     return bot_user_id, bot_username
 
-def _process_mention_cycle(bot_user_id, since_id, callback_on_mention):
+def _process_mention_cycle(bot_user_id, since_id, callback_on_mention, max_results: int = None):
     """Process one mention polling cycle and return updated since_id."""
-    response = fetch_mentions(api_v2, bot_user_id, since_id)
-    if not response:
-        return since_id
-    
-    mentions, has_errors = parse_mention_response(response)
-    if has_errors:
-        logger.warning("API returned errors when fetching mentions")
-    
+    max_results = max_results or DEFAULT_MAX_RESULTS
+    mentions = _fetch_mentions_since(bot_user_id, since_id, max_results)
     if not mentions:
         return since_id
     
     return _process_mentions(mentions, bot_user_id, since_id, callback_on_mention)
 
+def _fetch_mentions_since(bot_user_id, since_id, max_results: int) -> Optional[list]:
+    """
+    Fetch every mention newer than since_id, newest first, following pagination tokens
+    until the checkpoint is reached (a single page when there is no checkpoint).
+    
+    Returns:
+        list: Mentions, or None if the first page could not be fetched
+    """
+    mentions = []
+    pagination_token = None
+    for page in range(MAX_MENTION_PAGES):
+        response = fetch_mentions(api_v2, bot_user_id, since_id, max_results, pagination_token=pagination_token)
+        if not response:
+            if page == 0:
+                return None
+            logger.warning(f"Could not fetch page {page + 1} of mentions since {since_id}; older ones will be missed")
+            break
+        
+        page_mentions, has_errors = parse_mention_response(response)
+        if has_errors:
+            logger.warning("API returned errors when fetching mentions")
+        mentions.extend(page_mentions)
+        
+        pagination_token = (getattr(response, "meta", None) or {}).get("next_token")
+        if not since_id or not pagination_token:
+            return mentions
+    
+    logger.warning(f"Stopped after {MAX_MENTION_PAGES} pages of mentions since {since_id}; older ones may have been missed")
+    return mentions
+
 def _process_mentions(mentions, bot_user_id, since_id, callback_on_mention):
     """Process a list of mentions and return updated since_id."""
-    updated_since_id = since_id
+    # Checkpoints restored from storage may be strings; tweet ids are ints
+    updated_since_id = int(since_id) if since_id else since_id
     
     for tweet in reversed(mentions):  # Process chronologically
         if is_self_mention(tweet, bot_user_id):
@@ -242,6 +300,9 @@ def _process_mentions(mentions, bot_user_id, since_id, callback_on_mention):
         
         try:
             callback_on_mention(tweet)
+        except MentionBackpressure as e:
+            logger.warning(f"{e} - will fetch it again next cycle")
+            break
         except Exception as e:
             logger.error(f"Error processing mention {tweet.id}: {e}")
         
@@ -350,7 +411,8 @@ def get_bot_user_info(api_v2: tweepy.Client) -> Optional[Tuple[str, str]]:
         logger.error(f"Unexpected error getting bot user info: {e}")
         return None
 
-def fetch_mentions(api_v2: tweepy.Client, user_id: str, since_id: Optional[str] = None, max_results: int = 25) -> Optional[tweepy.Response]:
+def fetch_mentions(api_v2: tweepy.Client, user_id: str, since_id: Optional[str] = None, max_results: int = 25,
+                   pagination_token: Optional[str] = None) -> Optional[tweepy.Response]:
     """
     Fetch mentions for a user.
     
@@ -359,6 +421,7 @@ def fetch_mentions(api_v2: tweepy.Client, user_id: str, since_id: Optional[str]
         user_id: The user ID to fetch mentions for
         since_id: Optional ID to fetch mentions since (newer than this ID)
         max_results: Maximum number of mentions to fetch (default 25, max 100)
+        pagination_token: next_token of the previous page, to fetch the next (older) page
     
     Returns:
         Twitter API response object or None if error occurred.
@@ -375,6 +438,9 @@ def fetch_mentions(api_v2: tweepy.Client, user_id: str, since_id: Optional[str]
             "expansions": ["author_id"]
         }
         
+        if pagination_token:
+            params["pagination_token"] = pagination_token
+        
         if since_id:
             params["since_id"] = since_id
             logger.info(f"Fetching mentions for user {user_id} since ID {since_id}")
@@ -0,0 +1,221 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import List, Optional
+
+import twitter_client
+import action_handler
+import job_journal
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Queue sizes bound how much work can pile up between stages; a full mention queue
+# makes intake stop advancing since_id so the remaining mentions are fetched again later
+MENTION_QUEUE_SIZE = int(os.getenv("BOT_MENTION_QUEUE_SIZE", 50))
+UPLOAD_QUEUE_SIZE = int(os.getenv("BOT_UPLOAD_QUEUE_SIZE", 10))
+MENTION_ENQUEUE_TIMEOUT_SECONDS = float(os.getenv("BOT_MENTION_ENQUEUE_TIMEOUT_SECONDS", 5))
+
+PARSE_WORKERS = int(os.getenv("BOT_PARSE_WORKERS", 2))
+UPLOAD_WORKERS = int(os.getenv("BOT_UPLOAD_WORKERS", 2))
+# A parse worker takes up to this many queued mentions at once and parses them in one
+# batched LLM call, lingering briefly after the first so a burst lands in one batch
+PARSE_BATCH_SIZE = int(os.getenv("BOT_PARSE_BATCH_SIZE", 10))
+PARSE_BATCH_WAIT_SECONDS = float(os.getenv("BOT_PARSE_BATCH_WAIT_SECONDS", 0.5))
+# The completion watcher blocks on finished jobs; this only bounds how quickly it notices shutdown
+COMPLETION_WAIT_SECONDS = float(os.getenv("BOT_COMPLETION_WAIT_SECONDS", 1))
+DRAIN_TIMEOUT_SECONDS = float(os.getenv("BOT_DRAIN_TIMEOUT_SECONDS", 300))
+
+_STOP = object()  # Sentinel telling a worker its queue is drained
+
+class BotWorkers:
+    """
+    Worker threads behind mention intake.
+
+    Intake (twitter_client.listen_for_mentions) only enqueues mentions. Parse
+    workers run action_handler.handle_mentions on batches, a completion watcher moves
+    Sieve jobs to the upload queue as soon as they finish, and upload workers upload videos
+    and post replies. A slow upload therefore no longer delays intake or other
+    users' replies.
+    """
+
+    def __init__(self, parse_workers: int = PARSE_WORKERS, upload_workers: int = UPLOAD_WORKERS,
+                 journal: Optional[job_journal.JobJournal] = None):
+        """
+        Initialize the workers (threads are started by start()).
+
+        Args:
+            parse_workers: Threads parsing mentions and submitting jobs
+            upload_workers: Threads uploading finished videos and replying
+            journal: Optional job journal recording which mentions were handled
+        """
+        self.journal = journal
+        # Mentions queued or being parsed; intake may fetch them again while the queue is full
+        self._queued_mention_ids = set()
+        self._queued_lock = threading.Lock()
+        self.mention_queue: "queue.Queue" = queue.Queue(maxsize=MENTION_QUEUE_SIZE)
+        self.upload_queue: "queue.Queue" = queue.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+        self.parse_worker_count = max(1, parse_workers)
+        self.upload_worker_count = max(1, upload_workers)
+        self._stop_watching = threading.Event()
+        self._parse_threads: List[threading.Thread] = []
+        self._upload_threads: List[threading.Thread] = []
+        self._watcher_thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start parse, completion-watch and upload threads."""
+        self._parse_threads = [
+            threading.Thread(target=self._parse_loop, name=f"bot-parse-{i}", daemon=True)
+            for i in range(self.parse_worker_count)
+        ]
+        self._upload_threads = [
+            threading.Thread(target=self._upload_loop, name=f"bot-upload-{i}", daemon=True)
+            for i in range(self.upload_worker_count)
+        ]
+        self._watcher_thread = threading.Thread(target=self._watch_loop, name="bot-completion-watch", daemon=True)
+        for thread in self._parse_threads + self._upload_threads + [self._watcher_thread]:
+            thread.start()
+        logger.info(f"Started {self.parse_worker_count} parse and {self.upload_worker_count} upload workers")
+
+    def enqueue_mention(self, tweet):
+        """
+        Intake callback: hand a mention to the parse workers.
+
+        Mentions the journal already marks as handled (replayed after a restart)
+        are skipped, so they are never answered twice.
+
+        Raises:
+            twitter_client.MentionBackpressure: If the mention queue stays full
+        """
+        if not job_journal.safe_call(self.journal, "record_mention", tweet, default=True):
+            logger.info(f"Mention {tweet.id} was already handled - skipping")
+            return
+        self._put_mention(tweet, timeout=MENTION_ENQUEUE_TIMEOUT_SECONDS)
+
+    def replay_mentions(self, tweets: list):
+        """Requeue mentions accepted before a restart but never handled; blocks while the queue is full."""
+        for tweet in tweets:
+            self._put_mention(tweet, timeout=None)
+        if tweets:
+            logger.info(f"Replaying {len(tweets)} unhandled mentions from the job journal")
+
+    def _put_mention(self, tweet, timeout: Optional[float]):
+        tweet_id = str(tweet.id)
+        with self._queued_lock:
+            if tweet_id in self._queued_mention_ids:
+                return
+            self._queued_mention_ids.add(tweet_id)
+        try:
+            self.mention_queue.put(tweet, timeout=timeout)
+        except queue.Full:
+            with self._queued_lock:
+                self._queued_mention_ids.discard(tweet_id)
+            raise twitter_client.MentionBackpressure(
+                f"Mention queue full ({self.mention_queue.maxsize}); deferring tweet {tweet.id}"
+            )
+
+    def _enqueue_upload(self, tweet_id: str, video_file, job_data: dict):
+        """Completion callback: blocks while the upload queue is full, which slows the watcher down."""
+        self.upload_queue.put((tweet_id, video_file, job_data))
+
+    def _next_batch(self) -> list:
+        """Block for one queued item, then gather more until the batch is full, the wait ends or a stop arrives."""
+        batch = [self.mention_queue.get()]
+        deadline = time.time() + PARSE_BATCH_WAIT_SECONDS
+        while len(batch) < PARSE_BATCH_SIZE and batch[-1] is not _STOP:
+            try:
+                batch.append(self.mention_queue.get(timeout=max(0.0, deadline - time.time())))
+            except queue.Empty:
+                break
+        return batch
+
+    def _parse_loop(self):
+        while True:
+            batch = self._next_batch()
+            tweets = [item for item in batch if item is not _STOP]
+            try:
+                if tweets:
+                    action_handler.handle_mentions(tweets)
+            except Exception as e:
+                logger.error(f"Error processing mentions {[getattr(t, 'id', '?') for t in tweets]}: {e}", exc_info=True)
+            finally:
+                for tweet in tweets:
+                    job_journal.safe_call(self.journal, "mark_mention_handled", tweet.id)
+                    with self._queued_lock:
+                        self._queued_mention_ids.discard(str(tweet.id))
+                for _ in batch:
+                    self.mention_queue.task_done()
+            if len(tweets) < len(batch):
+                return
+
+    def _check_completed(self, timeout: float):
+        try:
+            action_handler.check_completed_jobs(on_completed=self._enqueue_upload, timeout=timeout)
+        except Exception as e:
+            logger.error(f"❌ Error checking completed jobs: {e}", exc_info=True)
+            self._stop_watching.wait(timeout)
+
+    def _watch_loop(self):
+        while not self._stop_watching.is_set():
+            self._check_completed(COMPLETION_WAIT_SECONDS)
+        # Final pass so videos that finished while draining are posted too
+        self._check_completed(0)
+
+    def _upload_loop(self):
+        while True:
+            item = self.upload_queue.get()
+            try:
+                if item is _STOP:
+                    return
+                action_handler.post_completed_video(*item)
+            except Exception as e:
+                logger.error(f"Error posting completed video for Tweet {item[0]}: {e}", exc_info=True)
+            finally:
+                self.upload_queue.task_done()
+
+    def drain(self, timeout: float = DRAIN_TIMEOUT_SECONDS):
+        """
+        Finish queued work and stop the threads; call after intake has stopped.
+
+        Mentions already queued are still parsed and finished videos already queued
+        are still posted. Jobs still running on Sieve are left alone.
+
+        Args:
+            timeout: Overall seconds to wait for the queues to drain
+        """
+        deadline = time.time() + timeout
+        logger.info(f"Draining workers: {self.mention_queue.qsize()} mentions and {self.upload_queue.qsize()} uploads queued")
+
+        for _ in self._parse_threads:
+            self.mention_queue.put(_STOP)
+        for thread in self._parse_threads:
+            thread.join(max(0, deadline - time.time()))
+
+        self._stop_watching.set()
+        if self._watcher_thread:
+            self._watcher_thread.join(max(0, deadline - time.time()))
+
+        for _ in self._upload_threads:
+            try:
+                self.upload_queue.put(_STOP, timeout=max(0.1, deadline - time.time()))
+            except queue.Full:
+                break
+        for thread in self._upload_threads:
+            thread.join(max(0, deadline - time.time()))
+
+        alive = [t.name for t in self._parse_threads + self._upload_threads if t.is_alive()]
+        if alive:
+            logger.warning(f"Workers still busy after {timeout:.0f}s drain timeout: {alive}")
+        else:
+            logger.info("All bot workers drained")
+
+    def get_status(self) -> dict:
+        """Queue depths and live thread counts for monitoring."""
+        return {
+            "mention_queue_size": self.mention_queue.qsize(),
+            "upload_queue_size": self.upload_queue.qsize(),
+            "parse_workers_alive": sum(t.is_alive() for t in self._parse_threads),
+            "upload_workers_alive": sum(t.is_alive() for t in self._upload_threads),
+        }